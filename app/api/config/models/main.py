@@ -24,5 +24,6 @@ class ApiConfig(Config):
             app=base.app,
             paths=base.paths,
             db=base.db,
+            geo=base.geo,
             auth=auth,
         )
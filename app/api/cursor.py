@@ -0,0 +1,32 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+import orjson
+
+from app.core.models import dto
+
+
+def encode_cursor(cursor: dto.Cursor) -> str:
+    """Opaque URL safe form of the cursor."""
+    data = {"id": cursor.id}
+    if cursor.distance_km is not None:
+        data["d"] = cursor.distance_km
+    return urlsafe_b64encode(orjson.dumps(data)).rstrip(b"=").decode()
+
+
+def decode_cursor(value: str) -> dto.Cursor:
+    """Cursor of ``encode_cursor``, ``ValueError`` if it is not one."""
+    try:
+        data = orjson.loads(urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+    except ValueError as e:
+        raise ValueError("malformed cursor") from e
+    if (
+        not isinstance(data, dict)
+        or type(data.get("id")) is not int
+        or type(data.get("d", 0.0)) not in (int, float)
+    ):
+        raise ValueError("malformed cursor")
+    distance = data.get("d")
+    return dto.Cursor(
+        id=data["id"],
+        distance_km=None if distance is None else float(distance),
+    )
@@ -0,0 +1,101 @@
+from functools import partial
+from typing import Any, AsyncIterable
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.core.models import dto
+
+
+def _model_fields(value: Any) -> dict[str, Any]:
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _project(
+    org: dto.Organization, fields: dict[str, set[str] | None],
+) -> dict[str, Any]:
+    """Requested fields of the organization in the order of the model."""
+    data = {}
+    for name, value in org.__dict__.items():
+        if name not in fields:
+            continue
+        if (names := fields[name]) is not None and value is not None:
+            if isinstance(value, list):
+                value = [_pick(item, names) for item in value]
+            else:
+                value = _pick(value, names)
+        data[name] = value
+    return data
+
+
+def _pick(model: BaseModel, names: set[str]) -> dict[str, Any]:
+    return {
+        name: value for name, value in model.__dict__.items() if name in names
+    }
+
+
+def _default(
+    fields: dict[str, set[str] | None] | None, value: Any,
+) -> dict[str, Any]:
+    if fields is not None and isinstance(value, dto.Organization):
+        return _project(value, fields)
+    return _model_fields(value)
+
+
+class ModelJSONResponse(JSONResponse):
+    """DTOs encoded to JSON by orjson field by field.
+
+    Returned from a route it skips validating and serializing the result
+    against ``response_model``, so the DTOs must already match it. With
+    ``fields`` organizations are trimmed to them, see ``dto.Fields``.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        fields: dict[str, set[str] | None] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        # Set before JSONResponse.__init__, which renders the content.
+        self.fields = fields
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=partial(_default, self.fields),
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+
+
+class NDJSONResponse(StreamingResponse):
+    """Chunks of DTOs sent as they come, a JSON object per line.
+
+    ``fields`` trim organizations as in ``ModelJSONResponse``.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(
+        self,
+        chunks: AsyncIterable[list[BaseModel]],
+        fields: dict[str, set[str] | None] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(_ndjson_lines(chunks, fields), **kwargs)
+
+
+async def _ndjson_lines(
+    chunks: AsyncIterable[list[BaseModel]],
+    fields: dict[str, set[str] | None] | None,
+) -> AsyncIterable[bytes]:
+    default = partial(_default, fields)
+    option = orjson.OPT_APPEND_NEWLINE
+    async for chunk in chunks:
+        yield b"".join(
+            orjson.dumps(item, default=default, option=option)
+            for item in chunk
+        )
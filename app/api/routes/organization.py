@@ -1,12 +1,28 @@
+from hashlib import blake2b
 from typing import Annotated
 
 from dishka.integrations.fastapi import inject, FromDishka
-from fastapi import APIRouter, Query, Path, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    Query,
+    Path,
+    HTTPException,
+    Response,
+    status,
+)
 
 from app.api.docs.responses import (
     UNAUTHORIZED_ERROR, VALIDATION_ERROR, NOT_FOUND_ERROR,
 )
+from app.api.cursor import decode_cursor, encode_cursor
+from app.api.json_response import ModelJSONResponse, NDJSONResponse
 from app.core.models import dto
+from app.core.models.enums import (
+    FacetType, GeoOrder, IncludeType, SuggestType,
+)
 from app.core.services.organization import (
     GetOrgById,
     GetOrgByName,
@@ -14,17 +30,230 @@ from app.core.services.organization import (
     GetAllByBuildingAddress,
     GetAllByRadius,
     GetAllByRect,
+    GetAllByPolygon,
+    GetAllByGeoBatch,
+    GetNearest,
+    GetClusters,
+    GetTile,
     GetAllByActivityName,
     GetAllByActivityTree,
+    GetAllByActivityFilter,
+    GetActivityCounts,
+    IncludeRelations,
+    SearchOrganizations,
+    SearchOrganizationsFuzzy,
+    Suggest,
 )
 from app.core.utils.str_cleaner import StrNormalizer, AddressCleaner
+from app.core.utils.tiles import MAX_ZOOM
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Organization fields holding related objects and the DTOs of them.
+RELATION_MODELS = {
+    IncludeType.building: dto.Building,
+    IncludeType.phones: dto.PhoneNumber,
+    IncludeType.activities: dto.Activity,
+}
+
+
+def split_values(items: list[str]) -> list[str]:
+    """Values of a query parameter given comma separated or repeated."""
+    return [
+        value.strip()
+        for item in items
+        for value in item.split(",")
+        if value.strip()
+    ]
+
+
+def parse_include(
+    include: list[str] = Query(
+        default=[],
+        description="Загрузить связанные данные организаций: building, "
+                    "phones, activities. С fields возвращаются вместе с "
+                    "выбранными полями. Через запятую или несколькими "
+                    "параметрами",
+    ),
+) -> list[IncludeType]:
+    try:
+        return list(dict.fromkeys(map(IncludeType, split_values(include))))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"include: {e}",
+        )
+
+
+RequestedInclude = Annotated[list[IncludeType], Depends(parse_include)]
+
+
+def parse_fields(
+    fields: list[str] = Query(
+        default=[],
+        description="Вернуть только эти поля организаций, поля связанных "
+                    "данных через точку: id,name,building.lat,building.lon. "
+                    "Через запятую или несколькими параметрами",
+    ),
+) -> dto.Fields | None:
+    if not (names := split_values(fields)):
+        return None
+    spec = {}
+    for name in names:
+        field, _, subfield = name.partition(".")
+        if field not in dto.OrganizationDistance.model_fields or subfield and (
+            field not in RELATION_MODELS
+            or subfield not in RELATION_MODELS[field].model_fields
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"fields: unknown field {name!r}",
+            )
+        if not subfield:
+            spec[field] = None
+        elif (subfields := spec.setdefault(field, set())) is not None:
+            subfields.add(subfield)
+    return spec
+
+
+RequestedFields = Annotated[dto.Fields | None, Depends(parse_fields)]
+
+
+def fields_with_include(
+    include: RequestedInclude, fields: RequestedFields,
+) -> dto.Fields | None:
+    """Fields of organization lists, which take ``include`` as well."""
+    if fields is None:
+        return None
+    # Included relations are returned whole unless fields narrow them.
+    for relation in include:
+        fields.setdefault(relation.value, None)
+    return fields
+
+
+Fields = Annotated[dto.Fields | None, Depends(fields_with_include)]
+
+
+def included_relations(
+    include: RequestedInclude, fields: Fields,
+) -> list[IncludeType]:
+    if fields is None:
+        return include
+    # Relations named in fields are loaded, others would be cut anyway.
+    return [relation for relation in IncludeType if relation in fields]
+
+
+Include = Annotated[list[IncludeType], Depends(included_relations)]
+
+
+def parse_cursor(
+    cursor: str | None = Query(
+        default=None,
+        description="Курсор следующей страницы из заголовка X-Next-Cursor",
+    ),
+) -> dto.Cursor | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"cursor: {e}",
+        )
+
+
+AfterCursor = Annotated[dto.Cursor | None, Depends(parse_cursor)]
+
+
+def parse_distance_cursor(cursor: AfterCursor) -> dto.Cursor | None:
+    if cursor is not None and cursor.distance_km is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="cursor: not a cursor of a list sorted by distance",
+        )
+    return cursor
+
+
+AfterDistance = Annotated[dto.Cursor | None, Depends(parse_distance_cursor)]
+
+
+def parse_page(
+    cursor: AfterCursor,
+    limit: int | None = Query(
+        default=None, ge=1, description="Максимальное количество организаций",
+    ),
+) -> dto.Page | None:
+    """Page of a list sorted by id, ``None`` for the whole list."""
+    if limit is None and cursor is None:
+        return None
+    return dto.Page(limit=limit, after=cursor)
+
+
+Pagination = Annotated[dto.Page | None, Depends(parse_page)]
+
+
+def page_headers(
+    organizations: list[dto.Organization], limit: int | None,
+) -> dict[str, str]:
+    """``X-Next-Cursor`` of a full page, more organizations may follow."""
+    if not limit or len(organizations) < limit:
+        return {}
+    last = organizations[-1]
+    cursor = dto.Cursor(
+        id=last.id, distance_km=getattr(last, "distance_km", None),
+    )
+    return {NEXT_CURSOR_HEADER: encode_cursor(cursor)}
+
+
+def accepts_ndjson(
+    accept: str | None = Header(
+        default=None,
+        description="application/x-ndjson - отдавать организации "
+                    "потоком, по JSON объекту в строке",
+    ),
+) -> bool:
+    if accept is None:
+        return False
+    return any(
+        media_range.split(";")[0].strip() == NDJSON_MEDIA_TYPE
+        for media_range in accept.split(",")
+    )
+
+
+Streaming = Annotated[bool, Depends(accepts_ndjson)]
+
+
+def check_stream(*unsupported: object) -> None:
+    """Reject pagination and facets of a streamed list."""
+    if any(param is not None for param in unsupported):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="limit, cursor and facets are not supported "
+                   f"with Accept: {NDJSON_MEDIA_TYPE}",
+        )
+
+
+async def with_relations(
+    organizations: list[dto.Organization],
+    include: list[IncludeType],
+    interactor: IncludeRelations,
+) -> list[dto.Organization]:
+    if not include:
+        return organizations
+    return await interactor(
+        dto.IncludeQuery(organizations=organizations, include=include),
+    )
 
 
 @inject
 async def organization_by_id(
     id_: Annotated[int, Path(alias="id", description="ID организации")],
     interactor: FromDishka[GetOrgById],
-) -> dto.Organization:
+    fields: RequestedFields,
+) -> Response:
     """Получить организацию по её ID."""
     org = await interactor(id_)
     if not org:
@@ -32,18 +261,19 @@ async def organization_by_id(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found",
         )
-    return org
+    return ModelJSONResponse(org, fields=fields)
 
 
 @inject
 async def organization_by_name(
     interactor: FromDishka[GetOrgByName],
     normalizer: FromDishka[StrNormalizer],
+    fields: RequestedFields,
     name: str = Query(
         ...,
         description="Название организации (полное)"
     ),
-) -> dto.Organization:
+) -> Response:
     """Получить организацию по названию."""
     org = await interactor(normalizer.full_clean(name))
     if not org:
@@ -51,27 +281,46 @@ async def organization_by_name(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found",
         )
-    return org
+    return ModelJSONResponse(org, fields=fields)
 
 
 @inject
 async def organizations_by_building_id(
     id_: Annotated[int, Path(alias="id", description="ID здания")],
     interactor: FromDishka[GetAllByBuildingId],
-) -> list[dto.Organization]:
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    page: Pagination,
+) -> Response:
     """Список организаций в заданном здании."""
-    return await interactor(id_)
+    organizations = await with_relations(
+        await interactor(id_, page, fields), include, relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, page and page.limit),
+    )
 
 
 @inject
 async def organizations_by_building_address(
     interactor: FromDishka[GetAllByBuildingAddress],
     cleaner: FromDishka[AddressCleaner],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    page: Pagination,
+    stream: Streaming,
     city: str | None = Query(default=None, description="Город"),
     street: str | None = Query(default=None, description="Улица"),
     house: str | None = Query(default=None, description="Дом"),
     office: str | None = Query(default=None, description="Офис"),
-) -> list[dto.Organization]:
+    facets: FacetType | None = Query(
+        default=None, description="Посчитать организации по видам деятельности",
+    ),
+) -> Response:
     """Список организаций по адресу здания."""
     query = dto.AddressFilter(
         city=cleaner.full_clean(city),
@@ -79,52 +328,330 @@ async def organizations_by_building_address(
         house=cleaner.full_clean(house),
         office=cleaner.full_clean(office),
     )
-    return await interactor(query)
+    if stream:
+        check_stream(page, facets)
+        return NDJSONResponse(
+            interactor.stream(query, include, fields), fields=fields,
+        )
+    if facets is not None:
+        result = await interactor.faceted(query, page, fields)
+        result.items = await with_relations(
+            result.items, include, relations_interactor,
+        )
+        return ModelJSONResponse(
+            result,
+            fields=fields,
+            headers=page_headers(result.items, page and page.limit),
+        )
+    organizations = await with_relations(
+        await interactor(query, page, fields), include, relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, page and page.limit),
+    )
 
 
 @inject
 async def organizations_by_radius(
     interactor: FromDishka[GetAllByRadius],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    after: AfterDistance,
+    stream: Streaming,
     center_lat: float = Query(..., description="Широта центра"),
     center_lon: float = Query(..., description="Долгота центра"),
-    radius: float = Query(..., description="Радиус поиска в километрах"),
-) -> list[dto.Organization]:
+    radius: float = Query(
+        ..., gt=0, description="Радиус поиска в километрах",
+    ),
+    order: GeoOrder | None = Query(
+        default=None, description="Сортировка результатов",
+    ),
+    limit: int | None = Query(
+        default=None, ge=1, description="Максимальное количество организаций",
+    ),
+    facets: FacetType | None = Query(
+        default=None, description="Посчитать организации по видам деятельности",
+    ),
+) -> Response:
     """Список организаций в радиусе от точки."""
     query = dto.GeoRadiusQuery(
-        center_lat=center_lat, center_lon=center_lon, radius=radius,
+        center_lat=center_lat,
+        center_lon=center_lon,
+        radius=radius,
+        order=order,
+        limit=limit,
+        after=after,
+    )
+    if stream:
+        check_stream(facets)
+        return NDJSONResponse(
+            interactor.stream(query, include, fields), fields=fields,
+        )
+    if facets is not None:
+        result = await interactor.faceted(query, fields)
+        result.items = await with_relations(
+            result.items, include, relations_interactor,
+        )
+        return ModelJSONResponse(
+            result,
+            fields=fields,
+            headers=page_headers(result.items, limit),
+        )
+    organizations = await with_relations(
+        await interactor(query, fields), include, relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, limit),
     )
-    return await interactor(query)
 
 
 @inject
 async def organizations_by_rect(
     interactor: FromDishka[GetAllByRect],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    page: Pagination,
+    stream: Streaming,
     lat_min: float = Query(..., description="Минимальная широта"),
     lat_max: float = Query(..., description="Максимальная широта"),
     lon_min: float = Query(..., description="Минимальная долгота"),
     lon_max: float = Query(..., description="Максимальная долгота"),
-) -> list[dto.Organization]:
+    facets: FacetType | None = Query(
+        default=None, description="Посчитать организации по видам деятельности",
+    ),
+) -> Response:
     """Список организаций в прямоугольной области."""
     query = dto.GeoRectQuery(
         lat_min=lat_min, lat_max=lat_max, lon_min=lon_min, lon_max=lon_max,
     )
+    if stream:
+        check_stream(page, facets)
+        return NDJSONResponse(
+            interactor.stream(query, include, fields), fields=fields,
+        )
+    if facets is not None:
+        result = await interactor.faceted(query, page, fields)
+        result.items = await with_relations(
+            result.items, include, relations_interactor,
+        )
+        return ModelJSONResponse(
+            result,
+            fields=fields,
+            headers=page_headers(result.items, page and page.limit),
+        )
+    organizations = await with_relations(
+        await interactor(query, page, fields), include, relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, page and page.limit),
+    )
+
+
+@inject
+async def organizations_by_polygon(
+    interactor: FromDishka[GetAllByPolygon],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    page: Pagination,
+    stream: Streaming,
+    points: list[tuple[float, float]] = Body(
+        ...,
+        min_length=3,
+        max_length=100_000,
+        description="Вершины многоугольника в виде пар [широта, долгота]",
+    ),
+) -> Response:
+    """Список организаций внутри многоугольника."""
+    query = dto.GeoPolygonQuery(points=points)
+    if stream:
+        check_stream(page)
+        return NDJSONResponse(
+            interactor.stream(query, include, fields), fields=fields,
+        )
+    organizations = await with_relations(
+        await interactor(query, page, fields),
+        include,
+        relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, page and page.limit),
+    )
+
+
+def check_geo_batch(queries: list[dto.GeoQuery]) -> None:
+    """Radius queries of a batch are checked as by-radius checks them."""
+    for i, query in enumerate(queries):
+        if not isinstance(query, dto.GeoRadiusQuery):
+            continue
+        if query.radius <= 0:
+            error = "radius must be greater than 0"
+        elif query.limit is not None and query.limit < 1:
+            error = "limit must be at least 1"
+        elif query.after is not None:
+            error = "after is not supported in a batch"
+        else:
+            continue
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"queries[{i}]: {error}",
+        )
+
+
+@inject
+async def organizations_by_geo_batch(
+    interactor: FromDishka[GetAllByGeoBatch],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    queries: list[dto.GeoQuery] = Body(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Список запросов по радиусу и прямоугольной области",
+    ),
+) -> Response:
+    """Организации для каждого из геозапросов по его индексу."""
+    check_geo_batch(queries)
+    results = await interactor(queries, fields)
+    # Relations of all the queries are loaded at once.
+    organizations = await with_relations(
+        [org for orgs in results.values() for org in orgs],
+        include,
+        relations_interactor,
+    )
+    start = 0
+    for i, orgs in results.items():
+        results[i] = organizations[start:start + len(orgs)]
+        start += len(orgs)
+    return ModelJSONResponse(results, fields=fields)
+
+
+@inject
+async def organizations_nearest(
+    interactor: FromDishka[GetNearest],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    after: AfterDistance,
+    center_lat: float = Query(..., description="Широта точки"),
+    center_lon: float = Query(..., description="Долгота точки"),
+    limit: int = Query(
+        default=20, ge=1, le=100, description="Количество организаций",
+    ),
+) -> Response:
+    """Ближайшие к точке организации с расстоянием до них."""
+    query = dto.GeoNearestQuery(
+        center_lat=center_lat, center_lon=center_lon, limit=limit, after=after,
+    )
+    organizations = await with_relations(
+        await interactor(query, fields), include, relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, limit),
+    )
+
+
+@inject
+async def organization_clusters(
+    interactor: FromDishka[GetClusters],
+    lat_min: float = Query(..., description="Минимальная широта"),
+    lat_max: float = Query(..., description="Максимальная широта"),
+    lon_min: float = Query(..., description="Минимальная долгота"),
+    lon_max: float = Query(..., description="Максимальная долгота"),
+    zoom: int = Query(..., ge=0, le=22, description="Уровень масштаба карты"),
+) -> list[dto.Cluster]:
+    """Количество организаций и их центр по ячейкам карты."""
+    query = dto.GeoClusterQuery(
+        lat_min=lat_min,
+        lon_min=lon_min,
+        lat_max=lat_max,
+        lon_max=lon_max,
+        zoom=zoom,
+    )
     return await interactor(query)
 
 
+@inject
+async def organization_tile(
+    z: Annotated[int, Path(ge=0, le=MAX_ZOOM, description="Уровень масштаба")],
+    x: Annotated[int, Path(ge=0, description="Номер тайла по горизонтали")],
+    y: Annotated[int, Path(ge=0, description="Номер тайла по вертикали")],
+    interactor: FromDishka[GetTile],
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    """Организации тайла карты в двоичном формате."""
+    if x >= 1 << z or y >= 1 << z:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tile not found",
+        )
+    tile = await interactor(dto.TileQuery(zoom=z, x=x, y=y))
+    headers = {
+        "ETag": f'"{blake2b(tile, digest_size=8).hexdigest()}"',
+        "Cache-Control": "public, max-age=60",
+    }
+    if if_none_match == headers["ETag"]:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers,
+        )
+    return Response(
+        tile, media_type="application/octet-stream", headers=headers,
+    )
+
+
 @inject
 async def organizations_by_activity(
     interactor: FromDishka[GetAllByActivityName],
     normalizer: FromDishka[StrNormalizer],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    page: Pagination,
+    stream: Streaming,
     activity_name: str = Query(..., description="Название вида деятельности"),
-) -> list[dto.Organization]:
+) -> Response:
     """Список организаций по виду деятельности."""
-    return await interactor(normalizer.full_clean(activity_name))
+    activity_name = normalizer.full_clean(activity_name)
+    if stream:
+        check_stream(page)
+        return NDJSONResponse(
+            interactor.stream(activity_name, include, fields),
+            fields=fields,
+        )
+    organizations = await with_relations(
+        await interactor(activity_name, page, fields),
+        include,
+        relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, page and page.limit),
+    )
 
 
 @inject
 async def organizations_by_activity_tree(
     interactor: FromDishka[GetAllByActivityTree],
     normalizer: FromDishka[StrNormalizer],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    page: Pagination,
+    stream: Streaming,
     activity_name: str = Query(..., description="Название вида деятельности"),
     depth: int = Query(
         default=3,
@@ -132,12 +659,143 @@ async def organizations_by_activity_tree(
         le=3,
         description="Глубина вложенности (максимум 3)"
     ),
-) -> list[dto.Organization]:
+) -> Response:
     """Список организаций по виду деятельности с учетом вложенности."""
     query = dto.OrgActivityQuery(
         activity_name=normalizer.full_clean(activity_name),
         depth=depth,
     )
+    if stream:
+        check_stream(page)
+        return NDJSONResponse(
+            interactor.stream(query, include, fields), fields=fields,
+        )
+    organizations = await with_relations(
+        await interactor(query, page, fields), include, relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, page and page.limit),
+    )
+
+
+@inject
+async def organizations_by_activity_filter(
+    interactor: FromDishka[GetAllByActivityFilter],
+    normalizer: FromDishka[StrNormalizer],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    page: Pagination,
+    stream: Streaming,
+    any_of: list[str] = Query(
+        default=[], description="Виды деятельности, хотя бы один из которых есть",
+    ),
+    all_of: list[str] = Query(
+        default=[], description="Виды деятельности, которые есть все",
+    ),
+    none_of: list[str] = Query(
+        default=[], description="Виды деятельности, которых нет",
+    ),
+    depth: int = Query(
+        default=1,
+        ge=1,
+        le=3,
+        description="Глубина вложенности для каждого вида деятельности",
+    ),
+) -> Response:
+    """Список организаций по сочетанию видов деятельности."""
+    if not any_of and not all_of:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="any_of or all_of is required",
+        )
+    query = dto.ActivityFilterQuery(
+        any_of=[normalizer.full_clean(name) for name in any_of],
+        all_of=[normalizer.full_clean(name) for name in all_of],
+        none_of=[normalizer.full_clean(name) for name in none_of],
+        depth=depth,
+    )
+    if stream:
+        check_stream(page)
+        return NDJSONResponse(
+            interactor.stream(query, include, fields), fields=fields,
+        )
+    organizations = await with_relations(
+        await interactor(query, page, fields), include, relations_interactor,
+    )
+    return ModelJSONResponse(
+        organizations,
+        fields=fields,
+        headers=page_headers(organizations, page and page.limit),
+    )
+
+
+@inject
+async def activity_counts(
+    interactor: FromDishka[GetActivityCounts],
+) -> list[dto.ActivityCount]:
+    """Дерево видов деятельности с количеством организаций."""
+    return await interactor()
+
+
+@inject
+async def search_organizations(
+    interactor: FromDishka[SearchOrganizations],
+    normalizer: FromDishka[StrNormalizer],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=256,
+        description="Слова из названия, видов деятельности или адреса",
+    ),
+    limit: int = Query(default=20, ge=1, le=100),
+) -> Response:
+    """Полнотекстовый поиск организаций."""
+    query = dto.TextSearchQuery(text=normalizer.fold(q) or "", limit=limit)
+    organizations = await with_relations(
+        await interactor(query, fields), include, relations_interactor,
+    )
+    return ModelJSONResponse(organizations, fields=fields)
+
+
+@inject
+async def search_organizations_fuzzy(
+    interactor: FromDishka[SearchOrganizationsFuzzy],
+    include: Include,
+    fields: Fields,
+    relations_interactor: FromDishka[IncludeRelations],
+    q: str = Query(
+        ..., min_length=1, max_length=256, description="Название организации",
+    ),
+    limit: int = Query(default=20, ge=1, le=100),
+) -> Response:
+    """Поиск организаций по названию с опечатками."""
+    organizations = await with_relations(
+        await interactor(dto.TextSearchQuery(text=q, limit=limit), fields),
+        include,
+        relations_interactor,
+    )
+    return ModelJSONResponse(organizations, fields=fields)
+
+
+@inject
+async def suggest(
+    interactor: FromDishka[Suggest],
+    q: str = Query(..., min_length=1, max_length=256, description="Начало слова"),
+    types: list[SuggestType] = Query(
+        default=[SuggestType.organization], description="Что подсказывать",
+    ),
+    limit: int = Query(default=10, ge=1, le=50),
+) -> list[dto.Suggestion]:
+    """Подсказки по началу названия."""
+    query = dto.SuggestQuery(
+        prefix=q, types=list(dict.fromkeys(types)), limit=limit,
+    )
     return await interactor(query)
 
 
@@ -161,22 +819,109 @@ def setup() -> APIRouter:
         organizations_by_building_address,
         methods=["GET"],
         summary="Список всех организаций находящихся в конкретном здании по адресу здания",
-        response_model=list[dto.Organization],
+        description="При facets=activity возвращает объект с организациями "
+                    "(items) и их количеством по видам деятельности (facets). "
+                    "Количество считается по всем найденным организациям, "
+                    "а не только по странице.",
+        response_model=(
+            list[dto.Organization] | dto.FacetedOrganizations[dto.Organization]
+        ),
     )
     router.add_api_route(
         "/building/by-radius/",
         organizations_by_radius,
         methods=["GET"],
         summary="Список организаций в радиусе, относительно указанной точки на карте",
-        response_model=list[dto.Organization],
+        description="Каждая организация содержит расстояние до точки "
+                    "в километрах. При order=distance результаты "
+                    "упорядочены по удалению от точки. При facets=activity "
+                    "возвращает объект с организациями (items) и их "
+                    "количеством по видам деятельности (facets). "
+                    "Количество считается по всем найденным организациям, "
+                    "а не только по странице.",
+        response_model=(
+            list[dto.OrganizationDistance]
+            | dto.FacetedOrganizations[dto.OrganizationDistance]
+        ),
     )
     router.add_api_route(
         "/building/by-rect/",
         organizations_by_rect,
         methods=["GET"],
         summary="Список организаций в прямоугольной области, относительно указанной точки на карте",
+        description="При facets=activity возвращает объект с организациями "
+                    "(items) и их количеством по видам деятельности (facets). "
+                    "Количество считается по всем найденным организациям, "
+                    "а не только по странице.",
+        response_model=(
+            list[dto.Organization] | dto.FacetedOrganizations[dto.Organization]
+        ),
+    )
+    router.add_api_route(
+        "/building/by-polygon/",
+        organizations_by_polygon,
+        methods=["POST"],
+        summary="Список организаций внутри многоугольника (например, района)",
+        description="Принимает вершины многоугольника списком пар "
+                    "[широта, долгота]. Многоугольник замыкается "
+                    "автоматически, отверстия не поддерживаются.",
         response_model=list[dto.Organization],
     )
+    router.add_api_route(
+        "/building/batch/",
+        organizations_by_geo_batch,
+        methods=["POST"],
+        summary="Пакетный поиск организаций по радиусу и прямоугольной области",
+        description="Принимает список запросов по радиусу (center_lat, "
+                    "center_lon, radius, order, limit) и прямоугольной "
+                    "области (lat_min, lon_min, lat_max, lon_max). "
+                    "Результаты возвращаются по индексу запроса в списке.",
+        response_model=dict[
+            int, list[dto.OrganizationDistance | dto.Organization]
+        ],
+    )
+    router.add_api_route(
+        "/building/nearest/",
+        organizations_nearest,
+        methods=["GET"],
+        summary="Список ближайших организаций к указанной точке на карте",
+        description="Возвращает организации в порядке удаления от точки "
+                    "вместе с расстоянием до них в километрах.",
+        response_model=list[dto.OrganizationDistance],
+    )
+    router.add_api_route(
+        "/building/clusters/",
+        organization_clusters,
+        methods=["GET"],
+        summary="Кластеры организаций в прямоугольной области",
+        description="Возвращает количество организаций и их центр для "
+                    "каждого тайла карты (x, y) на заданном уровне "
+                    "масштаба. Уровни выше geo.cluster_max_zoom "
+                    "ограничиваются им.",
+        response_model=list[dto.Cluster],
+    )
+    router.add_api_route(
+        "/tiles/{z}/{x}/{y}/",
+        organization_tile,
+        methods=["GET"],
+        summary="Организации тайла карты",
+        description="""
+        Тайл в нотации slippy map (Web Mercator) в двоичном формате,
+        little endian: сигнатура RTT1, z (u8), x (u32), y (u32),
+        количество точек (u32), затем для каждой точки ID организации (u32),
+        ID вида деятельности (u32, 0 если нет) и координаты внутри тайла
+        x, y (u16) с шагом 1/65536 стороны тайла.
+        """,
+        response_class=Response,
+        responses={
+            status.HTTP_200_OK: {
+                "content": {"application/octet-stream": {}},
+            },
+            status.HTTP_404_NOT_FOUND: {
+                "description": "Тайл вне диапазона уровня масштаба",
+            },
+        },
+    )
     router.add_api_route(
         "/activity/",
         organizations_by_activity,
@@ -200,6 +945,61 @@ def setup() -> APIRouter:
         """,
         response_model=list[dto.Organization],
     )
+    router.add_api_route(
+        "/activity/filter/",
+        organizations_by_activity_filter,
+        methods=["GET"],
+        summary="Поиск организаций по сочетанию видов деятельности",
+        description="Организации, у которых есть хотя бы один вид "
+                    "деятельности из any_of, все из all_of и ни одного "
+                    "из none_of. Каждый вид деятельности учитывается "
+                    "вместе с вложенными на глубину depth. Например, "
+                    "any_of=Еда&none_of=Молочная продукция.",
+        response_model=list[dto.Organization],
+    )
+    router.add_api_route(
+        "/activity/counts/",
+        activity_counts,
+        methods=["GET"],
+        summary="Дерево видов деятельности с количеством организаций",
+        description="direct_count - организации с самим видом деятельности, "
+                    "subtree_count - организации с ним или любым вложенным, "
+                    "каждая организация учитывается один раз.",
+        response_model=list[dto.ActivityCount],
+    )
+    router.add_api_route(
+        "/search/",
+        search_organizations,
+        methods=["GET"],
+        summary="Полнотекстовый поиск организаций",
+        description="Каждое слово запроса ищется как начало слова в "
+                    "названии организации, её видах деятельности и адресе. "
+                    "Результаты упорядочены по релевантности, совпадения "
+                    "в названии весят больше всего. Например, q=мол прод.",
+        response_model=list[dto.Organization],
+    )
+    router.add_api_route(
+        "/search/fuzzy/",
+        search_organizations_fuzzy,
+        methods=["GET"],
+        summary="Поиск организаций по названию с опечатками",
+        description="Названия сравниваются по общим триграммам, поэтому "
+                    "находятся и с опечатками, и с латинскими буквами "
+                    "вместо похожих русских. Результаты упорядочены по "
+                    "сходству. Например, q=Kомпанйя.",
+        response_model=list[dto.Organization],
+    )
+    router.add_api_route(
+        "/search/suggest/",
+        suggest,
+        methods=["GET"],
+        summary="Подсказки при вводе",
+        description="Первые по алфавиту названия организаций, видов "
+                    "деятельности (types=activity) или улиц (types=street), "
+                    "начинающиеся с q. Регистр и «ё» не учитываются, "
+                    "limit ограничивает подсказки каждого типа.",
+        response_model=list[dto.Suggestion],
+    )
     router.add_api_route(
         "/building/{id}/",
         organizations_by_building_id,
@@ -1,4 +1,4 @@
-from .models import Config, DbConfig, Paths
+from .models import Config, DbConfig, GeoConfig, GeoIndexType, Paths
 from .paths import get_paths, common_get_paths
 from .setup_logging import setup_logging
 from .setup_config import load_config
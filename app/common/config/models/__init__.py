@@ -1,2 +1,2 @@
-from .main import Config, DbConfig
+from .main import Config, DbConfig, GeoConfig, GeoIndexType
 from .paths import Paths
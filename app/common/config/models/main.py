@@ -1,5 +1,6 @@
 import logging
 from dataclasses import dataclass
+from enum import StrEnum
 
 from .paths import Paths
 
@@ -35,6 +36,22 @@ class DbConfig:
         return url
 
 
+class GeoIndexType(StrEnum):
+    memory = "memory"
+    sql = "sql"
+    geo_key = "geo_key"
+
+
+@dataclass
+class GeoConfig:
+    index: GeoIndexType = GeoIndexType.memory
+    cell_size: float = 0.01
+    cluster_max_zoom: int = 16
+    tile_cache_size: int = 1024
+    response_cache_size: int = 4096
+    response_cache_cell_size: float = 0.01
+
+
 @dataclass
 class AppConfig:
     name: str
@@ -45,3 +62,4 @@ class Config:
     app: AppConfig
     paths: Paths
     db: DbConfig
+    geo: GeoConfig
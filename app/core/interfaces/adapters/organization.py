@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 
 from app.core.models import dto
 
@@ -17,40 +17,193 @@ class OrganizationGateway(Protocol):
 
     @abstractmethod
     async def get_all_by_building_id(
-        self, building_id: int,
+        self,
+        building_id: int,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         raise NotImplementedError
 
     @abstractmethod
     async def get_all_by_building_address(
-        self, query: dto.AddressFilter,
+        self,
+        query: dto.AddressFilter,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_faceted_by_building_address(
+        self,
+        query: dto.AddressFilter,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_all_by_building_address(
+        self, query: dto.AddressFilter, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_all_by_radius(
-        self, query: dto.GeoRadiusQuery,
-    ) -> list[dto.Organization]:
+        self, query: dto.GeoRadiusQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.OrganizationDistance]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_faceted_by_radius(
+        self, query: dto.GeoRadiusQuery, fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.OrganizationDistance]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_all_by_radius(
+        self, query: dto.GeoRadiusQuery, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.OrganizationDistance]]:
         raise NotImplementedError
 
     @abstractmethod
     async def get_all_by_rect(
-        self, query: dto.GeoRectQuery,
+        self,
+        query: dto.GeoRectQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_faceted_by_rect(
+        self,
+        query: dto.GeoRectQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_all_by_rect(
+        self, query: dto.GeoRectQuery, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_all_by_polygon(
+        self,
+        query: dto.GeoPolygonQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_all_by_polygon(
+        self, query: dto.GeoPolygonQuery, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_all_by_geo_batch(
+        self, queries: list[dto.GeoQuery], fields: dto.Fields | None = None,
+    ) -> dict[int, list[dto.Organization]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_nearest(
+        self, query: dto.GeoNearestQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.OrganizationDistance]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_clusters(
+        self, query: dto.GeoClusterQuery,
+    ) -> list[dto.Cluster]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_tile(self, query: dto.TileQuery) -> bytes:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_all_by_activity_name(
-        self, activity_name: str,
+        self,
+        activity_name: str,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         raise NotImplementedError
 
+    @abstractmethod
+    def stream_all_by_activity_name(
+        self, activity_name: str, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_all_by_activity_tree(
-        self, activity_name: str, depth: int = 3,
+        self,
+        activity_name: str,
+        depth: int = 3,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_all_by_activity_tree(
+        self,
+        activity_name: str,
+        depth: int = 3,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_all_by_activity_filter(
+        self,
+        query: dto.ActivityFilterQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_all_by_activity_filter(
+        self,
+        query: dto.ActivityFilterQuery,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search(
+        self, query: dto.TextSearchQuery, fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def search_fuzzy(
+        self, query: dto.TextSearchQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def suggest(self, query: dto.SuggestQuery) -> list[dto.Suggestion]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def include_relations(
+        self, query: dto.IncludeQuery,
+    ) -> list[dto.Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_activity_counts(self) -> list[dto.ActivityCount]:
+        raise NotImplementedError
+
     @abstractmethod
     async def add_organization(
         self, organization: dto.OrgCreate,
@@ -1,24 +1,64 @@
 from .activity import Activity
+from .activity_count import ActivityCount
+from .cluster import Cluster
+from .facet import ActivityFacet, Facets, FacetedOrganizations
 from .organization_query import (
-    AddressFilter, GeoRectQuery, GeoRadiusQuery, OrgActivityQuery,
+    ActivityFilterQuery,
+    AddressFilter,
+    Cursor,
+    Fields,
+    GeoClusterQuery,
+    GeoNearestQuery,
+    GeoPolygonQuery,
+    GeoQuery,
+    GeoRectQuery,
+    GeoRadiusQuery,
+    IncludeQuery,
+    OrgActivityQuery,
+    Page,
+    SuggestQuery,
+    TextSearchQuery,
+    TileQuery,
 )
 from .building import Building
-from .organization import OrgCreate, Organization
+from .organization import OrgCreate, Organization, OrganizationDistance
 from .phone import PhoneNumber
+from .suggestion import Suggestion
 
 Organization.model_rebuild()
+OrganizationDistance.model_rebuild()
 Activity.model_rebuild()
+ActivityCount.model_rebuild()
 Building.model_rebuild()
 PhoneNumber.model_rebuild()
 
 __all__ = (
     "Activity",
+    "ActivityCount",
+    "ActivityFacet",
+    "ActivityFilterQuery",
     "AddressFilter",
     "Building",
+    "Cluster",
+    "Cursor",
+    "FacetedOrganizations",
+    "Facets",
+    "Fields",
+    "GeoClusterQuery",
+    "GeoNearestQuery",
+    "GeoPolygonQuery",
+    "GeoQuery",
     "GeoRectQuery",
     "GeoRadiusQuery",
+    "IncludeQuery",
     "OrgActivityQuery",
     "OrgCreate",
     "Organization",
+    "OrganizationDistance",
+    "Page",
     "PhoneNumber",
+    "SuggestQuery",
+    "Suggestion",
+    "TextSearchQuery",
+    "TileQuery",
 )
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class ActivityCount(BaseModel):
+    id: int
+    name: str
+    parent_id: int | None = None
+    direct_count: int
+    subtree_count: int
+    children: list[ActivityCount] = []
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class Cluster(BaseModel):
+    zoom: int
+    x: int
+    y: int
+    count: int
+    lat: float
+    lon: float
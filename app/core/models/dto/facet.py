@@ -0,0 +1,22 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+from .organization import Organization
+
+OrganizationT = TypeVar("OrganizationT", bound=Organization)
+
+
+class ActivityFacet(BaseModel):
+    id: int
+    name: str
+    count: int
+
+
+class Facets(BaseModel):
+    activity: list[ActivityFacet] | None = None
+
+
+class FacetedOrganizations(BaseModel, Generic[OrganizationT]):
+    items: list[OrganizationT]
+    facets: Facets
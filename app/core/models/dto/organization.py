@@ -34,3 +34,7 @@ class Organization(BaseModel):
     phones: Optional[list["PhoneNumber"]] = None
     activities: Optional[list["Activity"]] = None
     building: Optional["Building"] = None
+
+
+class OrganizationDistance(Organization):
+    distance_km: float
@@ -1,5 +1,26 @@
 from dataclasses import dataclass
 
+from app.core.models.enums import GeoOrder, IncludeType, SuggestType
+
+from .organization import Organization
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Sort key of the last organization of a page.
+
+    Lists are sorted by ``id`` or, when sorted by distance, by
+    ``(distance_km, id)``. The next page starts right after the key.
+    """
+    id: int
+    distance_km: float | None = None
+
+
+@dataclass
+class Page:
+    limit: int | None = None
+    after: Cursor | None = None
+
 
 @dataclass
 class AddressFilter:
@@ -14,6 +35,17 @@ class GeoRadiusQuery:
     center_lat: float
     center_lon: float
     radius: float
+    order: GeoOrder | None = None
+    limit: int | None = None
+    after: Cursor | None = None
+
+
+@dataclass
+class GeoNearestQuery:
+    center_lat: float
+    center_lon: float
+    limit: int = 20
+    after: Cursor | None = None
 
 
 @dataclass
@@ -24,7 +56,63 @@ class GeoRectQuery:
     lon_max: float
 
 
+@dataclass
+class GeoPolygonQuery:
+    points: list[tuple[float, float]]
+
+
+GeoQuery = GeoRadiusQuery | GeoRectQuery
+
+
+@dataclass
+class GeoClusterQuery:
+    lat_min: float
+    lon_min: float
+    lat_max: float
+    lon_max: float
+    zoom: int
+
+
+@dataclass
+class TileQuery:
+    zoom: int
+    x: int
+    y: int
+
+
 @dataclass
 class OrgActivityQuery:
     activity_name: str
     depth: int = 3
+
+
+@dataclass
+class ActivityFilterQuery:
+    any_of: list[str]
+    all_of: list[str]
+    none_of: list[str]
+    depth: int = 1
+
+
+@dataclass
+class TextSearchQuery:
+    text: str
+    limit: int = 20
+
+
+@dataclass
+class IncludeQuery:
+    organizations: list[Organization]
+    include: list[IncludeType]
+
+
+# Organization fields to return, values are the wanted fields of related
+# objects, ``None`` for whole ones. Lists take ``None`` for all fields.
+Fields = dict[str, set[str] | None]
+
+
+@dataclass
+class SuggestQuery:
+    prefix: str
+    types: list[SuggestType]
+    limit: int = 10
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+from app.core.models.enums import SuggestType
+
+
+class Suggestion(BaseModel):
+    type: SuggestType
+    text: str
@@ -0,0 +1,11 @@
+from .facet import FacetType
+from .geo import GeoOrder
+from .include import IncludeType
+from .suggest import SuggestType
+
+__all__ = (
+    "FacetType",
+    "GeoOrder",
+    "IncludeType",
+    "SuggestType",
+)
@@ -0,0 +1,5 @@
+from enum import StrEnum
+
+
+class FacetType(StrEnum):
+    activity = "activity"
@@ -0,0 +1,5 @@
+from enum import StrEnum
+
+
+class GeoOrder(StrEnum):
+    distance = "distance"
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class IncludeType(StrEnum):
+    building = "building"
+    phones = "phones"
+    activities = "activities"
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class SuggestType(StrEnum):
+    organization = "organization"
+    activity = "activity"
+    street = "street"
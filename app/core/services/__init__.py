@@ -5,8 +5,19 @@ from .organization import (
     GetAllByBuildingAddress,
     GetAllByRadius,
     GetAllByRect,
+    GetAllByPolygon,
+    GetAllByGeoBatch,
+    GetNearest,
+    GetClusters,
+    GetTile,
     GetAllByActivityName,
     GetAllByActivityTree,
+    GetAllByActivityFilter,
+    GetActivityCounts,
+    IncludeRelations,
+    SearchOrganizations,
+    SearchOrganizationsFuzzy,
+    Suggest,
     AddOrganization,
     UpdateOrganization,
     DeleteOrganization,
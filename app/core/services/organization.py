@@ -1,9 +1,11 @@
 import logging
+from typing import AsyncIterator
 
 from app.core.exception.exception import OrganizationAlreadyExists
 from app.core.interfaces.adapters.organization import OrganizationGateway
 from app.core.interfaces.uow import UoW
 from app.core.models import dto
+from app.core.models.enums import IncludeType
 from app.core.common.intearctor import Interactor, InputDTO, OutputDTO
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,25 @@ class OrganizationInteractor(Interactor[InputDTO, OutputDTO]):
         self.uow = uow
         self.db_gateway = db_gateway
 
+    async def _stream(
+        self,
+        chunks: AsyncIterator[list[dto.Organization]],
+        include: list[IncludeType] | None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        """Chunks with the relations loaded, committed after the last one.
+
+        Committing earlier would close the cursor the chunks are read from.
+        """
+        async for organizations in chunks:
+            if include:
+                organizations = await self.db_gateway.include_relations(
+                    dto.IncludeQuery(
+                        organizations=organizations, include=include,
+                    ),
+                )
+            yield organizations
+        await self.uow.commit()
+
 
 class GetOrgById(OrganizationInteractor[int, dto.Organization]):
     async def __call__(self, organization_id: int) -> dto.Organization:
@@ -33,10 +54,13 @@ class GetOrgByName(OrganizationInteractor[str, dto.Organization]):
 
 class GetAllByBuildingId(OrganizationInteractor[int, list[dto.Organization]]):
     async def __call__(
-        self, building_id: int,
+        self,
+        building_id: int,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         organizations = await self.db_gateway.get_all_by_building_id(
-            building_id=building_id,
+            building_id=building_id, page=page, fields=fields,
         )
         await self.uow.commit()
         return organizations
@@ -46,65 +70,328 @@ class GetAllByBuildingAddress(
     OrganizationInteractor[dto.AddressFilter, list[dto.Organization]]
 ):
     async def __call__(
-        self, query: dto.AddressFilter,
+        self,
+        query: dto.AddressFilter,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         organizations = await self.db_gateway.get_all_by_building_address(
-            query=query,
+            query=query, page=page, fields=fields,
         )
         await self.uow.commit()
         return organizations
 
+    async def faceted(
+        self,
+        query: dto.AddressFilter,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.Organization]:
+        result = await self.db_gateway.get_faceted_by_building_address(
+            query=query, page=page, fields=fields,
+        )
+        await self.uow.commit()
+        return result
+
+    def stream(
+        self,
+        query: dto.AddressFilter,
+        include: list[IncludeType] | None = None,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        return self._stream(
+            self.db_gateway.stream_all_by_building_address(
+                query=query, fields=fields,
+            ),
+            include,
+        )
+
 
 class GetAllByRadius(
-    OrganizationInteractor[dto.GeoRadiusQuery, list[dto.Organization]]
+    OrganizationInteractor[dto.GeoRadiusQuery, list[dto.OrganizationDistance]]
 ):
     async def __call__(
-        self, query: dto.GeoRadiusQuery,
-    ) -> list[dto.Organization]:
+        self, query: dto.GeoRadiusQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.OrganizationDistance]:
         organizations = await self.db_gateway.get_all_by_radius(
-            query=query,
+            query=query, fields=fields,
         )
         await self.uow.commit()
         return organizations
 
+    async def faceted(
+        self, query: dto.GeoRadiusQuery, fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.OrganizationDistance]:
+        result = await self.db_gateway.get_faceted_by_radius(
+            query=query, fields=fields,
+        )
+        await self.uow.commit()
+        return result
+
+    def stream(
+        self,
+        query: dto.GeoRadiusQuery,
+        include: list[IncludeType] | None = None,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.OrganizationDistance]]:
+        return self._stream(
+            self.db_gateway.stream_all_by_radius(query=query, fields=fields),
+            include,
+        )
+
 
 class GetAllByRect(
     OrganizationInteractor[dto.GeoRectQuery, list[dto.Organization]]
 ):
     async def __call__(
-        self, query: dto.GeoRectQuery,
+        self,
+        query: dto.GeoRectQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         organizations = await self.db_gateway.get_all_by_rect(
-            query=query,
+            query=query, page=page, fields=fields,
         )
         await self.uow.commit()
         return organizations
 
+    async def faceted(
+        self,
+        query: dto.GeoRectQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.Organization]:
+        result = await self.db_gateway.get_faceted_by_rect(
+            query=query, page=page, fields=fields,
+        )
+        await self.uow.commit()
+        return result
+
+    def stream(
+        self,
+        query: dto.GeoRectQuery,
+        include: list[IncludeType] | None = None,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        return self._stream(
+            self.db_gateway.stream_all_by_rect(query=query, fields=fields),
+            include,
+        )
+
+
+class GetAllByPolygon(
+    OrganizationInteractor[dto.GeoPolygonQuery, list[dto.Organization]]
+):
+    async def __call__(
+        self,
+        query: dto.GeoPolygonQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        organizations = await self.db_gateway.get_all_by_polygon(
+            query=query, page=page, fields=fields,
+        )
+        await self.uow.commit()
+        return organizations
+
+    def stream(
+        self,
+        query: dto.GeoPolygonQuery,
+        include: list[IncludeType] | None = None,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        return self._stream(
+            self.db_gateway.stream_all_by_polygon(query=query, fields=fields),
+            include,
+        )
+
+
+class GetAllByGeoBatch(
+    OrganizationInteractor[
+        list[dto.GeoQuery], dict[int, list[dto.Organization]]
+    ]
+):
+    async def __call__(
+        self, queries: list[dto.GeoQuery], fields: dto.Fields | None = None,
+    ) -> dict[int, list[dto.Organization]]:
+        organizations = await self.db_gateway.get_all_by_geo_batch(
+            queries=queries, fields=fields,
+        )
+        await self.uow.commit()
+        return organizations
+
+
+class GetNearest(
+    OrganizationInteractor[
+        dto.GeoNearestQuery, list[dto.OrganizationDistance]
+    ]
+):
+    async def __call__(
+        self, query: dto.GeoNearestQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.OrganizationDistance]:
+        organizations = await self.db_gateway.get_nearest(
+            query=query, fields=fields,
+        )
+        await self.uow.commit()
+        return organizations
+
+
+class GetClusters(
+    OrganizationInteractor[dto.GeoClusterQuery, list[dto.Cluster]]
+):
+    async def __call__(
+        self, query: dto.GeoClusterQuery,
+    ) -> list[dto.Cluster]:
+        clusters = await self.db_gateway.get_clusters(query=query)
+        await self.uow.commit()
+        return clusters
+
+
+class GetTile(OrganizationInteractor[dto.TileQuery, bytes]):
+    async def __call__(self, query: dto.TileQuery) -> bytes:
+        tile = await self.db_gateway.get_tile(query=query)
+        await self.uow.commit()
+        return tile
+
 
 class GetAllByActivityName(OrganizationInteractor[str, list[dto.Organization]]):
     async def __call__(
-        self, activity_name: str,
+        self,
+        activity_name: str,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         organizations = await self.db_gateway.get_all_by_activity_name(
-            activity_name=activity_name,
+            activity_name=activity_name, page=page, fields=fields,
         )
         await self.uow.commit()
         return organizations
 
+    def stream(
+        self,
+        activity_name: str,
+        include: list[IncludeType] | None = None,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        return self._stream(
+            self.db_gateway.stream_all_by_activity_name(
+                activity_name=activity_name, fields=fields,
+            ),
+            include,
+        )
+
 
 class GetAllByActivityTree(
     OrganizationInteractor[dto.OrgActivityQuery, list[dto.Organization]],
 ):
     async def __call__(
-        self, query: dto.OrgActivityQuery,
+        self,
+        query: dto.OrgActivityQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         organizations = await self.db_gateway.get_all_by_activity_tree(
             activity_name=query.activity_name,
             depth=query.depth,
+            page=page,
+            fields=fields,
         )
         await self.uow.commit()
         return organizations
 
+    def stream(
+        self,
+        query: dto.OrgActivityQuery,
+        include: list[IncludeType] | None = None,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        return self._stream(
+            self.db_gateway.stream_all_by_activity_tree(
+                activity_name=query.activity_name,
+                depth=query.depth,
+                fields=fields,
+            ),
+            include,
+        )
+
+
+class GetAllByActivityFilter(
+    OrganizationInteractor[dto.ActivityFilterQuery, list[dto.Organization]],
+):
+    async def __call__(
+        self,
+        query: dto.ActivityFilterQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        organizations = await self.db_gateway.get_all_by_activity_filter(
+            query=query, page=page, fields=fields,
+        )
+        await self.uow.commit()
+        return organizations
+
+    def stream(
+        self,
+        query: dto.ActivityFilterQuery,
+        include: list[IncludeType] | None = None,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        return self._stream(
+            self.db_gateway.stream_all_by_activity_filter(
+                query=query, fields=fields,
+            ),
+            include,
+        )
+
+
+class GetActivityCounts(
+    OrganizationInteractor[None, list[dto.ActivityCount]],
+):
+    async def __call__(self, data: None = None) -> list[dto.ActivityCount]:
+        counts = await self.db_gateway.get_activity_counts()
+        await self.uow.commit()
+        return counts
+
+
+class SearchOrganizations(
+    OrganizationInteractor[dto.TextSearchQuery, list[dto.Organization]],
+):
+    async def __call__(
+        self, query: dto.TextSearchQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        organizations = await self.db_gateway.search(query, fields)
+        await self.uow.commit()
+        return organizations
+
+
+class SearchOrganizationsFuzzy(
+    OrganizationInteractor[dto.TextSearchQuery, list[dto.Organization]],
+):
+    async def __call__(
+        self, query: dto.TextSearchQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        organizations = await self.db_gateway.search_fuzzy(query, fields)
+        await self.uow.commit()
+        return organizations
+
+
+class Suggest(OrganizationInteractor[dto.SuggestQuery, list[dto.Suggestion]]):
+    async def __call__(self, query: dto.SuggestQuery) -> list[dto.Suggestion]:
+        suggestions = await self.db_gateway.suggest(query)
+        await self.uow.commit()
+        return suggestions
+
+
+class IncludeRelations(
+    OrganizationInteractor[dto.IncludeQuery, list[dto.Organization]],
+):
+    async def __call__(
+        self, query: dto.IncludeQuery,
+    ) -> list[dto.Organization]:
+        organizations = await self.db_gateway.include_relations(query)
+        await self.uow.commit()
+        return organizations
+
 
 class AddOrganization(OrganizationInteractor[dto.OrgCreate, dto.Organization]):
     async def __call__(
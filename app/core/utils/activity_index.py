@@ -0,0 +1,124 @@
+from collections import Counter, defaultdict
+from typing import Iterable
+
+
+class ActivityIndex:
+    """Organization ids of every activity as bitmaps.
+
+    A bitmap is a Python int with bit ``n`` set for organization ``n``, so
+    unions, intersections and differences of activities are single
+    big-int operations. ``version`` is the last change applied.
+
+    Organization counts of every activity are rolled up along with the
+    bitmaps: direct ones and ones of the whole subtree, where an
+    organization counts once however many of its activities are inside.
+    Subtrees come from ``ancestors``, see ``ActivityTaxonomy.ancestors``.
+    """
+
+    def __init__(self) -> None:
+        self.version: int | None = None
+        self.ancestors: dict[int, frozenset[int]] = {}
+        self._bitmaps: dict[int, int] = {}
+        self._organizations: dict[int, frozenset[int]] = {}
+        self._direct: Counter[int] = Counter()
+        self._subtree: Counter[int] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._organizations)
+
+    def upsert(self, organization_id: int, activity_ids: Iterable[int]) -> None:
+        activity_ids = frozenset(activity_ids)
+        old = self._organizations.get(organization_id, frozenset())
+        if activity_ids == old:
+            return
+        bit = 1 << organization_id
+        for activity_id in old - activity_ids:
+            if bitmap := self._bitmaps[activity_id] & ~bit:
+                self._bitmaps[activity_id] = bitmap
+            else:
+                del self._bitmaps[activity_id]
+        for activity_id in activity_ids - old:
+            self._bitmaps[activity_id] = self._bitmaps.get(activity_id, 0) | bit
+
+        self._direct.subtract(old - activity_ids)
+        self._direct.update(activity_ids - old)
+        covered_old, covered = self._covered(old), self._covered(activity_ids)
+        self._subtree.subtract(covered_old - covered)
+        self._subtree.update(covered - covered_old)
+        if activity_ids:
+            self._organizations[organization_id] = activity_ids
+        else:
+            self._organizations.pop(organization_id, None)
+
+    def discard(self, organization_id: int) -> None:
+        self.upsert(organization_id, ())
+
+    def rebuild(self, rows: Iterable[tuple[int, int]]) -> None:
+        """Load ``(organization_id, activity_id)`` pairs."""
+        organizations = defaultdict(set)
+        members = defaultdict(list)
+        for organization_id, activity_id in rows:
+            organizations[organization_id].add(activity_id)
+            members[activity_id].append(organization_id)
+
+        # Bits are set in a buffer, or-ing them into an int one by one
+        # would copy the whole bitmap for every organization.
+        self._bitmaps = {}
+        for activity_id, ids in members.items():
+            buffer = bytearray(max(ids) // 8 + 1)
+            for id_ in ids:
+                buffer[id_ >> 3] |= 1 << (id_ & 7)
+            self._bitmaps[activity_id] = int.from_bytes(buffer, "little")
+        self._organizations = {
+            id_: frozenset(ids) for id_, ids in organizations.items()
+        }
+        self._recount()
+
+    def set_ancestors(self, ancestors: dict[int, frozenset[int]]) -> None:
+        self.ancestors = ancestors
+        self._recount()
+
+    def counts(self, activity_id: int) -> tuple[int, int]:
+        """Direct and subtree organization counts of the activity."""
+        return self._direct[activity_id], self._subtree[activity_id]
+
+    def facet(self, organization_ids: Iterable[int]) -> Counter[int]:
+        """Number of the given organizations in every activity."""
+        counts = Counter()
+        for id_ in organization_ids:
+            counts.update(self._organizations.get(id_, ()))
+        return counts
+
+    def bitmap(self, activity_id: int) -> int:
+        return self._bitmaps.get(activity_id, 0)
+
+    def any_of(self, activity_ids: Iterable[int]) -> int:
+        bitmap = 0
+        for activity_id in activity_ids:
+            bitmap |= self.bitmap(activity_id)
+        return bitmap
+
+    def _covered(self, activity_ids: frozenset[int]) -> set[int]:
+        """Activities whose subtree holds any of ``activity_ids``."""
+        covered = set(activity_ids)
+        for activity_id in activity_ids:
+            covered.update(self.ancestors.get(activity_id, ()))
+        return covered
+
+    def _recount(self) -> None:
+        self._direct = Counter()
+        self._subtree = Counter()
+        for activity_ids in self._organizations.values():
+            self._direct.update(activity_ids)
+            self._subtree.update(self._covered(activity_ids))
+
+
+def bitmap_ids(bitmap: int) -> list[int]:
+    """Positions of the set bits in ascending order."""
+    bits = bin(bitmap)[:1:-1]
+    ids = []
+    i = bits.find("1")
+    while i != -1:
+        ids.append(i)
+        i = bits.find("1", i + 1)
+    return ids
@@ -1,6 +1,9 @@
-from math import cos, radians
+from math import (
+    asin, atan, cos, degrees, floor, log, pi, radians, sin, sinh, sqrt, tan,
+)
 
 EARTH_RADIUS_KM = 6371.0
+MERCATOR_MAX_LAT = 85.05112878
 
 
 def bounding_box(lat, lon, radius_km):
@@ -12,3 +15,142 @@ def bounding_box(lat, lon, radius_km):
         lat + lat_deg,
         lon + lon_deg,
     )
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = (
+        sin((lat2 - lat1) / 2) ** 2
+        + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def mercator_xy(lat: float, lon: float, zoom: int) -> tuple[float, float]:
+    """Web Mercator coordinates of the point measured in tiles of ``zoom``."""
+    n = 1 << zoom
+    lat = radians(max(-MERCATOR_MAX_LAT, min(MERCATOR_MAX_LAT, lat)))
+    return (
+        (lon + 180.0) / 360.0 * n,
+        (1.0 - log(tan(lat) + 1 / cos(lat)) / pi) / 2.0 * n,
+    )
+
+
+def tile_xy(lat: float, lon: float, zoom: int) -> tuple[int, int]:
+    """Web Mercator (slippy map) tile holding the point."""
+    n = 1 << zoom
+    x, y = mercator_xy(lat, lon, zoom)
+    return min(max(floor(x), 0), n - 1), min(max(floor(y), 0), n - 1)
+
+
+def tile_bounds(
+    zoom: int, x: int, y: int,
+) -> tuple[float, float, float, float]:
+    n = 1 << zoom
+    return (
+        degrees(atan(sinh(pi * (1 - 2 * (y + 1) / n)))),
+        x / n * 360.0 - 180.0,
+        degrees(atan(sinh(pi * (1 - 2 * y / n)))),
+        (x + 1) / n * 360.0 - 180.0,
+    )
+
+
+GEO_KEY_BITS = 24
+_GEO_KEY_SIDE = 1 << GEO_KEY_BITS
+
+
+def _quantize_lat(lat: float) -> int:
+    # Same arithmetic as the trigger computing buildings.geo_key in SQLite.
+    cell = int((lat + 90.0) / 180.0 * _GEO_KEY_SIDE)
+    return min(max(cell, 0), _GEO_KEY_SIDE - 1)
+
+
+def _quantize_lon(lon: float) -> int:
+    cell = int((lon + 180.0) / 360.0 * _GEO_KEY_SIDE)
+    return min(max(cell, 0), _GEO_KEY_SIDE - 1)
+
+
+def _spread_bits(value: int) -> int:
+    value = (value | (value << 16)) & 0x0000FFFF0000FFFF
+    value = (value | (value << 8)) & 0x00FF00FF00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value << 2)) & 0x3333333333333333
+    return (value | (value << 1)) & 0x5555555555555555
+
+
+def _morton(x: int, y: int) -> int:
+    return (_spread_bits(x) << 1) | _spread_bits(y)
+
+
+def geo_key(lat: float, lon: float) -> int:
+    """Z-order (integer geohash) key: interleaved bits of lon and lat."""
+    return _morton(_quantize_lon(lon), _quantize_lat(lat))
+
+
+def geo_key_ranges(
+    lat_min: float,
+    lon_min: float,
+    lat_max: float,
+    lon_max: float,
+    max_ranges: int = 16,
+) -> list[tuple[int, int]]:
+    """Inclusive ``geo_key`` ranges covering the rect.
+
+    The rect is split into aligned quadtree cells, each of them is one
+    contiguous key range. Cells are refined while the number of ranges
+    stays within ``max_ranges``, so the ranges may cover a bit more than
+    the rect itself.
+    """
+    x0, x1 = _quantize_lon(lon_min), _quantize_lon(lon_max)
+    y0, y1 = _quantize_lat(lat_min), _quantize_lat(lat_max)
+    size = 1
+    while size < max(x1 - x0, y1 - y0) + 1:
+        size <<= 1
+
+    def intersecting(cells: list[tuple[int, int]], size: int):
+        return [
+            (x, y) for x, y in cells
+            if x <= x1 and x + size > x0 and y <= y1 and y + size > y0
+        ]
+
+    full: list[tuple[int, int, int]] = []
+    partial = intersecting(
+        [
+            (x, y)
+            for x in (x0 // size * size, x0 // size * size + size)
+            for y in (y0 // size * size, y0 // size * size + size)
+        ],
+        size,
+    )
+    while partial and size > 1:
+        half = size >> 1
+        children = intersecting(
+            [
+                (x + dx, y + dy)
+                for x, y in partial
+                for dx in (0, half)
+                for dy in (0, half)
+            ],
+            half,
+        )
+        if len(full) + len(children) > max_ranges:
+            break
+        partial = []
+        for x, y in children:
+            if x0 <= x and x + half <= x1 + 1 and y0 <= y and y + half <= y1 + 1:
+                full.append((x, y, half))
+            else:
+                partial.append((x, y))
+        size = half
+
+    ranges = sorted(
+        (_morton(x, y), _morton(x, y) + cell_size * cell_size - 1)
+        for x, y, cell_size in full + [(x, y, size) for x, y in partial]
+    )
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        if start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from math import floor
+from typing import Any, Iterable
+
+Cell = tuple[int, int]
+CellBuildings = dict[int, tuple[float, float, list[Any]]]
+
+
+class GeoCellCache:
+    """LRU of lat/lon grid cells with the buildings inside and their items.
+
+    Query areas are snapped to the cells covering them, so queries that
+    merely overlap share cached cells and only trim them to their exact
+    shape. ``version`` is the last change the cache was synced with.
+    """
+
+    def __init__(self, cell_size: float = 0.01, max_size: int = 4096) -> None:
+        self.cell_size = cell_size
+        self.max_size = max_size
+        self.version: int | None = None
+        self._cells: OrderedDict[Cell, CellBuildings] = OrderedDict()
+        self._buildings: dict[int, Cell] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def cell(self, lat: float, lon: float) -> Cell:
+        return floor(lat / self.cell_size), floor(lon / self.cell_size)
+
+    def cell_count(
+        self, lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+    ) -> int:
+        """Number of cells ``cells()`` returns, without listing them."""
+        row_min, col_min = self.cell(lat_min, lon_min)
+        row_max, col_max = self.cell(lat_max, lon_max)
+        return (row_max - row_min + 1) * (col_max - col_min + 1)
+
+    def cells(
+        self, lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+    ) -> list[Cell]:
+        row_min, col_min = self.cell(lat_min, lon_min)
+        row_max, col_max = self.cell(lat_max, lon_max)
+        return [
+            (row, col)
+            for row in range(row_min, row_max + 1)
+            for col in range(col_min, col_max + 1)
+        ]
+
+    def cell_bounds(self, cell: Cell) -> tuple[float, float, float, float]:
+        row, col = cell
+        return (
+            row * self.cell_size,
+            col * self.cell_size,
+            (row + 1) * self.cell_size,
+            (col + 1) * self.cell_size,
+        )
+
+    def get(self, cell: Cell) -> CellBuildings | None:
+        if (buildings := self._cells.get(cell)) is None:
+            return None
+        self._cells.move_to_end(cell)
+        return buildings
+
+    def put(self, cell: Cell, buildings: CellBuildings) -> None:
+        self._pop(cell)
+        self._cells[cell] = buildings
+        for id_ in buildings:
+            self._buildings[id_] = cell
+        while len(self._cells) > self.max_size:
+            self._pop(next(iter(self._cells)))
+
+    def invalidate(
+        self, building_ids: Iterable[int], points: dict[int, tuple[float, float]],
+    ) -> None:
+        """Drop cells holding the buildings or covering their new ``points``."""
+        for id_ in building_ids:
+            if (cell := self._buildings.get(id_)) is not None:
+                self._pop(cell)
+            if (point := points.get(id_)) is not None:
+                self._pop(self.cell(*point))
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._buildings.clear()
+
+    def _pop(self, cell: Cell) -> None:
+        for id_ in self._cells.pop(cell, ()):
+            if self._buildings.get(id_) == cell:
+                del self._buildings[id_]
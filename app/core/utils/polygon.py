@@ -0,0 +1,59 @@
+from typing import Iterable, Sequence
+
+
+class Polygon:
+    """Polygon over ``(lat, lon)`` vertices, holes are not supported.
+
+    Edges are bucketed into horizontal bands by the latitudes they span,
+    so a point is ray cast against the few edges of its own band instead
+    of all of them. Self-intersecting outlines follow the even-odd rule.
+    """
+
+    def __init__(self, points: Sequence[tuple[float, float]]) -> None:
+        points = list(points)
+        if len(points) > 1 and points[0] == points[-1]:
+            points.pop()
+
+        lats = [lat for lat, _ in points]
+        lons = [lon for _, lon in points]
+        self.bbox = min(lats), min(lons), max(lats), max(lons)
+
+        # (lat_low, lat_high, lon at lat_low, lon change per degree of lat)
+        edges = []
+        for (lat1, lon1), (lat2, lon2) in zip(points, points[1:] + points[:1]):
+            if lat1 == lat2:
+                continue
+            if lat1 > lat2:
+                lat1, lon1, lat2, lon2 = lat2, lon2, lat1, lon1
+            edges.append((lat1, lat2, lon1, (lon2 - lon1) / (lat2 - lat1)))
+
+        self._lat_min = self.bbox[0]
+        self._band_count = max(1, min(len(edges), 4096))
+        self._band_height = (
+            (self.bbox[2] - self.bbox[0]) / self._band_count or 1.0
+        )
+        self._bands: list[list[tuple[float, float, float, float]]] = [
+            [] for _ in range(self._band_count)
+        ]
+        for edge in edges:
+            for band in range(self._band(edge[0]), self._band(edge[1]) + 1):
+                self._bands[band].append(edge)
+
+    def __contains__(self, point: tuple[float, float]) -> bool:
+        lat, lon = point
+        lat_min, lon_min, lat_max, lon_max = self.bbox
+        if not (lat_min <= lat <= lat_max and lon_min <= lon <= lon_max):
+            return False
+        inside = False
+        for low, high, lon0, slope in self._bands[self._band(lat)]:
+            if low <= lat < high and lon < lon0 + (lat - low) * slope:
+                inside = not inside
+        return inside
+
+    def filter(self, points: Iterable[tuple[int, float, float]]) -> list[int]:
+        """Ids of the ``(id, lat, lon)`` points lying inside."""
+        return [id_ for id_, lat, lon in points if (lat, lon) in self]
+
+    def _band(self, lat: float) -> int:
+        band = int((lat - self._lat_min) / self._band_height)
+        return min(max(band, 0), self._band_count - 1)
@@ -0,0 +1,262 @@
+import heapq
+from collections import defaultdict
+from math import asin, cos, floor, radians, sin
+from typing import Iterable, Iterator
+
+from app.core.utils.geo import (
+    EARTH_RADIUS_KM, bounding_box, haversine, tile_xy,
+)
+
+Cell = tuple[int, int]
+
+
+class GridIndex:
+    """Uniform lat/lon grid over point ids.
+
+    ``version`` is the last change applied to the index, the owner uses it
+    to decide whether the index has to be refreshed.
+    """
+
+    def __init__(self, cell_size: float = 0.01) -> None:
+        self.cell_size = cell_size
+        self.version: int | None = None
+        self._points: dict[int, tuple[float, float]] = {}
+        self._cells: dict[Cell, set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self._points
+
+    def get(self, id_: int) -> tuple[float, float] | None:
+        return self._points.get(id_)
+
+    def cell(self, lat: float, lon: float) -> Cell:
+        return floor(lat / self.cell_size), floor(lon / self.cell_size)
+
+    def upsert(self, id_: int, lat: float, lon: float) -> None:
+        if (old := self._points.get(id_)) is not None:
+            if old == (lat, lon):
+                return
+            self._discard_from_cell(id_, *old)
+        self._points[id_] = (lat, lon)
+        self._cells[self.cell(lat, lon)].add(id_)
+
+    def discard(self, id_: int) -> None:
+        if (old := self._points.pop(id_, None)) is not None:
+            self._discard_from_cell(id_, *old)
+
+    def rebuild(self, points: Iterable[tuple[int, float, float]]) -> None:
+        self._points.clear()
+        self._cells.clear()
+        for id_, lat, lon in points:
+            self.upsert(id_, lat, lon)
+
+    def in_rect(
+        self, lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+    ) -> list[int]:
+        return [
+            id_ for id_, (lat, lon) in self._candidates(
+                lat_min, lon_min, lat_max, lon_max,
+            )
+            if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+        ]
+
+    def in_radius(
+        self, lat: float, lon: float, radius_km: float,
+    ) -> list[tuple[int, float]]:
+        """Ids within ``radius_km`` of the point with their distances."""
+        result = []
+        for id_, point in self._candidates(
+            *bounding_box(lat, lon, radius_km),
+        ):
+            distance = haversine(lat, lon, *point)
+            if distance <= radius_km:
+                result.append((id_, distance))
+        return result
+
+    def nearest(
+        self, lat: float, lon: float, max_distance: float | None = None,
+    ) -> Iterator[tuple[int, float]]:
+        """Ids with their distances in ascending order of distance.
+
+        Cells are visited ring by ring around the point, a candidate is
+        yielded once no unvisited cell can hold anything closer.
+        """
+        row0, col0 = self.cell(lat, lon)
+        heap: list[tuple[float, int]] = []
+        visited = 0
+        ring = 0
+        scan_rest = not self._cells
+        while True:
+            if scan_rest:
+                # The ring walk has covered as many cells as are occupied,
+                # scanning the rest directly is cheaper than going wider.
+                cells = [
+                    c for c in self._cells
+                    if max(abs(c[0] - row0), abs(c[1] - col0)) >= ring
+                ]
+                bound = float("inf")
+            else:
+                cells = _ring(row0, col0, ring)
+                bound = self._ring_bound(lat, lon, row0, col0, ring)
+            for c in cells:
+                for id_ in self._cells.get(c, ()):
+                    heapq.heappush(
+                        heap, (haversine(lat, lon, *self._points[id_]), id_),
+                    )
+
+            if max_distance is not None:
+                bound = min(bound, max_distance)
+            while heap and heap[0][0] <= bound:
+                distance, id_ = heapq.heappop(heap)
+                yield id_, distance
+            if scan_rest or bound == max_distance:
+                return
+            visited += len(cells)
+            scan_rest = visited >= len(self._cells)
+            ring += 1
+
+    def _ring_bound(
+        self, lat: float, lon: float, row0: int, col0: int, ring: int,
+    ) -> float:
+        """Lower bound of the distance to points beyond ``ring``."""
+        lat_gap = min(
+            lat - (row0 - ring) * self.cell_size,
+            (row0 + ring + 1) * self.cell_size - lat,
+        )
+        lon_gap = min(
+            lon - (col0 - ring) * self.cell_size,
+            (col0 + ring + 1) * self.cell_size - lon,
+        )
+        lon_gap_km = EARTH_RADIUS_KM * asin(
+            min(1.0, cos(radians(lat)) * sin(radians(min(lon_gap, 90.0)))),
+        )
+        return min(EARTH_RADIUS_KM * radians(lat_gap), lon_gap_km)
+
+    def _candidates(
+        self, lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+    ) -> Iterable[tuple[int, tuple[float, float]]]:
+        row_min, col_min = self.cell(lat_min, lon_min)
+        row_max, col_max = self.cell(lat_max, lon_max)
+        cells_in_range = (row_max - row_min + 1) * (col_max - col_min + 1)
+        if cells_in_range > len(self._cells):
+            cells = (
+                ids for (row, col), ids in self._cells.items()
+                if row_min <= row <= row_max and col_min <= col <= col_max
+            )
+        else:
+            cells = (
+                self._cells[c] for c in (
+                    (row, col)
+                    for row in range(row_min, row_max + 1)
+                    for col in range(col_min, col_max + 1)
+                )
+                if c in self._cells
+            )
+        for ids in cells:
+            for id_ in ids:
+                yield id_, self._points[id_]
+
+    def _discard_from_cell(self, id_: int, lat: float, lon: float) -> None:
+        cell = self.cell(lat, lon)
+        ids = self._cells[cell]
+        ids.discard(id_)
+        if not ids:
+            del self._cells[cell]
+
+
+class ClusterGrid:
+    """Weighted points pre-aggregated into map tiles of every zoom level.
+
+    Each tile keeps the total weight and the weighted sums of coordinates,
+    so counts and centroids of a viewport are read without touching the
+    points themselves.
+    """
+
+    def __init__(self, max_zoom: int = 16) -> None:
+        self.max_zoom = max_zoom
+        self.version: int | None = None
+        self._points: dict[int, tuple[float, float, int]] = {}
+        self._levels: list[dict[Cell, list[float]]] = [
+            {} for _ in range(max_zoom + 1)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def upsert(self, id_: int, lat: float, lon: float, weight: int) -> None:
+        if self._points.get(id_) == (lat, lon, weight):
+            return
+        self.discard(id_)
+        if weight:
+            self._points[id_] = (lat, lon, weight)
+            self._add(lat, lon, weight)
+
+    def discard(self, id_: int) -> None:
+        if (old := self._points.pop(id_, None)) is not None:
+            lat, lon, weight = old
+            self._add(lat, lon, -weight)
+
+    def rebuild(self, points: Iterable[tuple[int, float, float, int]]) -> None:
+        self._points.clear()
+        for level in self._levels:
+            level.clear()
+        for id_, lat, lon, weight in points:
+            self.upsert(id_, lat, lon, weight)
+
+    def clusters(
+        self,
+        zoom: int,
+        lat_min: float,
+        lon_min: float,
+        lat_max: float,
+        lon_max: float,
+    ) -> list[tuple[Cell, int, float, float]]:
+        """Tiles of the viewport with their weight and centroid."""
+        zoom = min(zoom, self.max_zoom)
+        level = self._levels[zoom]
+        x_min, y_min = tile_xy(lat_max, lon_min, zoom)
+        x_max, y_max = tile_xy(lat_min, lon_max, zoom)
+        if (x_max - x_min + 1) * (y_max - y_min + 1) > len(level):
+            cells = [
+                c for c in level
+                if x_min <= c[0] <= x_max and y_min <= c[1] <= y_max
+            ]
+        else:
+            cells = [
+                (x, y)
+                for x in range(x_min, x_max + 1)
+                for y in range(y_min, y_max + 1)
+                if (x, y) in level
+            ]
+        result = []
+        for c in cells:
+            weight, sum_lat, sum_lon = level[c]
+            result.append((c, weight, sum_lat / weight, sum_lon / weight))
+        return result
+
+    def _add(self, lat: float, lon: float, weight: int) -> None:
+        for zoom, level in enumerate(self._levels):
+            cell = tile_xy(lat, lon, zoom)
+            if (acc := level.get(cell)) is None:
+                acc = level[cell] = [0, 0.0, 0.0]
+            acc[0] += weight
+            acc[1] += lat * weight
+            acc[2] += lon * weight
+            if not acc[0]:
+                del level[cell]
+
+
+def _ring(row: int, col: int, ring: int) -> list[Cell]:
+    if ring == 0:
+        return [(row, col)]
+    cells = []
+    for c in range(col - ring, col + ring + 1):
+        cells.append((row - ring, c))
+        cells.append((row + ring, c))
+    for r in range(row - ring + 1, row + ring):
+        cells.append((r, col - ring))
+        cells.append((r, col + ring))
+    return cells
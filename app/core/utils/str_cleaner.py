@@ -26,6 +26,13 @@ class StrNormalizer:
         cleaned = self.strip(cleaned)
         return cleaned
 
+    def fold(self, value: str | None) -> str | None:
+        """Caseless form for exact lookups, "ё" is treated as "е"."""
+        cleaned = self.full_clean(value)
+        if not cleaned:
+            return cleaned
+        return cleaned.casefold().replace("ё", "е")
+
 
 class AddressCleaner(StrNormalizer):
     def __init__(
@@ -0,0 +1,78 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Iterable
+
+from app.core.utils.str_cleaner import StrNormalizer
+
+
+class PrefixIndex:
+    """Distinct names of rows sorted by their folded form.
+
+    Names starting with a prefix are a contiguous run of the sorted list
+    found by bisect. Equal names of several rows are listed once and
+    counted. ``version`` is the last change the index was synced with.
+    """
+
+    def __init__(self, normalizer: StrNormalizer | None = None) -> None:
+        self.normalizer = StrNormalizer() if normalizer is None else normalizer
+        self.version: int | None = None
+        self._names: dict[int, str] = {}
+        self._entries: list[tuple[str, str]] = []
+        self._counts: Counter[tuple[str, str]] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def upsert(self, row_id: int, name: str | None) -> None:
+        if self._names.get(row_id) == name:
+            return
+        self.discard(row_id)
+        if not name:
+            return
+        entry = self._entry(name)
+        if not self._counts[entry]:
+            insort(self._entries, entry)
+        self._counts[entry] += 1
+        self._names[row_id] = name
+
+    def discard(self, row_id: int) -> None:
+        name = self._names.pop(row_id, None)
+        if name is None:
+            return
+        entry = self._entry(name)
+        self._counts[entry] -= 1
+        if not self._counts[entry]:
+            del self._counts[entry]
+            del self._entries[bisect_left(self._entries, entry)]
+
+    def rebuild(self, rows: Iterable[tuple[int, str | None]]) -> None:
+        """Load ``(row_id, name)`` pairs."""
+        self._names = {row_id: name for row_id, name in rows if name}
+        self._counts = Counter(map(self._entry, self._names.values()))
+        self._entries = sorted(self._counts)
+
+    def search(self, prefix: str, limit: int = 10) -> list[str]:
+        """First ``limit`` names starting with the prefix, in order."""
+        key = self.normalizer.fold(prefix) or ""
+        names = []
+        i = bisect_left(self._entries, (key,))
+        while (
+            len(names) < limit
+            and i < len(self._entries)
+            and self._entries[i][0].startswith(key)
+        ):
+            names.append(self._entries[i][1])
+            i += 1
+        return names
+
+    def _entry(self, name: str) -> tuple[str, str]:
+        return self.normalizer.fold(name), name
+
+
+class SuggestIndex:
+    """Prefix indexes of organization, activity and street names."""
+
+    def __init__(self, normalizer: StrNormalizer | None = None) -> None:
+        self.organizations = PrefixIndex(normalizer)
+        self.activities = PrefixIndex(normalizer)
+        self.streets = PrefixIndex(normalizer)
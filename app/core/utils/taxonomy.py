@@ -0,0 +1,75 @@
+from collections import defaultdict
+from typing import Iterable
+
+from app.core.utils.str_cleaner import StrNormalizer
+
+MAX_TREE_DEPTH = 3
+
+
+class ActivityTaxonomy:
+    """Activity names and subtrees kept in memory.
+
+    Names are folded with ``StrNormalizer.fold`` so lookups ignore case
+    and "ё". ``version`` is the last change the taxonomy was loaded at.
+    """
+
+    def __init__(self, normalizer: StrNormalizer | None = None) -> None:
+        self.normalizer = StrNormalizer() if normalizer is None else normalizer
+        self.version: int | None = None
+        # Name and parent id of every activity.
+        self.activities: dict[int, tuple[str, int | None]] = {}
+        # Ids of every activity's ancestors, itself included. Replaced as
+        # a whole on rebuild, so holders can tell a reload by identity.
+        self.ancestors: dict[int, frozenset[int]] = {}
+        self._names: dict[str, frozenset[int]] = {}
+        # Subtrees of every activity limited to 1..MAX_TREE_DEPTH levels.
+        self._subtrees: dict[int, tuple[frozenset[int], ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._subtrees)
+
+    def rebuild(
+        self,
+        activities: Iterable[tuple[int, str, int | None]],
+        closure: Iterable[tuple[int, int, int]],
+    ) -> None:
+        """Load ``(id, name, parent_id)`` and ``(ancestor, descendant, depth)``."""
+        self.activities = {
+            id_: (name, parent_id) for id_, name, parent_id in activities
+        }
+        names = defaultdict(set)
+        levels = defaultdict(lambda: [set() for _ in range(MAX_TREE_DEPTH)])
+        ancestors = defaultdict(set)
+        for id_, (name, _) in self.activities.items():
+            names[self.normalizer.fold(name)].add(id_)
+            levels[id_][0].add(id_)
+            ancestors[id_].add(id_)
+        for ancestor_id, descendant_id, depth in closure:
+            if ancestor_id not in levels or descendant_id not in levels:
+                continue
+            ancestors[descendant_id].add(ancestor_id)
+            if 0 < depth < MAX_TREE_DEPTH:
+                levels[ancestor_id][depth].add(descendant_id)
+
+        self.ancestors = {id_: frozenset(ids) for id_, ids in ancestors.items()}
+        self._names = {name: frozenset(ids) for name, ids in names.items()}
+        self._subtrees = {}
+        for id_, id_levels in levels.items():
+            subtree: set[int] = set()
+            subtrees = []
+            for level in id_levels:
+                subtree |= level
+                subtrees.append(frozenset(subtree))
+            self._subtrees[id_] = tuple(subtrees)
+
+    def find(self, name: str) -> frozenset[int]:
+        return self._names.get(self.normalizer.fold(name), frozenset())
+
+    def subtree(
+        self, activity_id: int, depth: int = MAX_TREE_DEPTH,
+    ) -> frozenset[int]:
+        """Ids of the activity and its descendants, ``depth`` levels in all."""
+        subtrees = self._subtrees.get(activity_id)
+        if subtrees is None:
+            return frozenset()
+        return subtrees[min(max(depth, 1), MAX_TREE_DEPTH) - 1]
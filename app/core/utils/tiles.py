@@ -0,0 +1,90 @@
+import struct
+from collections import OrderedDict
+from typing import Iterable
+
+from app.core.utils.geo import mercator_xy, tile_xy
+
+TileKey = tuple[int, int, int]
+
+MAX_ZOOM = 22
+TILE_MAGIC = b"RTT1"
+TILE_HEADER = struct.Struct("<4sBIII")
+TILE_POINT = struct.Struct("<IIHH")
+
+
+def encode_tile(
+    zoom: int, x: int, y: int, points: Iterable[tuple[int, int, float, float]],
+) -> bytes:
+    """Pack ``(org_id, activity_id, lat, lon)`` points of one tile.
+
+    Layout, little endian: magic ``RTT1``, zoom ``u8``, x ``u32``, y ``u32``,
+    point count ``u32``, then per point org id ``u32``, activity id ``u32``
+    (0 when none) and the position inside the tile as ``u16`` x and y,
+    quantized to 1/65536 of the tile side.
+    """
+    body = bytearray()
+    count = 0
+    for org_id, activity_id, lat, lon in sorted(points):
+        px, py = mercator_xy(lat, lon, zoom)
+        body += TILE_POINT.pack(
+            org_id,
+            activity_id or 0,
+            min(max(int((px - x) * 65536), 0), 65535),
+            min(max(int((py - y) * 65536), 0), 65535),
+        )
+        count += 1
+    return TILE_HEADER.pack(TILE_MAGIC, zoom, x, y, count) + bytes(body)
+
+
+class TileCache:
+    """LRU of encoded tiles that knows which buildings each tile holds."""
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self.version: int | None = None
+        self._tiles: OrderedDict[TileKey, tuple[bytes, frozenset[int]]] = (
+            OrderedDict()
+        )
+        self._buildings: dict[int, set[TileKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def get(self, key: TileKey) -> bytes | None:
+        if (item := self._tiles.get(key)) is None:
+            return None
+        self._tiles.move_to_end(key)
+        return item[0]
+
+    def put(self, key: TileKey, tile: bytes, building_ids: Iterable[int]) -> None:
+        self._pop(key)
+        building_ids = frozenset(building_ids)
+        self._tiles[key] = (tile, building_ids)
+        for id_ in building_ids:
+            self._buildings.setdefault(id_, set()).add(key)
+        while len(self._tiles) > self.max_size:
+            self._pop(next(iter(self._tiles)))
+
+    def invalidate(
+        self, building_ids: Iterable[int], points: dict[int, tuple[float, float]],
+    ) -> None:
+        """Drop tiles holding the buildings or covering their new ``points``."""
+        for id_ in building_ids:
+            for key in list(self._buildings.get(id_, ())):
+                self._pop(key)
+            if (point := points.get(id_)) is not None:
+                for zoom in range(MAX_ZOOM + 1):
+                    self._pop((zoom, *tile_xy(*point, zoom)))
+
+    def clear(self) -> None:
+        self._tiles.clear()
+        self._buildings.clear()
+
+    def _pop(self, key: TileKey) -> None:
+        if (item := self._tiles.pop(key, None)) is None:
+            return
+        for id_ in item[1]:
+            keys = self._buildings[id_]
+            keys.discard(key)
+            if not keys:
+                del self._buildings[id_]
@@ -0,0 +1,104 @@
+import re
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from sys import intern
+from typing import Iterable
+
+from app.core.utils.str_cleaner import StrNormalizer
+
+# Latin letters looking like Cyrillic ones, after case folding.
+_HOMOGLYPHS = str.maketrans("aceopxykmtbh", "асеорхукмтвн")
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class TrigramIndex:
+    """Inverted index from name trigrams to organization ids.
+
+    Names are folded with ``StrNormalizer.fold`` and Latin look-alikes are
+    replaced with Cyrillic letters, so typos and mixed alphabets still
+    share most trigrams. Postings are sorted ``array`` of ids and trigrams
+    are interned, ``version`` is the last change the index was synced with.
+    """
+
+    def __init__(self, normalizer: StrNormalizer | None = None) -> None:
+        self.normalizer = StrNormalizer() if normalizer is None else normalizer
+        self.version: int | None = None
+        self._names: dict[int, str] = {}
+        self._sizes: dict[int, int] = {}
+        self._postings: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def trigrams(self, name: str) -> set[str]:
+        """Trigrams of every word padded like pg_trgm does."""
+        name = (self.normalizer.fold(name) or "").translate(_HOMOGLYPHS)
+        trigrams = set()
+        for word in _WORD_PATTERN.findall(name):
+            word = f"  {word} "
+            trigrams.update(word[i:i + 3] for i in range(len(word) - 2))
+        return trigrams
+
+    def upsert(self, organization_id: int, name: str) -> None:
+        if self._names.get(organization_id) == name:
+            return
+        self.discard(organization_id)
+        trigrams = self.trigrams(name)
+        for trigram in trigrams:
+            posting = self._postings.get(trigram)
+            if posting is None:
+                self._postings[intern(trigram)] = array("L", (organization_id,))
+            else:
+                insort(posting, organization_id)
+        self._names[organization_id] = intern(name)
+        self._sizes[organization_id] = len(trigrams)
+
+    def discard(self, organization_id: int) -> None:
+        name = self._names.pop(organization_id, None)
+        if name is None:
+            return
+        del self._sizes[organization_id]
+        for trigram in self.trigrams(name):
+            posting = self._postings[trigram]
+            del posting[bisect_left(posting, organization_id)]
+            if not posting:
+                del self._postings[trigram]
+
+    def rebuild(self, rows: Iterable[tuple[int, str]]) -> None:
+        """Load ``(organization_id, name)`` pairs."""
+        postings: dict[str, list[int]] = {}
+        self._names = {}
+        self._sizes = {}
+        for organization_id, name in rows:
+            trigrams = self.trigrams(name)
+            for trigram in trigrams:
+                postings.setdefault(intern(trigram), []).append(organization_id)
+            self._names[organization_id] = intern(name)
+            self._sizes[organization_id] = len(trigrams)
+        self._postings = {
+            trigram: array("L", sorted(ids))
+            for trigram, ids in postings.items()
+        }
+
+    def search(
+        self, text: str, limit: int = 20, threshold: float = 0.3,
+    ) -> list[tuple[int, float]]:
+        """Best ``(organization_id, similarity)`` matches of the text.
+
+        Similarity is the share of common trigrams among the trigrams of
+        both, like ``similarity()`` of pg_trgm.
+        """
+        trigrams = self.trigrams(text)
+        hits = Counter()
+        for trigram in trigrams:
+            hits.update(self._postings.get(trigram, ()))
+        scores = []
+        for organization_id, common in hits.items():
+            score = common / (
+                len(trigrams) + self._sizes[organization_id] - common
+            )
+            if score >= threshold:
+                scores.append((organization_id, score))
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores[:limit]
@@ -0,0 +1,152 @@
+from collections import defaultdict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import dto
+from app.core.utils.activity_index import ActivityIndex, bitmap_ids
+from app.core.utils.taxonomy import ActivityTaxonomy
+from app.infrastructure.db import models
+from app.infrastructure.db.gateways.base import BaseGateway, IN_CHUNK_SIZE
+from app.infrastructure.db.gateways.change_log import ChangeLogGateway
+
+
+class ActivityDbGateway(BaseGateway[models.Activity]):
+    def __init__(
+        self,
+        session: AsyncSession,
+        taxonomy: ActivityTaxonomy,
+        activity_index: ActivityIndex,
+    ):
+        super().__init__(models.Activity, session)
+        self.change_log = ChangeLogGateway(session)
+        self.taxonomy = taxonomy
+        self.activity_index = activity_index
+
+    async def get_organization_ids_by_name(
+        self, activity_name: str,
+    ) -> list[int]:
+        await self._sync()
+        return bitmap_ids(
+            self.activity_index.any_of(self.taxonomy.find(activity_name)),
+        )
+
+    async def get_organization_ids_by_tree(
+        self, activity_name: str, depth: int,
+    ) -> list[int]:
+        await self._sync()
+        return bitmap_ids(self.activity_index.any_of(set().union(*(
+            self.taxonomy.subtree(activity_id, depth)
+            for activity_id in self.taxonomy.find(activity_name)
+        ))))
+
+    async def get_organization_ids_by_filter(
+        self, query: dto.ActivityFilterQuery,
+    ) -> list[int]:
+        await self._sync()
+
+        def bitmap(name: str) -> int:
+            return self.activity_index.any_of(set().union(*(
+                self.taxonomy.subtree(activity_id, query.depth)
+                for activity_id in self.taxonomy.find(name)
+            )))
+
+        if query.any_of:
+            result = 0
+            for name in query.any_of:
+                result |= bitmap(name)
+        else:
+            result = bitmap(query.all_of[0])
+        for name in query.all_of:
+            result &= bitmap(name)
+        for name in query.none_of:
+            result &= ~bitmap(name)
+        return bitmap_ids(result)
+
+    async def get_counts(self) -> list[dto.ActivityCount]:
+        await self._sync()
+        children = defaultdict(list)
+        for id_, (name, parent_id) in self.taxonomy.activities.items():
+            if parent_id not in self.taxonomy.activities:
+                parent_id = None
+            direct_count, subtree_count = self.activity_index.counts(id_)
+            children[parent_id].append(dto.ActivityCount(
+                id=id_,
+                name=name,
+                parent_id=parent_id,
+                direct_count=direct_count,
+                subtree_count=subtree_count,
+            ))
+        for items in children.values():
+            items.sort(key=lambda item: item.name)
+            for item in items:
+                item.children = children.get(item.id, [])
+        return children[None]
+
+    async def get_facets(
+        self, organization_ids: list[int],
+    ) -> list[dto.ActivityFacet]:
+        await self._sync()
+        activities = self.taxonomy.activities
+        facets = [
+            dto.ActivityFacet(id=id_, name=activities[id_][0], count=count)
+            for id_, count in self.activity_index.facet(organization_ids).items()
+            if id_ in activities
+        ]
+        facets.sort(key=lambda facet: (-facet.count, facet.name))
+        return facets
+
+    async def _sync(self) -> None:
+        await self._sync_taxonomy(self.taxonomy)
+        await self._sync_activity_index(self.activity_index)
+        if self.activity_index.ancestors is not self.taxonomy.ancestors:
+            self.activity_index.set_ancestors(self.taxonomy.ancestors)
+
+    async def _sync_taxonomy(self, taxonomy: ActivityTaxonomy) -> None:
+        """Reload the taxonomy once activities changed, it is tiny."""
+        tables = (models.Activity.__tablename__,)
+        changes = await self.change_log.get_changes(taxonomy.version, tables)
+        if changes is None:
+            return
+
+        if changes.full or changes.rows:
+            closure = models.ActivityClosure
+            activities = await self.session.execute(
+                select(
+                    models.Activity.id,
+                    models.Activity.name,
+                    models.Activity.parent_id,
+                ),
+            )
+            links = await self.session.execute(
+                select(closure.ancestor_id, closure.descendant_id, closure.depth)
+                .where(closure.depth > 0),
+            )
+            taxonomy.rebuild(activities.tuples(), links.tuples())
+        taxonomy.version = changes.last_id
+
+    async def _sync_activity_index(self, index: ActivityIndex) -> None:
+        # Both tables log organization ids, deleted organizations drop out
+        # even when their org_activity rows are left behind.
+        tables = (
+            models.OrgActivity.__tablename__,
+            models.Organization.__tablename__,
+        )
+        changes = await self.change_log.get_changes(index.version, tables)
+        if changes is None:
+            return
+
+        stmt = select(
+            models.OrgActivity.organization_id, models.OrgActivity.activity_id,
+        ).join(models.Organization)
+        ids = set().union(*(changes.rows[table] for table in tables))
+        if changes.full or len(ids) > IN_CHUNK_SIZE:
+            index.rebuild((await self.session.execute(stmt)).tuples())
+        elif ids:
+            stmt = stmt.where(models.OrgActivity.organization_id.in_(ids))
+            activities = defaultdict(set)
+            for organization_id, activity_id in await self.session.execute(stmt):
+                activities[organization_id].add(activity_id)
+            for id_ in ids:
+                index.upsert(id_, activities.get(id_, ()))
+        index.version = changes.last_id
@@ -6,6 +6,8 @@ from sqlalchemy.orm.interfaces import ORMOption
 
 from app.infrastructure.db.models import Base
 
+IN_CHUNK_SIZE = 10_000
+
 Model_co = TypeVar("Model_co", bound=Base, covariant=True, contravariant=False)
 
 
@@ -0,0 +1,162 @@
+from sqlalchemy import Select, select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.utils.geo import geo_key_ranges
+from app.core.utils.geo_cache import GeoCellCache
+from app.core.utils.spatial_index import ClusterGrid, GridIndex
+from app.core.utils.tiles import TileCache
+from app.infrastructure.db import models
+from app.infrastructure.db.gateways.base import BaseGateway, IN_CHUNK_SIZE
+from app.infrastructure.db.gateways.change_log import ChangeLogGateway
+
+
+class BuildingDbGateway(BaseGateway[models.Building]):
+    def __init__(
+        self,
+        session: AsyncSession,
+        geo_index: GridIndex,
+        use_index: bool = False,
+        use_geo_key: bool = False,
+    ):
+        super().__init__(models.Building, session)
+        self.change_log = ChangeLogGateway(session)
+        self.geo_index = geo_index
+        self.use_index = use_index
+        self.use_geo_key = use_geo_key
+
+    async def get_index(self) -> GridIndex:
+        """The in-memory index synced with the buildings table."""
+        stmt = select(models.Building.id, models.Building.lat, models.Building.lon)
+        await self._sync(self.geo_index, (models.Building.__tablename__,), stmt)
+        return self.geo_index
+
+    async def sync_clusters(self, grid: ClusterGrid) -> None:
+        stmt = (
+            select(
+                models.Building.id,
+                models.Building.lat,
+                models.Building.lon,
+                func.count(models.Organization.id),
+            )
+            .outerjoin(models.Organization)
+            .group_by(models.Building.id)
+        )
+        tables = (models.Building.__tablename__, models.BUILDING_ORGANIZATIONS)
+        await self._sync(grid, tables, stmt)
+
+    async def sync_cache(self, cache: TileCache | GeoCellCache) -> None:
+        """Drop cached entries of buildings changed since the last sync."""
+        tables = (models.Building.__tablename__, models.BUILDING_ORGANIZATIONS)
+        changes = await self.change_log.get_changes(cache.version, tables)
+        if changes is None:
+            return
+
+        ids = set().union(*(changes.rows[table] for table in tables))
+        if changes.full or len(ids) > IN_CHUNK_SIZE:
+            cache.clear()
+        elif ids:
+            stmt = (
+                select(models.Building.id, models.Building.lat, models.Building.lon)
+                .where(models.Building.id.in_(ids))
+            )
+            cache.invalidate(ids, {
+                id_: (lat, lon) for id_, lat, lon in await self.session.execute(stmt)
+            })
+        cache.version = changes.last_id
+
+    async def get_points_in_bbox(
+        self, lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+    ) -> list[tuple[int, float, float]]:
+        """Buildings of the bbox as ``(id, lat, lon)``."""
+        if self.use_index:
+            index = await self.get_index()
+            return [
+                (id_, *index.get(id_))
+                for id_ in index.in_rect(lat_min, lon_min, lat_max, lon_max)
+            ]
+        stmt = self.within_bbox(
+            select(models.Building.id, models.Building.lat, models.Building.lon),
+            lat_min, lon_min, lat_max, lon_max,
+        )
+        return list((await self.session.execute(stmt)).tuples())
+
+    def within_bbox(
+        self,
+        stmt: Select,
+        lat_min: float,
+        lon_min: float,
+        lat_max: float,
+        lon_max: float,
+    ) -> Select:
+        """Restrict ``stmt`` joined with buildings to the bbox."""
+        if self.use_geo_key:
+            return _within_geo_key(stmt, lat_min, lon_min, lat_max, lon_max)
+        return _within_rtree(stmt, lat_min, lon_min, lat_max, lon_max)
+
+    async def _sync(
+        self,
+        target: GridIndex | ClusterGrid,
+        tables: tuple[str, ...],
+        stmt: Select,
+    ) -> None:
+        """Apply changes of ``tables`` to a structure keyed by building id.
+
+        ``stmt`` selects the building id followed by the values passed to
+        ``target.upsert``.
+        """
+        changes = await self.change_log.get_changes(target.version, tables)
+        if changes is None:
+            return
+
+        ids = set().union(*(changes.rows[table] for table in tables))
+        if changes.full or len(ids) > IN_CHUNK_SIZE:
+            target.rebuild((await self.session.execute(stmt)).tuples())
+        elif ids:
+            stmt = stmt.where(models.Building.id.in_(ids))
+            rows = {
+                row[0]: row[1:] for row in await self.session.execute(stmt)
+            }
+            for id_ in ids:
+                if (row := rows.get(id_)) is not None:
+                    target.upsert(id_, *row)
+                else:
+                    target.discard(id_)
+        target.version = changes.last_id
+
+
+def _within_rtree(
+    stmt: Select, lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+) -> Select:
+    # R*Tree stores 32-bit floats rounded outwards, so it only prefilters
+    # and the exact bounds are still checked against buildings. The "+ 0"
+    # keeps SQLite from scanning ix_buildings_geo_lat_lon instead of R*Tree.
+    rtree = models.buildings_rtree
+    return (
+        stmt
+        .join(rtree, rtree.c.id == models.Building.id)
+        .where(
+            rtree.c.max_lat >= lat_min,
+            rtree.c.min_lat <= lat_max,
+            rtree.c.max_lon >= lon_min,
+            rtree.c.min_lon <= lon_max,
+        )
+        .where(
+            (models.Building.lat + 0).between(lat_min, lat_max),
+            (models.Building.lon + 0).between(lon_min, lon_max),
+        )
+    )
+
+
+def _within_geo_key(
+    stmt: Select, lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+) -> Select:
+    # Key ranges cover a bit more than the bbox, the exact bounds are
+    # checked on the entries of ix_buildings_geo_key.
+    return stmt.where(
+        or_(*(
+            models.Building.geo_key.between(start, end)
+            for start, end in geo_key_ranges(lat_min, lon_min, lat_max, lon_max)
+        )),
+        (models.Building.lat + 0).between(lat_min, lat_max),
+        (models.Building.lon + 0).between(lon_min, lon_max),
+    )
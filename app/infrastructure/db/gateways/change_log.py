@@ -0,0 +1,47 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Collection
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db import models
+from app.infrastructure.db.gateways.base import BaseGateway
+
+
+@dataclass
+class ChangeSet:
+    last_id: int
+    full: bool = False
+    rows: dict[str, set[int]] = field(default_factory=lambda: defaultdict(set))
+
+
+class ChangeLogGateway(BaseGateway[models.ChangeLog]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(models.ChangeLog, session)
+
+    async def get_changes(
+        self, since: int | None, tables: Collection[str],
+    ) -> ChangeSet | None:
+        """Rows of ``tables`` changed after the ``since`` log entry.
+
+        Returns ``None`` when nothing changed and a ``full`` change set when
+        the caller has never synced or the log was pruned past ``since``.
+        """
+        stmt = select(func.min(models.ChangeLog.id), func.max(models.ChangeLog.id))
+        first_id, last_id = (await self.session.execute(stmt)).one()
+        last_id = last_id or 0
+        if since is None or first_id is not None and first_id > since + 1:
+            return ChangeSet(last_id=last_id, full=True)
+        if last_id <= since:
+            return None
+
+        stmt = (
+            select(models.ChangeLog.table_name, models.ChangeLog.row_id)
+            .where(models.ChangeLog.id > since)
+            .where(models.ChangeLog.table_name.in_(tables))
+        )
+        changes = ChangeSet(last_id=last_id)
+        for table_name, row_id in await self.session.execute(stmt):
+            changes.rows[table_name].add(row_id)
+        return changes
@@ -0,0 +1,75 @@
+from typing import Awaitable, Callable
+
+from app.core.models import dto
+from app.core.utils.geo_cache import CellBuildings, GeoCellCache
+from app.infrastructure.db.gateways.building import BuildingDbGateway
+
+# Loads whole organizations of the buildings, cells are shared by all
+# requests so they never hold a projection.
+OrganizationLoader = Callable[[list[int]], Awaitable[list[dto.Organization]]]
+
+
+class GeoCacheDbGateway:
+    def __init__(self, buildings: BuildingDbGateway, cache: GeoCellCache):
+        self.buildings = buildings
+        self.cache = cache
+
+    async def get_buildings(
+        self,
+        lat_min: float,
+        lon_min: float,
+        lat_max: float,
+        lon_max: float,
+        load: OrganizationLoader,
+    ) -> list[tuple[float, float, list[dto.Organization]]] | None:
+        """Buildings of the cache cells covering the bbox.
+
+        Returns ``None`` when the bbox spans too many cells to be worth
+        caching, always so for a cache of zero size.
+        """
+        cache = self.cache
+        # Counted before listing the cells, a world-wide bbox has millions.
+        if not cache.max_size or cache.cell_count(
+            lat_min, lon_min, lat_max, lon_max,
+        ) > cache.max_size // 4:
+            return None
+
+        cells = cache.cells(lat_min, lon_min, lat_max, lon_max)
+        await self.buildings.sync_cache(cache)
+        version = cache.version
+        found: dict[tuple[int, int], CellBuildings] = {}
+        missing: dict[tuple[int, int], CellBuildings] = {}
+        for cell in cells:
+            if (buildings := cache.get(cell)) is not None:
+                found[cell] = buildings
+            else:
+                missing[cell] = {}
+
+        if missing:
+            bounds = [cache.cell_bounds(cell) for cell in missing]
+            # Widened a little so float rounding at cell edges loses nothing,
+            # points are assigned to cells by cache.cell() anyway.
+            margin = cache.cell_size / 1024
+            owners = {}
+            for id_, lat, lon in await self.buildings.get_points_in_bbox(
+                min(b[0] for b in bounds) - margin,
+                min(b[1] for b in bounds) - margin,
+                max(b[2] for b in bounds) + margin,
+                max(b[3] for b in bounds) + margin,
+            ):
+                if (buildings := missing.get(cache.cell(lat, lon))) is not None:
+                    buildings[id_] = (lat, lon, [])
+                    owners[id_] = buildings
+            for org in await load(list(owners)):
+                owners[org.building_id][org.building_id][2].append(org)
+
+            # A concurrent request may have synced the cache meanwhile, what
+            # was loaded here could then predate the changes it dropped.
+            if cache.version == version:
+                for cell, buildings in missing.items():
+                    cache.put(cell, buildings)
+            found.update(missing)
+
+        return [
+            item for buildings in found.values() for item in buildings.values()
+        ]
@@ -0,0 +1,82 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import dto
+from app.core.utils.geo import tile_bounds, tile_xy
+from app.core.utils.spatial_index import ClusterGrid
+from app.core.utils.tiles import TileCache, encode_tile
+from app.infrastructure.db import models
+from app.infrastructure.db.gateways.base import IN_CHUNK_SIZE
+from app.infrastructure.db.gateways.building import BuildingDbGateway
+
+
+class MapDbGateway:
+    def __init__(
+        self,
+        session: AsyncSession,
+        buildings: BuildingDbGateway,
+        clusters: ClusterGrid,
+        tiles: TileCache,
+    ):
+        self.session = session
+        self.buildings = buildings
+        self.clusters = clusters
+        self.tiles = tiles
+
+    async def get_clusters(
+        self, query: dto.GeoClusterQuery,
+    ) -> list[dto.Cluster]:
+        await self.buildings.sync_clusters(self.clusters)
+        zoom = min(query.zoom, self.clusters.max_zoom)
+        return [
+            dto.Cluster(zoom=zoom, x=x, y=y, count=count, lat=lat, lon=lon)
+            for (x, y), count, lat, lon in self.clusters.clusters(
+                zoom,
+                query.lat_min, query.lon_min, query.lat_max, query.lon_max,
+            )
+        ]
+
+    async def get_tile(self, query: dto.TileQuery) -> bytes:
+        await self.buildings.sync_cache(self.tiles)
+        version = self.tiles.version
+        key = (query.zoom, query.x, query.y)
+        if (tile := self.tiles.get(key)) is not None:
+            return tile
+
+        # Tile bounds are inclusive, points on an edge belong to one tile.
+        points = {
+            id_: (lat, lon)
+            for id_, lat, lon in await self.buildings.get_points_in_bbox(
+                *tile_bounds(*key),
+            )
+            if tile_xy(lat, lon, query.zoom) == (query.x, query.y)
+        }
+
+        building_ids = list(points)
+        rows = []
+        for i in range(0, len(building_ids), IN_CHUNK_SIZE):
+            stmt = (
+                select(
+                    models.Organization.id,
+                    models.Organization.building_id,
+                    func.min(models.OrgActivity.activity_id),
+                )
+                .outerjoin(models.OrgActivity)
+                .where(
+                    models.Organization.building_id.in_(
+                        building_ids[i:i + IN_CHUNK_SIZE],
+                    ),
+                )
+                .group_by(models.Organization.id)
+            )
+            rows.extend(await self.session.execute(stmt))
+
+        tile = encode_tile(*key, (
+            (org_id, activity_id, *points[building_id])
+            for org_id, building_id, activity_id in rows
+        ))
+        # A concurrent request may have synced the cache meanwhile, the tile
+        # could then predate the changes it dropped.
+        if self.tiles.version == version:
+            self.tiles.put(key, tile, building_ids)
+        return tile
@@ -1,21 +1,90 @@
-from sqlalchemy import update, select, func, literal
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import replace
+from functools import cache
+from heapq import nsmallest
+from itertools import dropwhile
+from operator import attrgetter
+from typing import (
+    AsyncIterator, Iterable, Iterator, NamedTuple, Sequence, TypeVar,
+)
+
+from pydantic import TypeAdapter
+from sqlalchemy import Select, update, select, func, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased, selectinload, joinedload
+from sqlalchemy.orm import (
+    InstrumentedAttribute, joinedload, load_only, selectinload,
+)
 
 from app.core.exception.exception import OrganizationAlreadyExists
 from app.core.interfaces.adapters.organization import OrganizationGateway
 from app.core.models import dto
-from app.core.utils.geo import bounding_box, EARTH_RADIUS_KM
-from app.infrastructure.db.gateways.base import BaseGateway
+from app.core.models.enums import GeoOrder
+from app.core.utils.geo import bounding_box, haversine, EARTH_RADIUS_KM
+from app.core.utils.polygon import Polygon
+from app.core.utils.spatial_index import GridIndex
+from app.infrastructure.db.gateways.activity import ActivityDbGateway
+from app.infrastructure.db.gateways.base import BaseGateway, IN_CHUNK_SIZE
+from app.infrastructure.db.gateways.building import BuildingDbGateway
+from app.infrastructure.db.gateways.geo_cache import GeoCacheDbGateway
+from app.infrastructure.db.gateways.map import MapDbGateway
+from app.infrastructure.db.gateways.search import SearchDbGateway
 from app.infrastructure.db import models
 
+# Columns of dto.Organization, list queries select them instead of ORM
+# entities, see _get_rows.
+ORGANIZATION_COLUMNS = (
+    models.Organization.id,
+    models.Organization.name,
+    models.Organization.inn,
+    models.Organization.create_date,
+    models.Organization.building_id,
+    models.Organization.office,
+)
+ORGANIZATION_KEYS = frozenset(column.key for column in ORGANIZATION_COLUMNS)
+# Selected whatever the projection is, results are matched and merged by them.
+KEY_COLUMNS = frozenset(("id", "building_id"))
+# Candidates of faceted lists, only the page of them is loaded whole.
+ID_COLUMNS = (models.Organization.id,)
+OrganizationT = TypeVar("OrganizationT", bound=dto.Organization)
+Columns = Sequence[InstrumentedAttribute]
+T = TypeVar("T")
+
+# Sort keys of organization pages, they apply to dto.Cursor as well.
+_id_key = attrgetter("id")
+_distance_key = attrgetter("distance_km", "id")
+
+# Rows fetched from a server-side cursor at a time when streaming.
+STREAM_CHUNK_SIZE = 1000
+
+
+class _Match(NamedTuple):
+    """Organization of the response cache with its sort key, cheap to
+    build for every match so that only the page is turned into DTOs."""
+    distance_km: float
+    id: int
+    org: dto.Organization
+
 
 class OrganizationDbGateway(
     BaseGateway[models.Organization], OrganizationGateway
 ):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        buildings: BuildingDbGateway,
+        activities: ActivityDbGateway,
+        search_index: SearchDbGateway,
+        maps: MapDbGateway,
+        geo_cache: GeoCacheDbGateway,
+    ):
         super().__init__(models.Organization, session)
+        self.buildings = buildings
+        self.activities = activities
+        self.search_index = search_index
+        self.maps = maps
+        self.geo_cache = geo_cache
 
     async def get_by_id(self, organization_id: int) -> dto.Organization:
         options = [
@@ -37,102 +106,428 @@ class OrganizationDbGateway(
             return org.to_dto()
 
     async def get_all_by_building_id(
-        self, building_id: int,
+        self,
+        building_id: int,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
         stmt = (
-            select(models.Organization)
+            select(*_columns(fields))
             .where(models.Organization.building_id == building_id)
         )
-        res = (await self.session.scalars(stmt)).all()
-        return [org.to_dto() for org in res]
+        return await self._get_rows(_paginate(stmt, page), dto.Organization)
 
     async def get_all_by_building_address(
-        self, query: dto.AddressFilter,
+        self,
+        query: dto.AddressFilter,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
-        stmt = select(models.Organization).join(models.Building)
-        if city := query.city:
-            stmt = stmt.where(models.Building.city.ilike(f'{city}%'))
-        if street := query.street:
-            stmt = stmt.where(models.Building.street.ilike(f'{street}%'))
-        if house := query.house:
-            stmt = stmt.where(models.Building.house == house)
-        if office := query.office:
-            stmt = stmt.where(models.Organization.office == office)
-
-        res = (await self.session.scalars(stmt)).all()
-        return [org.to_dto() for org in res]
+        stmt = _paginate(_address_stmt(query, _columns(fields)), page)
+        return await self._get_rows(stmt, dto.Organization)
+
+    async def get_faceted_by_building_address(
+        self,
+        query: dto.AddressFilter,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.Organization]:
+        return await self._get_faceted_page(
+            [_address_stmt(query, ID_COLUMNS)], page, _columns(fields),
+        )
+
+    async def stream_all_by_building_address(
+        self, query: dto.AddressFilter, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        async for organizations in self._stream_rows(
+            _address_stmt(query, _columns(fields)), dto.Organization,
+        ):
+            yield organizations
 
     async def get_all_by_radius(
-        self, query: dto.GeoRadiusQuery,
-    ) -> list[dto.Organization]:
+        self, query: dto.GeoRadiusQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.OrganizationDistance]:
+        by_distance = _by_distance(query)
+        if (matches := await self._get_cached_by_radius(query)) is not None:
+            if by_distance:
+                matches = _page(
+                    matches, _distance_key, query.after, query.limit,
+                )
+            return [_with_distance(m.org, m.distance_km) for m in matches]
 
-        lat_min, lon_min, lat_max, lon_max = bounding_box(
-            query.center_lat, query.center_lon, query.radius
+        columns = _columns(fields)
+        if self.buildings.use_index:
+            index = await self.buildings.get_index()
+            if by_distance:
+                return await self._get_nearest_from_index(
+                    index, query.center_lat, query.center_lon, columns,
+                    limit=query.limit,
+                    max_distance=query.radius,
+                    after=query.after,
+                )
+            distances = dict(index.in_radius(
+                query.center_lat, query.center_lon, query.radius,
+            ))
+            return [
+                _with_distance(org, distances[org.building_id])
+                for org in await self._get_all_by_building_ids(
+                    list(distances), columns,
+                )
+            ]
+
+        return await self._get_rows(
+            self._radius_stmt(query, columns), dto.OrganizationDistance,
         )
-        dist = _haversine_distance(query)
-        stmt = (
-            select(models.Organization)
-            .join(models.Building)
-            .where(models.Building.lat.between(lat_min, lat_max))
-            .where(models.Building.lon.between(lon_min, lon_max))
-            .where(dist <= query.radius)
+
+    async def get_faceted_by_radius(
+        self, query: dto.GeoRadiusQuery, fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.OrganizationDistance]:
+        if (matches := await self._get_cached_by_radius(query)) is not None:
+            matches = list(matches)
+            facets = await self._get_facets([m.id for m in matches])
+            if _by_distance(query):
+                matches = _page(
+                    matches, _distance_key, query.after, query.limit,
+                )
+            return dto.FacetedOrganizations[dto.OrganizationDistance](
+                items=[_with_distance(m.org, m.distance_km) for m in matches],
+                facets=facets,
+            )
+
+        # Ids and distances of the whole area are enough for the facets and
+        # to pick the page, which is the only part loaded whole.
+        if self.buildings.use_index:
+            index = await self.buildings.get_index()
+            distances = dict(index.in_radius(
+                query.center_lat, query.center_lon, query.radius,
+            ))
+            candidates = [
+                dto.Cursor(id=id_, distance_km=distances[building_id])
+                for stmt in _by_building_ids_stmts(
+                    list(distances),
+                    (models.Organization.id, models.Organization.building_id),
+                )
+                for id_, building_id in await self.session.execute(stmt)
+            ]
+        else:
+            stmt = self._radius_stmt(
+                replace(query, order=None, limit=None, after=None),
+                ID_COLUMNS,
+            )
+            candidates = [
+                dto.Cursor(id=id_, distance_km=distance)
+                for id_, distance in await self.session.execute(stmt)
+            ]
+        facets = await self._get_facets([item.id for item in candidates])
+        if _by_distance(query):
+            candidates = _page(
+                candidates, _distance_key, query.after, query.limit,
+            )
+        distances = {item.id: item.distance_km for item in candidates}
+        return dto.FacetedOrganizations[dto.OrganizationDistance](
+            items=[
+                _with_distance(org, distances[org.id])
+                for org in await self._get_all_by_ids_ordered(
+                    list(distances), _columns(fields),
+                )
+            ],
+            facets=facets,
         )
-        res = (await self.session.scalars(stmt)).all()
-        return [org.to_dto() for org in res]
+
+    async def stream_all_by_radius(
+        self, query: dto.GeoRadiusQuery, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.OrganizationDistance]]:
+        # Areas worth streaming are too wide for the response cache.
+        columns = _columns(fields)
+        if not self.buildings.use_index:
+            chunks = self._stream_rows(
+                self._radius_stmt(query, columns), dto.OrganizationDistance,
+            )
+        else:
+            index = await self.buildings.get_index()
+            if _by_distance(query):
+                chunks = self._stream_nearest_from_index(
+                    index, query.center_lat, query.center_lon, columns,
+                    limit=query.limit,
+                    max_distance=query.radius,
+                    after=query.after,
+                    batch_size=STREAM_CHUNK_SIZE,
+                )
+            else:
+                chunks = self._stream_with_distances(dict(
+                    index.in_radius(
+                        query.center_lat, query.center_lon, query.radius,
+                    ),
+                ), columns)
+        async for organizations in chunks:
+            yield organizations
 
     async def get_all_by_rect(
-        self, query: dto.GeoRectQuery,
+        self,
+        query: dto.GeoRectQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
-        stmt = (
-            select(models.Organization)
-            .join(models.Building)
-            .where(
-                models.Building.lat.between(query.lat_min, query.lat_max),
-                models.Building.lon.between(query.lon_min, query.lon_max),
+        if (items := await self._get_cached_by_rect(query)) is not None:
+            if page is None:
+                return items
+            return _page(items, _id_key, page.after, page.limit)
+
+        columns = _columns(fields)
+        if self.buildings.use_index:
+            index = await self.buildings.get_index()
+            return await self._get_all_by_building_ids(
+                index.in_rect(
+                    query.lat_min, query.lon_min, query.lat_max, query.lon_max,
+                ),
+                columns,
+                page=page,
+            )
+
+        stmt = _paginate(self._rect_stmt(query, columns), page)
+        return await self._get_rows(stmt, dto.Organization)
+
+    async def get_faceted_by_rect(
+        self,
+        query: dto.GeoRectQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> dto.FacetedOrganizations[dto.Organization]:
+        if (items := await self._get_cached_by_rect(query)) is not None:
+            facets = await self._get_facets([org.id for org in items])
+            if page is not None:
+                items = _page(items, _id_key, page.after, page.limit)
+            return dto.FacetedOrganizations[dto.Organization](
+                items=items, facets=facets,
+            )
+
+        if self.buildings.use_index:
+            index = await self.buildings.get_index()
+            stmts = _by_building_ids_stmts(
+                index.in_rect(
+                    query.lat_min, query.lon_min, query.lat_max, query.lon_max,
+                ),
+                ID_COLUMNS,
+            )
+        else:
+            stmts = [self._rect_stmt(query, ID_COLUMNS)]
+        return await self._get_faceted_page(stmts, page, _columns(fields))
+
+    async def stream_all_by_rect(
+        self, query: dto.GeoRectQuery, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        # Areas worth streaming are too wide for the response cache.
+        columns = _columns(fields)
+        if not self.buildings.use_index:
+            chunks = self._stream_rows(
+                self._rect_stmt(query, columns), dto.Organization,
+            )
+        else:
+            index = await self.buildings.get_index()
+            chunks = self._stream_by_building_ids(index.in_rect(
+                query.lat_min, query.lon_min, query.lat_max, query.lon_max,
+            ), columns)
+        async for organizations in chunks:
+            yield organizations
+
+    async def get_all_by_polygon(
+        self,
+        query: dto.GeoPolygonQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        return await self._get_all_by_building_ids(
+            await self._polygon_building_ids(query),
+            _columns(fields),
+            page=page,
+        )
+
+    async def stream_all_by_polygon(
+        self, query: dto.GeoPolygonQuery, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        async for organizations in self._stream_by_building_ids(
+            await self._polygon_building_ids(query), _columns(fields),
+        ):
+            yield organizations
+
+    async def get_all_by_geo_batch(
+        self, queries: list[dto.GeoQuery], fields: dto.Fields | None = None,
+    ) -> dict[int, list[dto.Organization]]:
+        # Every query is matched against the shared grid, kept in sync with
+        # the buildings table whatever geo.index serves the other routes.
+        index = await self.buildings.get_index()
+        matches = [_match_buildings(index, query) for query in queries]
+        orgs = defaultdict(list)
+        for org in await self._get_all_by_building_ids(
+            list(set().union(*matches)), _columns(fields),
+        ):
+            orgs[org.building_id].append(org)
+
+        result = {}
+        for i, (query, distances) in enumerate(zip(queries, matches)):
+            if isinstance(query, dto.GeoRectQuery):
+                result[i] = [
+                    org
+                    for building_id in distances for org in orgs[building_id]
+                ]
+                continue
+            items = [
+                _with_distance(org, distance)
+                for building_id, distance in distances.items()
+                for org in orgs[building_id]
+            ]
+            if query.order == GeoOrder.distance or query.limit:
+                items.sort(key=lambda org: (org.distance_km, org.id))
+            result[i] = items[:query.limit]
+        return result
+
+    async def get_nearest(
+        self, query: dto.GeoNearestQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.OrganizationDistance]:
+        columns = _columns(fields)
+        if not self.buildings.use_index:
+            dist = _haversine_distance(query.center_lat, query.center_lon)
+            stmt = (
+                select(*columns, dist.label("distance_km"))
+                .join(models.Building)
+                .order_by(dist, models.Organization.id)
+                .limit(query.limit)
             )
+            stmt = _after_distance(stmt, dist, query.after)
+            return await self._get_rows(stmt, dto.OrganizationDistance)
+
+        return await self._get_nearest_from_index(
+            await self.buildings.get_index(),
+            query.center_lat, query.center_lon, columns,
+            limit=query.limit,
+            after=query.after,
         )
-        res = (await self.session.scalars(stmt)).all()
-        return [org.to_dto() for org in res]
+
+    async def get_clusters(
+        self, query: dto.GeoClusterQuery,
+    ) -> list[dto.Cluster]:
+        return await self.maps.get_clusters(query)
+
+    async def get_tile(self, query: dto.TileQuery) -> bytes:
+        return await self.maps.get_tile(query)
 
     async def get_all_by_activity_name(
-        self, activity_name: str,
+        self,
+        activity_name: str,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
-        stmt = (
-            select(models.Organization)
-            .join(models.Organization.activities)
-            .where(models.Activity.name.ilike(activity_name))
-        )
-        res = (await self.session.scalars(stmt)).all()
-        return [org.to_dto() for org in res]
+        ids = await self.activities.get_organization_ids_by_name(activity_name)
+        return await self._get_page_by_ids(ids, page, _columns(fields))
+
+    async def stream_all_by_activity_name(
+        self, activity_name: str, fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        ids = await self.activities.get_organization_ids_by_name(activity_name)
+        async for organizations in self._stream_by_ids(ids, _columns(fields)):
+            yield organizations
 
     async def get_all_by_activity_tree(
-        self, activity_name: str, depth: int = 3,
+        self,
+        activity_name: str,
+        depth: int = 3,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
     ) -> list[dto.Organization]:
+        ids = await self.activities.get_organization_ids_by_tree(
+            activity_name, depth,
+        )
+        return await self._get_page_by_ids(ids, page, _columns(fields))
 
-        activity_alias = aliased(models.Activity)
-
-        base = (
-            select(models.Activity.id, literal(1).label("depth"))
-            .where(models.Activity.name.ilike(activity_name))
+    async def stream_all_by_activity_tree(
+        self,
+        activity_name: str,
+        depth: int = 3,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        ids = await self.activities.get_organization_ids_by_tree(
+            activity_name, depth,
         )
-        cte = base.cte(name="activity_tree", recursive=True)
+        async for organizations in self._stream_by_ids(ids, _columns(fields)):
+            yield organizations
+
+    async def get_all_by_activity_filter(
+        self,
+        query: dto.ActivityFilterQuery,
+        page: dto.Page | None = None,
+        fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        ids = await self.activities.get_organization_ids_by_filter(query)
+        return await self._get_page_by_ids(ids, page, _columns(fields))
 
-        recursive = (
-            select(activity_alias.id, (cte.c.depth + 1).label("depth"))
-            .where(activity_alias.parent_id == cte.c.id)
-            .where(cte.c.depth < depth)
+    async def stream_all_by_activity_filter(
+        self,
+        query: dto.ActivityFilterQuery,
+        fields: dto.Fields | None = None,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        ids = await self.activities.get_organization_ids_by_filter(query)
+        async for organizations in self._stream_by_ids(ids, _columns(fields)):
+            yield organizations
+
+    async def search(
+        self, query: dto.TextSearchQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        return await self._get_all_by_ids_ordered(
+            await self.search_index.search(query), _columns(fields),
         )
 
-        cte = cte.union_all(recursive)
-        stmt = (
-            select(models.Organization)
-            .join(models.Organization.activities)
-            .where(models.Activity.id.in_(select(cte.c.id)))
-            .distinct()
+    async def search_fuzzy(
+        self, query: dto.TextSearchQuery, fields: dto.Fields | None = None,
+    ) -> list[dto.Organization]:
+        return await self._get_all_by_ids_ordered(
+            await self.search_index.search_fuzzy(query), _columns(fields),
         )
 
-        res = (await self.session.scalars(stmt)).all()
-        return [org.to_dto() for org in res]
+    async def suggest(self, query: dto.SuggestQuery) -> list[dto.Suggestion]:
+        return await self.search_index.suggest(query)
+
+    async def include_relations(
+        self, query: dto.IncludeQuery,
+    ) -> list[dto.Organization]:
+        """Copies of the organizations with the requested relations loaded.
+
+        Every relation is one IN query per chunk of organizations whatever
+        the number of organizations is.
+        """
+        if not query.include or not query.organizations:
+            return query.organizations
+        # The organizations themselves are loaded already, only the keys
+        # the relations are loaded by are selected.
+        options = [
+            load_only(
+                models.Organization.id, models.Organization.building_id,
+            ),
+            *(
+                selectinload(getattr(models.Organization, relation))
+                for relation in query.include
+            ),
+        ]
+        ids = list({org.id for org in query.organizations})
+        loaded = {}
+        for i in range(0, len(ids), IN_CHUNK_SIZE):
+            stmt = (
+                select(models.Organization)
+                .where(models.Organization.id.in_(ids[i:i + IN_CHUNK_SIZE]))
+                .options(*options)
+                .execution_options(populate_existing=True)
+            )
+            for org in await self.session.scalars(stmt):
+                loaded[org.id] = {
+                    relation: _relation_dto(getattr(org, relation))
+                    for relation in query.include
+                }
+        return [
+            org.model_copy(update=loaded[org.id]) if org.id in loaded else org
+            for org in query.organizations
+        ]
+
+    async def get_activity_counts(self) -> list[dto.ActivityCount]:
+        return await self.activities.get_counts()
 
     async def add_organization(
         self, organization: dto.OrgCreate,
@@ -187,10 +582,427 @@ class OrganizationDbGateway(
             await self.session.delete(org)
         return org is not None
 
+    async def _get_nearest_from_index(
+        self,
+        index: GridIndex,
+        lat: float,
+        lon: float,
+        columns: Columns,
+        limit: int | None = None,
+        max_distance: float | None = None,
+        after: dto.Cursor | None = None,
+    ) -> list[dto.OrganizationDistance]:
+        return [
+            org
+            async for organizations in self._stream_nearest_from_index(
+                index, lat, lon, columns, limit, max_distance, after,
+            )
+            for org in organizations
+        ]
+
+    async def _stream_nearest_from_index(
+        self,
+        index: GridIndex,
+        lat: float,
+        lon: float,
+        columns: Columns,
+        limit: int | None = None,
+        max_distance: float | None = None,
+        after: dto.Cursor | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[list[dto.OrganizationDistance]]:
+        """Organizations closest first, loaded ``batch_size`` buildings at
+        a time or ``limit`` ones when it is not given."""
+        nearest = index.nearest(lat, lon, max_distance=max_distance)
+        if after is not None:
+            # Buildings closer than the cursor were on the previous pages,
+            # organizations of the others are checked by the whole key.
+            nearest = dropwhile(
+                lambda item: item[1] < after.distance_km, nearest,
+            )
+        count = 0
+        # Buildings come closest first, so pulling them in batches stops
+        # as soon as enough organizations are collected.
+        for distances in _batches(nearest, batch_size or limit):
+            orgs = await self._get_all_by_building_ids(
+                list(distances), columns,
+            )
+            organizations = _page(
+                [
+                    _with_distance(org, distances[org.building_id])
+                    for org in orgs
+                ],
+                _distance_key,
+                after,
+                None if limit is None else limit - count,
+            )
+            count += len(organizations)
+            if organizations:
+                yield organizations
+            if limit is not None and count >= limit:
+                break
+
+    async def _get_faceted_page(
+        self, stmts: Iterable[Select], page: dto.Page | None, columns: Columns,
+    ) -> dto.FacetedOrganizations[dto.Organization]:
+        """Facets of all the organizations ``stmts`` select ids of and
+        a keyset page of the organizations."""
+        ids = sorted([
+            id_ for stmt in stmts for id_ in await self.session.scalars(stmt)
+        ])
+        return dto.FacetedOrganizations[dto.Organization](
+            items=await self._get_page_by_ids(ids, page, columns),
+            facets=await self._get_facets(ids),
+        )
+
+    async def _get_facets(self, ids: list[int]) -> dto.Facets:
+        return dto.Facets(activity=await self.activities.get_facets(ids))
+
+    async def _get_cached_by_radius(
+        self, query: dto.GeoRadiusQuery,
+    ) -> Iterator[_Match] | None:
+        """All organizations of the radius from the response cache."""
+        if (buildings := await self._get_cached_buildings(
+            *bounding_box(query.center_lat, query.center_lon, query.radius),
+        )) is None:
+            return None
+        return (
+            _Match(distance, org.id, org)
+            for lat, lon, orgs in buildings
+            if (distance := haversine(
+                query.center_lat, query.center_lon, lat, lon,
+            )) <= query.radius
+            for org in orgs
+        )
+
+    async def _get_cached_by_rect(
+        self, query: dto.GeoRectQuery,
+    ) -> list[dto.Organization] | None:
+        """All organizations of the rect from the response cache."""
+        if (buildings := await self._get_cached_buildings(
+            query.lat_min, query.lon_min, query.lat_max, query.lon_max,
+        )) is None:
+            return None
+        return [
+            org
+            for lat, lon, orgs in buildings
+            if query.lat_min <= lat <= query.lat_max
+            and query.lon_min <= lon <= query.lon_max
+            for org in orgs
+        ]
+
+    async def _get_cached_buildings(
+        self, lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+    ) -> list[tuple[float, float, list[dto.Organization]]] | None:
+        return await self.geo_cache.get_buildings(
+            lat_min, lon_min, lat_max, lon_max,
+            self._get_whole_by_building_ids,
+        )
+
+    async def _get_whole_by_building_ids(
+        self, building_ids: list[int],
+    ) -> list[dto.Organization]:
+        return await self._get_all_by_building_ids(
+            building_ids, ORGANIZATION_COLUMNS,
+        )
+
+    async def _get_page_by_ids(
+        self, ids: list[int], page: dto.Page | None, columns: Columns,
+    ) -> list[dto.Organization]:
+        """Organizations of ascending ids, a keyset page of them if asked."""
+        if page is None:
+            return await self._get_all_by_ids(ids, columns)
+        if page.after is not None:
+            ids = ids[bisect_right(ids, page.after.id):]
+        return await self._get_all_by_ids_ordered(ids[:page.limit], columns)
+
+    async def _get_all_by_ids(
+        self, ids: list[int], columns: Columns,
+    ) -> list[dto.Organization]:
+        result = []
+        for stmt in _by_ids_stmts(ids, columns):
+            result.extend(await self._get_rows(stmt, dto.Organization))
+        return result
+
+    async def _stream_by_ids(
+        self, ids: list[int], columns: Columns,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        for stmt in _by_ids_stmts(ids, columns):
+            async for organizations in self._stream_rows(
+                stmt, dto.Organization,
+            ):
+                yield organizations
+
+    async def _get_all_by_ids_ordered(
+        self, ids: Sequence[int], columns: Columns,
+    ) -> list[dto.Organization]:
+        organizations = {
+            org.id: org
+            for org in await self._get_all_by_ids(list(ids), columns)
+        }
+        return [organizations[id_] for id_ in ids if id_ in organizations]
+
+    async def _get_all_by_building_ids(
+        self,
+        building_ids: list[int],
+        columns: Columns,
+        page: dto.Page | None = None,
+    ) -> list[dto.Organization]:
+        result = []
+        for stmt in _by_building_ids_stmts(building_ids, columns):
+            result.extend(
+                await self._get_rows(_paginate(stmt, page), dto.Organization),
+            )
+        if page is None:
+            return result
+        # Every chunk is a page of its own, the first of them all is taken.
+        return _page(result, _id_key, None, page.limit)
+
+    async def _stream_by_building_ids(
+        self, building_ids: list[int], columns: Columns,
+    ) -> AsyncIterator[list[dto.Organization]]:
+        for stmt in _by_building_ids_stmts(building_ids, columns):
+            async for organizations in self._stream_rows(
+                stmt, dto.Organization,
+            ):
+                yield organizations
+
+    async def _stream_with_distances(
+        self, distances: dict[int, float], columns: Columns,
+    ) -> AsyncIterator[list[dto.OrganizationDistance]]:
+        """Organizations of the buildings with distances to them."""
+        async for organizations in self._stream_by_building_ids(
+            list(distances), columns,
+        ):
+            yield [
+                _with_distance(org, distances[org.building_id])
+                for org in organizations
+            ]
+
+    def _rect_stmt(self, query: dto.GeoRectQuery, columns: Columns) -> Select:
+        return self.buildings.within_bbox(
+            select(*columns).join(models.Building),
+            query.lat_min, query.lon_min, query.lat_max, query.lon_max,
+        )
+
+    def _radius_stmt(
+        self, query: dto.GeoRadiusQuery, columns: Columns,
+    ) -> Select:
+        dist = _haversine_distance(query.center_lat, query.center_lon)
+        stmt = self.buildings.within_bbox(
+            select(*columns, dist.label("distance_km"))
+            .join(models.Building),
+            *bounding_box(query.center_lat, query.center_lon, query.radius),
+        ).where(dist <= query.radius)
+        if _by_distance(query):
+            stmt = _after_distance(
+                stmt.order_by(dist, models.Organization.id), dist, query.after,
+            )
+        if query.limit:
+            stmt = stmt.limit(query.limit)
+        return stmt
+
+    async def _polygon_building_ids(
+        self, query: dto.GeoPolygonQuery,
+    ) -> list[int]:
+        polygon = Polygon(query.points)
+        return polygon.filter(
+            await self.buildings.get_points_in_bbox(*polygon.bbox),
+        )
+
+    async def _get_rows(
+        self, stmt: Select, model: type[OrganizationT],
+    ) -> list[OrganizationT]:
+        """DTOs straight from Core rows of ``ORGANIZATION_COLUMNS``.
+
+        No ORM objects are built and all rows are validated in one call.
+        Rows of a projection lack required fields and are not validated,
+        the columns are typed already.
+        """
+        result = await self.session.execute(stmt)
+        return _to_dtos(list(result.keys()), result, model)
+
+    async def _stream_rows(
+        self, stmt: Select, model: type[OrganizationT],
+    ) -> AsyncIterator[list[OrganizationT]]:
+        """``_get_rows`` from a server-side cursor, so only
+        ``STREAM_CHUNK_SIZE`` rows are held at a time."""
+        result = await self.session.stream(stmt)
+        keys = list(result.keys())
+        async for rows in result.partitions(STREAM_CHUNK_SIZE):
+            yield _to_dtos(keys, rows, model)
+
+
+def _to_dtos(
+    keys: list[str], rows: Iterable[Sequence], model: type[OrganizationT],
+) -> list[OrganizationT]:
+    if not ORGANIZATION_KEYS.issubset(keys):
+        return [model.model_construct(**dict(zip(keys, row))) for row in rows]
+    # Plain dicts, validating RowMapping goes through its slow .get().
+    return _list_adapter(model).validate_python(
+        [dict(zip(keys, row)) for row in rows],
+    )
+
+
+def _columns(fields: dto.Fields | None) -> Columns:
+    """``ORGANIZATION_COLUMNS`` narrowed to the requested fields."""
+    if fields is None:
+        return ORGANIZATION_COLUMNS
+    return [
+        column
+        for column in ORGANIZATION_COLUMNS
+        if column.key in fields or column.key in KEY_COLUMNS
+    ]
+
+
+def _by_ids_stmts(ids: list[int], columns: Columns) -> Iterator[Select]:
+    for i in range(0, len(ids), IN_CHUNK_SIZE):
+        yield (
+            select(*columns)
+            .where(models.Organization.id.in_(ids[i:i + IN_CHUNK_SIZE]))
+        )
+
+
+def _by_building_ids_stmts(
+    building_ids: list[int], columns: Columns,
+) -> Iterator[Select]:
+    for i in range(0, len(building_ids), IN_CHUNK_SIZE):
+        yield (
+            select(*columns)
+            .where(
+                models.Organization.building_id.in_(
+                    building_ids[i:i + IN_CHUNK_SIZE],
+                ),
+            )
+        )
+
+
+def _address_stmt(query: dto.AddressFilter, columns: Columns) -> Select:
+    stmt = select(*columns).join(models.Building)
+    if city := models.address_key(query.city):
+        stmt = stmt.where(*_starts_with(models.Building.city_key, city))
+    if street := models.address_key(query.street):
+        stmt = stmt.where(*_starts_with(models.Building.street_key, street))
+    if house := query.house:
+        stmt = stmt.where(models.Building.house == house)
+    if office := query.office:
+        stmt = stmt.where(models.Organization.office == office)
+    return stmt
+
+
+def _by_distance(query: dto.GeoRadiusQuery) -> bool:
+    return bool(
+        query.order == GeoOrder.distance
+        or query.limit
+        or query.after is not None
+    )
+
+
+def _paginate(stmt: Select, page: dto.Page | None) -> Select:
+    """Keyset page of the statement sorted by organization id."""
+    if page is None:
+        return stmt
+    if page.after is not None:
+        stmt = stmt.where(models.Organization.id > page.after.id)
+    return stmt.order_by(models.Organization.id).limit(page.limit)
+
+
+def _after_distance(
+    stmt: Select, dist, after: dto.Cursor | None,
+) -> Select:
+    if after is None:
+        return stmt
+    return stmt.where(
+        tuple_(dist, models.Organization.id)
+        > tuple_(after.distance_km, after.id),
+    )
+
+
+def _page(
+    items: Iterable[T],
+    key: attrgetter,
+    after: dto.Cursor | None,
+    limit: int | None = None,
+) -> list[T]:
+    """Keyset page of the items sorted by ``key``.
+
+    A limited page keeps only ``limit`` items while scanning instead of
+    sorting them all.
+    """
+    if after is not None:
+        after_key = key(after)
+        items = (item for item in items if key(item) > after_key)
+    if limit is None:
+        return sorted(items, key=key)
+    return nsmallest(limit, items, key=key)
+
+
+def _batches(
+    nearest: Iterable[tuple[int, float]], size: int | None,
+) -> Iterator[dict[int, float]]:
+    """Distances of ``size`` buildings at a time, closest first.
+
+    Buildings as far as the last one of a batch join it, so organizations
+    at equal distance are always sorted by id together.
+    """
+    batch, last = {}, None
+    for building_id, distance in nearest:
+        if size is not None and len(batch) >= size and distance != last:
+            yield batch
+            batch = {}
+        batch[building_id] = last = distance
+    if batch:
+        yield batch
+
+
+def _with_distance(
+    org: dto.Organization, distance_km: float,
+) -> dto.OrganizationDistance:
+    if not ORGANIZATION_KEYS.issubset(org.__dict__):
+        # A projection, see _get_rows.
+        return dto.OrganizationDistance.model_construct(
+            **org.__dict__, distance_km=distance_km,
+        )
+    return dto.OrganizationDistance(**org.__dict__, distance_km=distance_km)
+
+
+def _relation_dto(value):
+    if isinstance(value, list):
+        return [item.to_dto() for item in value]
+    return None if value is None else value.to_dto()
+
+
+@cache
+def _list_adapter(
+    model: type[OrganizationT],
+) -> TypeAdapter[list[OrganizationT]]:
+    return TypeAdapter(list[model])
+
+
+def _starts_with(column: InstrumentedAttribute, prefix: str) -> tuple:
+    # A range instead of LIKE, which SQLite can not serve from an index.
+    return column >= prefix, column < prefix + "\U0010ffff"
+
+
+def _bbox(query: dto.GeoQuery) -> tuple[float, float, float, float]:
+    if isinstance(query, dto.GeoRectQuery):
+        return query.lat_min, query.lon_min, query.lat_max, query.lon_max
+    return bounding_box(query.center_lat, query.center_lon, query.radius)
+
+
+def _match_buildings(
+    index: GridIndex, query: dto.GeoQuery,
+) -> dict[int, float | None]:
+    if isinstance(query, dto.GeoRectQuery):
+        return dict.fromkeys(index.in_rect(*_bbox(query)))
+    return dict(
+        index.in_radius(query.center_lat, query.center_lon, query.radius),
+    )
+
 
-def _haversine_distance(query: dto.GeoRadiusQuery):
-    lat1 = func.radians(query.center_lat)
-    lon1 = func.radians(query.center_lon)
+def _haversine_distance(lat: float, lon: float):
+    lat1 = func.radians(lat)
+    lon1 = func.radians(lon)
     lat2 = func.radians(models.Building.lat)
     lon2 = func.radians(models.Building.lon)
 
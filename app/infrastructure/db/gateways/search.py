@@ -0,0 +1,106 @@
+import re
+
+from sqlalchemy import select, func, literal_column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.models import dto
+from app.core.models.enums import SuggestType
+from app.core.utils.suggest import PrefixIndex, SuggestIndex
+from app.core.utils.trigram_index import TrigramIndex
+from app.infrastructure.db import models
+from app.infrastructure.db.gateways.base import IN_CHUNK_SIZE
+from app.infrastructure.db.gateways.change_log import ChangeLogGateway
+
+# bm25 weights of the name, activities and address columns of the index.
+FTS_WEIGHTS = (10.0, 2.0, 1.0)
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class SearchDbGateway:
+    def __init__(
+        self,
+        session: AsyncSession,
+        trigram_index: TrigramIndex,
+        suggest_index: SuggestIndex,
+    ):
+        self.session = session
+        self.change_log = ChangeLogGateway(session)
+        self.trigram_index = trigram_index
+        self.suggest_index = suggest_index
+
+    async def search(self, query: dto.TextSearchQuery) -> list[int]:
+        """Ids of the organizations matching the text, best first."""
+        # Every word is a quoted prefix term, so FTS5 query syntax in the
+        # text is matched literally.
+        words = _WORD_PATTERN.findall(query.text)
+        if not words:
+            return []
+        fts = models.organizations_fts
+        stmt = (
+            select(fts.c.rowid)
+            .where(text("organizations_fts MATCH :match"))
+            .order_by(
+                func.bm25(literal_column("organizations_fts"), *FTS_WEIGHTS),
+                fts.c.rowid,
+            )
+            .limit(query.limit)
+        )
+        return list((await self.session.scalars(
+            stmt, {"match": " ".join(f'"{word}"*' for word in words)},
+        )).all())
+
+    async def search_fuzzy(self, query: dto.TextSearchQuery) -> list[int]:
+        """Ids of the organizations with similar names, best first."""
+        await self._sync(self.trigram_index, models.Organization.name)
+        return [
+            id_
+            for id_, _ in self.trigram_index.search(query.text, query.limit)
+        ]
+
+    async def suggest(self, query: dto.SuggestQuery) -> list[dto.Suggestion]:
+        sources = {
+            SuggestType.organization: (
+                self.suggest_index.organizations, models.Organization.name,
+            ),
+            SuggestType.activity: (
+                self.suggest_index.activities, models.Activity.name,
+            ),
+            SuggestType.street: (
+                self.suggest_index.streets, models.Building.street,
+            ),
+        }
+        suggestions = []
+        for type_ in query.types:
+            index, column = sources[type_]
+            await self._sync(index, column)
+            suggestions.extend(
+                dto.Suggestion(type=type_, text=name)
+                for name in index.search(query.prefix, query.limit)
+            )
+        return suggestions
+
+    async def _sync(
+        self, index: TrigramIndex | PrefixIndex, column: InstrumentedAttribute,
+    ) -> None:
+        """Sync the index with ``(id, name)`` rows of the column's table."""
+        model = column.class_
+        changes = await self.change_log.get_changes(
+            index.version, (model.__tablename__,),
+        )
+        if changes is None:
+            return
+
+        stmt = select(model.id, column)
+        ids = changes.rows[model.__tablename__]
+        if changes.full or len(ids) > IN_CHUNK_SIZE:
+            index.rebuild((await self.session.execute(stmt)).tuples())
+        elif ids:
+            stmt = stmt.where(model.id.in_(ids))
+            names = dict((await self.session.execute(stmt)).tuples().all())
+            for id_ in ids:
+                if id_ in names:
+                    index.upsert(id_, names[id_])
+                else:
+                    index.discard(id_)
+        index.version = changes.last_id
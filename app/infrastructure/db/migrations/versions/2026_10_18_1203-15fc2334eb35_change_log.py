@@ -0,0 +1,55 @@
+"""change_log
+
+Revision ID: 15fc2334eb35
+Revises: 8a96398b57ef
+Create Date: 2026-10-18 12:03:41.220962
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '15fc2334eb35'
+down_revision: Union[str, None] = '8a96398b57ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOGGED_TABLES = ('buildings',)
+LOG_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.create_table('change_log',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk__change_log'))
+    )
+    op.execute(f"""
+        CREATE TRIGGER change_log_prune AFTER INSERT ON change_log
+        WHEN NEW.id % 1000 = 0
+        BEGIN
+            DELETE FROM change_log WHERE id <= NEW.id - {LOG_SIZE};
+        END
+    """)
+    for table in LOGGED_TABLES:
+        for event, row in (('insert', 'NEW'), ('update', 'NEW'), ('delete', 'OLD')):
+            op.execute(f"""
+                CREATE TRIGGER {table}_change_log_{event}
+                AFTER {event.upper()} ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, row_id)
+                    VALUES ('{table}', {row}.id);
+                END
+            """)
+
+
+def downgrade() -> None:
+    for table in LOGGED_TABLES:
+        for event in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_change_log_{event}")
+    op.execute("DROP TRIGGER IF EXISTS change_log_prune")
+    op.drop_table('change_log')
@@ -0,0 +1,59 @@
+"""buildings_rtree
+
+Revision ID: 692c03998932
+Revises: 15fc2334eb35
+Create Date: 2026-10-18 12:03:33.662502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '692c03998932'
+down_revision: Union[str, None] = '15fc2334eb35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE VIRTUAL TABLE buildings_rtree USING rtree(
+            id, min_lat, max_lat, min_lon, max_lon
+        )
+    """)
+    op.execute("""
+        INSERT INTO buildings_rtree (id, min_lat, max_lat, min_lon, max_lon)
+        SELECT id, lat, lat, lon, lon FROM buildings
+    """)
+    op.execute("""
+        CREATE TRIGGER buildings_rtree_insert AFTER INSERT ON buildings
+        BEGIN
+            INSERT INTO buildings_rtree (id, min_lat, max_lat, min_lon, max_lon)
+            VALUES (NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER buildings_rtree_update AFTER UPDATE OF lat, lon ON buildings
+        BEGIN
+            UPDATE buildings_rtree
+            SET min_lat = NEW.lat, max_lat = NEW.lat,
+                min_lon = NEW.lon, max_lon = NEW.lon
+            WHERE id = NEW.id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER buildings_rtree_delete AFTER DELETE ON buildings
+        BEGIN
+            DELETE FROM buildings_rtree WHERE id = OLD.id;
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS buildings_rtree_delete")
+    op.execute("DROP TRIGGER IF EXISTS buildings_rtree_update")
+    op.execute("DROP TRIGGER IF EXISTS buildings_rtree_insert")
+    op.execute("DROP TABLE IF EXISTS buildings_rtree")
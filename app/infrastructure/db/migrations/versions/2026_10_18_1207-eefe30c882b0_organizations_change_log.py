@@ -0,0 +1,50 @@
+"""organizations_change_log
+
+Revision ID: eefe30c882b0
+Revises: 692c03998932
+Create Date: 2026-10-18 12:07:35.106657
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eefe30c882b0'
+down_revision: Union[str, None] = '692c03998932'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Besides the organization itself every change is logged against the
+# buildings it leaves or enters, for per-building aggregates.
+TRIGGERS = {
+    'insert': ('NEW', ('NEW',)),
+    'update': ('NEW', ('OLD', 'NEW')),
+    'delete': ('OLD', ('OLD',)),
+}
+
+
+def upgrade() -> None:
+    for event, (row, building_rows) in TRIGGERS.items():
+        buildings = "".join(
+            f"""
+                INSERT INTO change_log (table_name, row_id)
+                SELECT 'building_organizations', {b}.building_id
+                WHERE {b}.building_id IS NOT NULL;"""
+            for b in building_rows
+        )
+        op.execute(f"""
+            CREATE TRIGGER organizations_change_log_{event}
+            AFTER {event.upper()} ON organizations
+            BEGIN
+                INSERT INTO change_log (table_name, row_id)
+                VALUES ('organizations', {row}.id);{buildings}
+            END
+        """)
+
+
+def downgrade() -> None:
+    for event in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS organizations_change_log_{event}")
@@ -0,0 +1,41 @@
+"""org_activity_change_log
+
+Revision ID: 7d475f83ff02
+Revises: eefe30c882b0
+Create Date: 2026-10-18 12:09:10.690329
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d475f83ff02'
+down_revision: Union[str, None] = 'eefe30c882b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # org_activity has no id of its own, changes are logged against the
+    # organization and against its building for per-building aggregates.
+    for event, row in (('insert', 'NEW'), ('delete', 'OLD')):
+        op.execute(f"""
+            CREATE TRIGGER org_activity_change_log_{event}
+            AFTER {event.upper()} ON org_activity
+            BEGIN
+                INSERT INTO change_log (table_name, row_id)
+                VALUES ('org_activity', {row}.organization_id);
+                INSERT INTO change_log (table_name, row_id)
+                SELECT 'building_organizations', building_id
+                FROM organizations
+                WHERE id = {row}.organization_id AND building_id IS NOT NULL;
+            END
+        """)
+
+
+def downgrade() -> None:
+    for event in ('insert', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS org_activity_change_log_{event}")
@@ -0,0 +1,77 @@
+"""buildings_geo_key
+
+Revision ID: 58cf1d659794
+Revises: 7d475f83ff02
+Create Date: 2026-10-18 12:11:43.609023
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '58cf1d659794'
+down_revision: Union[str, None] = '7d475f83ff02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GEO_KEY_BITS = 24
+SPREAD_STEPS = (
+    (16, "0x0000FFFF0000FFFF"),
+    (8, "0x00FF00FF00FF00FF"),
+    (4, "0x0F0F0F0F0F0F0F0F"),
+    (2, "0x3333333333333333"),
+    (1, "0x5555555555555555"),
+)
+
+
+def geo_key_sql(lat: str, lon: str) -> str:
+    """SQL twin of ``app.core.utils.geo.geo_key``."""
+    side = 1 << GEO_KEY_BITS
+    sql = (
+        f"SELECT "
+        f"min(max(CAST(({lon} + 180.0) / 360.0 * {side} AS INTEGER), 0), "
+        f"{side - 1}) AS x, "
+        f"min(max(CAST(({lat} + 90.0) / 180.0 * {side} AS INTEGER), 0), "
+        f"{side - 1}) AS y"
+    )
+    for shift, mask in SPREAD_STEPS:
+        sql = (
+            f"SELECT (x | (x << {shift})) & {mask} AS x, "
+            f"(y | (y << {shift})) & {mask} AS y FROM ({sql})"
+        )
+    return f"(SELECT (x << 1) | y FROM ({sql}))"
+
+
+def upgrade() -> None:
+    op.add_column('buildings', sa.Column('geo_key', sa.BigInteger(), nullable=True))
+    op.execute(f"UPDATE buildings SET geo_key = {geo_key_sql('lat', 'lon')}")
+    op.create_index(
+        'ix_buildings_geo_key', 'buildings', ['geo_key', 'lat', 'lon'],
+    )
+    op.execute(f"""
+        CREATE TRIGGER buildings_geo_key_insert AFTER INSERT ON buildings
+        BEGIN
+            UPDATE buildings
+            SET geo_key = {geo_key_sql('NEW.lat', 'NEW.lon')}
+            WHERE id = NEW.id;
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER buildings_geo_key_update AFTER UPDATE OF lat, lon ON buildings
+        BEGIN
+            UPDATE buildings
+            SET geo_key = {geo_key_sql('NEW.lat', 'NEW.lon')}
+            WHERE id = NEW.id;
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS buildings_geo_key_update")
+    op.execute("DROP TRIGGER IF EXISTS buildings_geo_key_insert")
+    op.drop_index('ix_buildings_geo_key', table_name='buildings')
+    op.drop_column('buildings', 'geo_key')
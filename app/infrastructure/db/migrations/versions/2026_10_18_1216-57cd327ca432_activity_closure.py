@@ -0,0 +1,122 @@
+"""activity_closure
+
+Revision ID: 57cd327ca432
+Revises: 58cf1d659794
+Create Date: 2026-10-18 12:16:07.818324
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '57cd327ca432'
+down_revision: Union[str, None] = '58cf1d659794'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('activity_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['activities.id'], name=op.f('fk__activity_closure__ancestor_id__activities'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['activities.id'], name=op.f('fk__activity_closure__descendant_id__activities'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id', name=op.f('pk__activity_closure'))
+    )
+    op.create_index('ix_activity_closure_ancestor_depth', 'activity_closure', ['ancestor_id', 'depth', 'descendant_id'], unique=False)
+    op.create_index('ix_activity_closure_descendant_id', 'activity_closure', ['descendant_id'], unique=False)
+    op.create_index('ix_org_activity_activity_id', 'org_activity', ['activity_id', 'organization_id'], unique=False)
+
+    op.execute("""
+        INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM activities
+            UNION ALL
+            SELECT tree.ancestor_id, activities.id, tree.depth + 1
+            FROM tree JOIN activities ON activities.parent_id = tree.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree
+    """)
+    op.execute("""
+        CREATE TRIGGER activity_closure_insert AFTER INSERT ON activities
+        BEGIN
+            INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+            VALUES (NEW.id, NEW.id, 0);
+            INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, NEW.id, depth + 1
+            FROM activity_closure
+            WHERE descendant_id = NEW.parent_id;
+            -- Without enforced foreign keys children of a deleted activity
+            -- keep its id and are adopted when the id is reused.
+            INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+            SELECT up.ancestor_id, down.descendant_id, up.depth + down.depth + 1
+            FROM activities AS child
+            JOIN activity_closure AS up ON up.descendant_id = NEW.id
+            JOIN activity_closure AS down ON down.ancestor_id = child.id
+            WHERE child.parent_id = NEW.id AND child.id != NEW.id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER activity_closure_no_cycle
+        BEFORE UPDATE OF parent_id ON activities
+        WHEN EXISTS (
+            SELECT 1 FROM activity_closure
+            WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+        )
+        BEGIN
+            SELECT RAISE(ABORT, 'activity can not be moved under itself');
+        END
+    """)
+    # The subtree of the moved activity is detached from its old ancestors
+    # and attached under every ancestor of the new parent.
+    op.execute("""
+        CREATE TRIGGER activity_closure_update
+        AFTER UPDATE OF parent_id ON activities
+        WHEN OLD.parent_id IS NOT NEW.parent_id
+        BEGIN
+            DELETE FROM activity_closure
+            WHERE descendant_id IN (
+                SELECT descendant_id FROM activity_closure
+                WHERE ancestor_id = NEW.id
+            )
+            AND ancestor_id NOT IN (
+                SELECT descendant_id FROM activity_closure
+                WHERE ancestor_id = NEW.id
+            );
+            INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+            SELECT up.ancestor_id, down.descendant_id, up.depth + down.depth + 1
+            FROM activity_closure AS up, activity_closure AS down
+            WHERE up.descendant_id = NEW.parent_id AND down.ancestor_id = NEW.id;
+        END
+    """)
+    # Children keep their subtrees and become roots, as ON DELETE SET NULL
+    # does for activities.parent_id when foreign keys are enforced.
+    op.execute("""
+        CREATE TRIGGER activity_closure_delete AFTER DELETE ON activities
+        BEGIN
+            DELETE FROM activity_closure
+            WHERE descendant_id IN (
+                SELECT descendant_id FROM activity_closure
+                WHERE ancestor_id = OLD.id
+            )
+            AND ancestor_id NOT IN (
+                SELECT descendant_id FROM activity_closure
+                WHERE ancestor_id = OLD.id AND descendant_id != OLD.id
+            );
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS activity_closure_delete")
+    op.execute("DROP TRIGGER IF EXISTS activity_closure_update")
+    op.execute("DROP TRIGGER IF EXISTS activity_closure_no_cycle")
+    op.execute("DROP TRIGGER IF EXISTS activity_closure_insert")
+    op.drop_index('ix_org_activity_activity_id', table_name='org_activity')
+    op.drop_index('ix_activity_closure_descendant_id', table_name='activity_closure')
+    op.drop_index('ix_activity_closure_ancestor_depth', table_name='activity_closure')
+    op.drop_table('activity_closure')
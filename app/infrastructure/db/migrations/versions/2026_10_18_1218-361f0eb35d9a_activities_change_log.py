@@ -0,0 +1,35 @@
+"""activities_change_log
+
+Revision ID: 361f0eb35d9a
+Revises: 57cd327ca432
+Create Date: 2026-10-18 12:18:00.888629
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '361f0eb35d9a'
+down_revision: Union[str, None] = '57cd327ca432'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for event, row in (('insert', 'NEW'), ('update', 'NEW'), ('delete', 'OLD')):
+        op.execute(f"""
+            CREATE TRIGGER activities_change_log_{event}
+            AFTER {event.upper()} ON activities
+            BEGIN
+                INSERT INTO change_log (table_name, row_id)
+                VALUES ('activities', {row}.id);
+            END
+        """)
+
+
+def downgrade() -> None:
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS activities_change_log_{event}")
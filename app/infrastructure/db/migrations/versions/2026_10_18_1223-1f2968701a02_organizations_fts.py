@@ -0,0 +1,116 @@
+"""organizations_fts
+
+Revision ID: 1f2968701a02
+Revises: 361f0eb35d9a
+Create Date: 2026-10-18 12:23:20.301959
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f2968701a02'
+down_revision: Union[str, None] = '361f0eb35d9a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def fold(expr: str) -> str:
+    # unicode61 folds case but keeps "ё" apart from "е".
+    return f"replace(replace({expr}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def refresh(where: str) -> str:
+    """Statements rewriting the index rows of organizations matching ``where``."""
+    activities = (
+        "coalesce((SELECT group_concat(activities.name, ' ') "
+        "FROM org_activity "
+        "JOIN activities ON activities.id = org_activity.activity_id "
+        "WHERE org_activity.organization_id = organizations.id), '')"
+    )
+    address = (
+        "coalesce(buildings.city || ' ' || buildings.street || ' ' "
+        "|| buildings.house, '')"
+    )
+    return f"""
+        DELETE FROM organizations_fts WHERE rowid IN (
+            SELECT organizations.id FROM organizations WHERE {where}
+        );
+        INSERT INTO organizations_fts (rowid, name, activities, address)
+        SELECT
+            organizations.id,
+            {fold('organizations.name')},
+            {fold(activities)},
+            {fold(address)}
+        FROM organizations
+        LEFT JOIN buildings ON buildings.id = organizations.building_id
+        WHERE {where};
+    """
+
+
+TRIGGERS = {
+    'organizations_fts_insert': (
+        'AFTER INSERT ON organizations',
+        refresh('organizations.id = NEW.id'),
+    ),
+    'organizations_fts_update': (
+        'AFTER UPDATE OF name, building_id ON organizations',
+        refresh('organizations.id = NEW.id'),
+    ),
+    'organizations_fts_delete': (
+        'AFTER DELETE ON organizations',
+        'DELETE FROM organizations_fts WHERE rowid = OLD.id;',
+    ),
+    'org_activity_fts_insert': (
+        'AFTER INSERT ON org_activity',
+        refresh('organizations.id = NEW.organization_id'),
+    ),
+    'org_activity_fts_delete': (
+        'AFTER DELETE ON org_activity',
+        refresh('organizations.id = OLD.organization_id'),
+    ),
+    'activities_fts_update': (
+        'AFTER UPDATE OF name ON activities',
+        refresh(
+            'organizations.id IN (SELECT organization_id FROM org_activity '
+            'WHERE activity_id = NEW.id)'
+        ),
+    ),
+    'activities_fts_delete': (
+        'AFTER DELETE ON activities',
+        refresh(
+            'organizations.id IN (SELECT organization_id FROM org_activity '
+            'WHERE activity_id = OLD.id)'
+        ),
+    ),
+    'buildings_fts_update': (
+        'AFTER UPDATE OF city, street, house ON buildings',
+        refresh('organizations.building_id = NEW.id'),
+    ),
+    'buildings_fts_delete': (
+        'AFTER DELETE ON buildings',
+        refresh('organizations.building_id = OLD.id'),
+    ),
+}
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE VIRTUAL TABLE organizations_fts USING fts5(
+            name, activities, address,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    for statement in refresh('1').split(';')[:-1]:
+        op.execute(statement)
+    for name, (event, body) in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {event} BEGIN {body} END")
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS organizations_fts")
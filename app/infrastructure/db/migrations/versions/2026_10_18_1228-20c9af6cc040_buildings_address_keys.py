@@ -0,0 +1,54 @@
+"""buildings_address_keys
+
+Revision ID: 20c9af6cc040
+Revises: 1f2968701a02
+Create Date: 2026-10-18 12:28:21.924689
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.utils.str_cleaner import AddressCleaner
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20c9af6cc040'
+down_revision: Union[str, None] = '1f2968701a02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('buildings', sa.Column('city_key', sa.String(100), nullable=True))
+    op.add_column('buildings', sa.Column('street_key', sa.String(150), nullable=True))
+
+    # Folding is done in Python, SQLite lower() only knows ASCII letters.
+    cleaner = AddressCleaner()
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, city, street FROM buildings"))
+    keys = [
+        {"id": id_, "city_key": cleaner.fold(city), "street_key": cleaner.fold(street)}
+        for id_, city, street in rows
+    ]
+    if keys:
+        connection.execute(
+            sa.text(
+                "UPDATE buildings SET city_key = :city_key, street_key = :street_key "
+                "WHERE id = :id"
+            ),
+            keys,
+        )
+
+    op.create_index(
+        'ix_buildings_city_key_street_key', 'buildings', ['city_key', 'street_key'],
+    )
+    op.create_index('ix_buildings_street_key', 'buildings', ['street_key'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_buildings_street_key', table_name='buildings')
+    op.drop_index('ix_buildings_city_key_street_key', table_name='buildings')
+    op.drop_column('buildings', 'street_key')
+    op.drop_column('buildings', 'city_key')
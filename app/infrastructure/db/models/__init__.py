@@ -1,16 +1,26 @@
 from .base import Base
 from .phone import PhoneNumber
-from .building import Building
+from .building import Building, address_key
+from .building_rtree import buildings_rtree
 from .activity import Activity
+from .activity_closure import ActivityClosure
 from .organization import Organization
+from .organization_fts import organizations_fts
 
 from .org_activity import OrgActivity
+from .change_log import ChangeLog, BUILDING_ORGANIZATIONS
 
 __all__ = [
     'Base',
     'PhoneNumber',
     'Building',
+    'address_key',
+    'buildings_rtree',
     'Activity',
+    'ActivityClosure',
     'Organization',
+    'organizations_fts',
     'OrgActivity',
+    'ChangeLog',
+    'BUILDING_ORGANIZATIONS',
 ]
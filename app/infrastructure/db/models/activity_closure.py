@@ -0,0 +1,29 @@
+from sqlalchemy import ForeignKey, Index, PrimaryKeyConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ActivityClosure(Base):
+    """Every ancestor/descendant pair of activities, itself included.
+
+    Maintained by triggers on ``activities``, ``depth`` is 0 for the
+    activity itself and 1 for its direct children.
+    """
+    __tablename__ = 'activity_closure'
+    __table_args__ = (
+        PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+        Index(
+            "ix_activity_closure_ancestor_depth",
+            "ancestor_id", "depth", "descendant_id",
+        ),
+        Index("ix_activity_closure_descendant_id", "descendant_id"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("activities.id", ondelete="CASCADE"),
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("activities.id", ondelete="CASCADE"),
+    )
+    depth: Mapped[int]
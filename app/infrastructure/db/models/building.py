@@ -1,13 +1,25 @@
 from __future__ import annotations
 
-from sqlalchemy import Index, UniqueConstraint
+from sqlalchemy import BigInteger, Index, UniqueConstraint
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.models import dto
+from app.core.utils.str_cleaner import AddressCleaner
 from .base import Base, str_10, str_50, str_100, str_150, UTC_datetime
 from .organization import Organization
 
+_address_cleaner = AddressCleaner()
+
+
+def address_key(value: str | None) -> str | None:
+    """Folded city or street as stored in ``city_key``/``street_key``.
+
+    Writers of buildings set both keys with it, the folding has no SQLite
+    equivalent.
+    """
+    return _address_cleaner.fold(value)
+
 
 class Building(Base):
     __tablename__ = 'buildings'
@@ -16,6 +28,9 @@ class Building(Base):
         UniqueConstraint('city', 'street', 'house'),
         Index("ix_buildings_geo_lat_lon", "lat", "lon"),
         Index("ix_buildings_city_postal", "city", "postal_code"),
+        Index("ix_buildings_geo_key", "geo_key", "lat", "lon"),
+        Index("ix_buildings_city_key_street_key", "city_key", "street_key"),
+        Index("ix_buildings_street_key", "street_key"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -25,11 +40,16 @@ class Building(Base):
     city: Mapped[str_100]
     street: Mapped[str_150]
     house: Mapped[str_10]
+    # Case-insensitive lookup forms of city and street, see address_key.
+    city_key: Mapped[str_100 | None] = mapped_column(default=None)
+    street_key: Mapped[str_150 | None] = mapped_column(default=None)
     postal_code: Mapped[str_10 | None] = mapped_column(default=None)
     block: Mapped[str_10 | None] = mapped_column(default=None)
 
     lat: Mapped[float]
     lon: Mapped[float]
+    # Maintained by triggers, see app.core.utils.geo.geo_key.
+    geo_key: Mapped[int | None] = mapped_column(BigInteger, default=None)
     name: Mapped[str_50 | None] = mapped_column(default=None)
     create_date: Mapped[UTC_datetime]
 
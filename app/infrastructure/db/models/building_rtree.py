@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Float, Integer, MetaData, Table
+
+# SQLite R*Tree virtual table kept in sync with buildings by triggers,
+# see the buildings_rtree migration. It lives outside Base.metadata so
+# autogenerate and create_all never treat it as a regular table.
+buildings_rtree = Table(
+    'buildings_rtree',
+    MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('min_lat', Float),
+    Column('max_lat', Float),
+    Column('min_lon', Float),
+    Column('max_lon', Float),
+)
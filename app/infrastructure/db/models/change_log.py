@@ -0,0 +1,15 @@
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, str_50
+
+# Logged by organization triggers against the old and new building_id,
+# lets per-building aggregates refresh without tracking organizations.
+BUILDING_ORGANIZATIONS = 'building_organizations'
+
+
+class ChangeLog(Base):
+    __tablename__ = 'change_log'
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    table_name: Mapped[str_50]
+    row_id: Mapped[int]
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, PrimaryKeyConstraint
+from sqlalchemy import ForeignKey, Index, PrimaryKeyConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -9,6 +9,9 @@ class OrgActivity(Base):
     __mapper_args__ = {"eager_defaults": True}
     __table_args__ = (
         PrimaryKeyConstraint("organization_id", "activity_id"),
+        Index(
+            "ix_org_activity_activity_id", "activity_id", "organization_id",
+        ),
     )
 
     organization_id: Mapped[int] = mapped_column(
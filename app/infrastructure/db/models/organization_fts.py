@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, MetaData, Table, Text
+
+# SQLite FTS5 table over organization names, activity names and building
+# addresses, kept in sync by triggers, see the organizations_fts migration.
+# The rowid is the organization id.
+organizations_fts = Table(
+    'organizations_fts',
+    MetaData(),
+    Column('rowid', Integer, primary_key=True),
+    Column('name', Text),
+    Column('activities', Text),
+    Column('address', Text),
+)
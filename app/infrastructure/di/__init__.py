@@ -1,6 +1,7 @@
 from app.infrastructure.di.config import ConfigProvider, DbConfigProvider
 from app.infrastructure.di.db import DbProvider
 from app.infrastructure.di.gateways import GatewayProvider
+from app.infrastructure.di.indexes import IndexProvider
 from app.infrastructure.di.interactors import get_interactor_providers
 from app.infrastructure.di.utils import UtilsProvider
 
@@ -12,5 +13,6 @@ def get_providers(path_env):
         DbConfigProvider(),
         DbProvider(),
         GatewayProvider(),
+        IndexProvider(),
         UtilsProvider(),
     ]
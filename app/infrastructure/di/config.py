@@ -1,7 +1,7 @@
 from dishka import Provider, Scope, provide
 
 from app.common.config import (
-    Config, Paths, DbConfig,
+    Config, Paths, DbConfig, GeoConfig,
 )
 from app.common.config import load_config
 from app.common.config import common_get_paths
@@ -29,3 +29,7 @@ class DbConfigProvider(Provider):
     @provide
     def get_db_config(self, config: Config) -> DbConfig:
         return config.db
+
+    @provide
+    def get_geo_config(self, config: Config) -> GeoConfig:
+        return config.geo or GeoConfig()
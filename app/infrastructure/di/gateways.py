@@ -1,15 +1,102 @@
 from dishka import Provider, Scope, provide
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.config import GeoConfig, GeoIndexType
+from app.core.utils.activity_index import ActivityIndex
 from app.core.interfaces.adapters.organization import OrganizationGateway
+from app.core.utils.geo_cache import GeoCellCache
+from app.core.utils.spatial_index import ClusterGrid, GridIndex
+from app.core.utils.suggest import SuggestIndex
+from app.core.utils.taxonomy import ActivityTaxonomy
+from app.core.utils.tiles import TileCache
+from app.core.utils.trigram_index import TrigramIndex
+from app.infrastructure.db.gateways.activity import ActivityDbGateway
+from app.infrastructure.db.gateways.building import BuildingDbGateway
+from app.infrastructure.db.gateways.geo_cache import GeoCacheDbGateway
+from app.infrastructure.db.gateways.map import MapDbGateway
 from app.infrastructure.db.gateways.organization import OrganizationDbGateway
+from app.infrastructure.db.gateways.search import SearchDbGateway
 
 
 class GatewayProvider(Provider):
     scope = Scope.REQUEST
 
     @provide
-    async def get_organization_gateway(
-        self, session: AsyncSession,
+    def get_building_gateway(
+        self,
+        session: AsyncSession,
+        geo_config: GeoConfig,
+        geo_index: GridIndex,
+    ) -> BuildingDbGateway:
+        return BuildingDbGateway(
+            session=session,
+            geo_index=geo_index,
+            use_index=geo_config.index == GeoIndexType.memory,
+            use_geo_key=geo_config.index == GeoIndexType.geo_key,
+        )
+
+    @provide
+    def get_activity_gateway(
+        self,
+        session: AsyncSession,
+        taxonomy: ActivityTaxonomy,
+        activity_index: ActivityIndex,
+    ) -> ActivityDbGateway:
+        return ActivityDbGateway(
+            session=session,
+            taxonomy=taxonomy,
+            activity_index=activity_index,
+        )
+
+    @provide
+    def get_search_gateway(
+        self,
+        session: AsyncSession,
+        trigram_index: TrigramIndex,
+        suggest_index: SuggestIndex,
+    ) -> SearchDbGateway:
+        return SearchDbGateway(
+            session=session,
+            trigram_index=trigram_index,
+            suggest_index=suggest_index,
+        )
+
+    @provide
+    def get_map_gateway(
+        self,
+        session: AsyncSession,
+        buildings: BuildingDbGateway,
+        clusters: ClusterGrid,
+        tiles: TileCache,
+    ) -> MapDbGateway:
+        return MapDbGateway(
+            session=session,
+            buildings=buildings,
+            clusters=clusters,
+            tiles=tiles,
+        )
+
+    @provide
+    def get_geo_cache_gateway(
+        self, buildings: BuildingDbGateway, geo_cache: GeoCellCache,
+    ) -> GeoCacheDbGateway:
+        return GeoCacheDbGateway(buildings=buildings, cache=geo_cache)
+
+    @provide
+    def get_organization_gateway(
+        self,
+        session: AsyncSession,
+        buildings: BuildingDbGateway,
+        activities: ActivityDbGateway,
+        search_index: SearchDbGateway,
+        maps: MapDbGateway,
+        geo_cache: GeoCacheDbGateway,
     ) -> OrganizationGateway:
-        return OrganizationDbGateway(session=session)
+        return OrganizationDbGateway(
+            session=session,
+            buildings=buildings,
+            activities=activities,
+            search_index=search_index,
+            maps=maps,
+            geo_cache=geo_cache,
+        )
@@ -0,0 +1,52 @@
+from dishka import Provider, Scope, provide
+
+from app.common.config import GeoConfig
+from app.core.utils.activity_index import ActivityIndex
+from app.core.utils.geo_cache import GeoCellCache
+from app.core.utils.spatial_index import ClusterGrid, GridIndex
+from app.core.utils.str_cleaner import StrNormalizer
+from app.core.utils.suggest import SuggestIndex
+from app.core.utils.taxonomy import ActivityTaxonomy
+from app.core.utils.tiles import TileCache
+from app.core.utils.trigram_index import TrigramIndex
+
+
+class IndexProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_geo_index(self, geo_config: GeoConfig) -> GridIndex:
+        return GridIndex(cell_size=geo_config.cell_size)
+
+    @provide
+    def get_cluster_grid(self, geo_config: GeoConfig) -> ClusterGrid:
+        return ClusterGrid(max_zoom=geo_config.cluster_max_zoom)
+
+    @provide
+    def get_tile_cache(self, geo_config: GeoConfig) -> TileCache:
+        return TileCache(max_size=geo_config.tile_cache_size)
+
+    @provide
+    def get_activity_taxonomy(
+        self, normalizer: StrNormalizer,
+    ) -> ActivityTaxonomy:
+        return ActivityTaxonomy(normalizer=normalizer)
+
+    @provide
+    def get_activity_index(self) -> ActivityIndex:
+        return ActivityIndex()
+
+    @provide
+    def get_trigram_index(self, normalizer: StrNormalizer) -> TrigramIndex:
+        return TrigramIndex(normalizer=normalizer)
+
+    @provide
+    def get_suggest_index(self, normalizer: StrNormalizer) -> SuggestIndex:
+        return SuggestIndex(normalizer=normalizer)
+
+    @provide
+    def get_geo_cell_cache(self, geo_config: GeoConfig) -> GeoCellCache:
+        return GeoCellCache(
+            cell_size=geo_config.response_cache_cell_size,
+            max_size=geo_config.response_cache_size,
+        )
@@ -9,8 +9,19 @@ from app.core.services.organization import (
     GetAllByBuildingAddress,
     GetAllByRadius,
     GetAllByRect,
+    GetAllByPolygon,
+    GetAllByGeoBatch,
+    GetNearest,
+    GetClusters,
+    GetTile,
     GetAllByActivityName,
     GetAllByActivityTree,
+    GetAllByActivityFilter,
+    GetActivityCounts,
+    IncludeRelations,
+    SearchOrganizations,
+    SearchOrganizationsFuzzy,
+    Suggest,
     AddOrganization,
     UpdateOrganization,
     DeleteOrganization,
@@ -56,6 +67,36 @@ class OrganizationInteractorProvider(Provider):
     ) -> GetAllByRect:
         return GetAllByRect(uow=uow, db_gateway=db_gateway)
 
+    @provide
+    def get_all_by_polygon(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> GetAllByPolygon:
+        return GetAllByPolygon(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def get_all_by_geo_batch(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> GetAllByGeoBatch:
+        return GetAllByGeoBatch(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def get_nearest(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> GetNearest:
+        return GetNearest(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def get_clusters(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> GetClusters:
+        return GetClusters(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def get_tile(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> GetTile:
+        return GetTile(uow=uow, db_gateway=db_gateway)
+
     @provide
     def get_all_by_activity_name(
         self, uow: UoW, db_gateway: OrganizationGateway,
@@ -68,6 +109,40 @@ class OrganizationInteractorProvider(Provider):
     ) -> GetAllByActivityTree:
         return GetAllByActivityTree(uow=uow, db_gateway=db_gateway)
 
+    @provide
+    def get_all_by_activity_filter(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> GetAllByActivityFilter:
+        return GetAllByActivityFilter(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def get_activity_counts(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> GetActivityCounts:
+        return GetActivityCounts(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def include_relations(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> IncludeRelations:
+        return IncludeRelations(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def search_organizations(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> SearchOrganizations:
+        return SearchOrganizations(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def search_organizations_fuzzy(
+        self, uow: UoW, db_gateway: OrganizationGateway,
+    ) -> SearchOrganizationsFuzzy:
+        return SearchOrganizationsFuzzy(uow=uow, db_gateway=db_gateway)
+
+    @provide
+    def suggest(self, uow: UoW, db_gateway: OrganizationGateway) -> Suggest:
+        return Suggest(uow=uow, db_gateway=db_gateway)
+
     @provide
     def add_organization(
         self, uow: UoW, db_gateway: OrganizationGateway,
@@ -136,6 +136,9 @@ async def fill_organizations(
 
 async def fill_buildings(session: AsyncSession) -> list[dto.Building]:
     data = get_data(Path("building.json"))
+    for building in data:
+        building["city_key"] = models.address_key(building["city"])
+        building["street_key"] = models.address_key(building["street"])
 
     stmt = insert(models.Building).values(data)
     stmt = stmt.on_conflict_do_update(
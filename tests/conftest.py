@@ -0,0 +1,52 @@
+import shutil
+from pathlib import Path
+from typing import AsyncIterator
+
+import anyio
+import pytest
+from dishka import AsyncContainer, make_async_container
+
+from app.infrastructure.di import get_providers
+from tests.db import DB_NAME, GEO_MODES, migrate, seed, write_config
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory, anyio_backend) -> Path:
+    """Migrated and seeded database copied by every test using one."""
+    app_dir = tmp_path_factory.mktemp("template")
+    write_config(app_dir)
+    migrate(app_dir)
+    anyio.run(seed, app_dir, backend=anyio_backend)
+    return app_dir / DB_NAME
+
+
+@pytest.fixture
+def app_dir(tmp_path, template_db, monkeypatch) -> Path:
+    shutil.copy(template_db, tmp_path / DB_NAME)
+    write_config(tmp_path)
+    monkeypatch.setenv("APP_DIR", tmp_path.as_posix())
+    return tmp_path
+
+
+@pytest.fixture
+def db_path(app_dir) -> Path:
+    return app_dir / DB_NAME
+
+
+@pytest.fixture(params=list(GEO_MODES))
+def geo_mode(request, app_dir) -> str:
+    index, cache_size = GEO_MODES[request.param]
+    write_config(app_dir, index=index, cache_size=cache_size)
+    return request.param
+
+
+@pytest.fixture
+async def container(app_dir) -> AsyncIterator[AsyncContainer]:
+    container = make_async_container(*get_providers("APP_DIR"))
+    yield container
+    await container.close()
@@ -0,0 +1,175 @@
+import os
+import random
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from dishka import AsyncContainer
+from sqlalchemy import insert
+
+from app.common.config import Paths, load_config
+from app.core.interfaces.adapters.organization import OrganizationGateway
+from app.core.interfaces.uow import UoW
+from app.infrastructure.db import models
+from app.infrastructure.db.factory import create_engine
+
+ROOT = Path(__file__).parent.parent
+DB_NAME = "catalog.sqlite3"
+CONFIG = """\
+app:
+  name: Test catalog
+db:
+  type: sqlite
+  connector: aiosqlite
+  dbname: {db_name}
+geo:
+  index: {index}
+  cell_size: 0.01
+  cluster_max_zoom: 16
+  tile_cache_size: 64
+  response_cache_size: {cache_size}
+  response_cache_cell_size: 0.01
+api:
+  auth:
+    static_key: {api_key}
+"""
+API_KEY = "TestKey"
+
+# Lat/lon box of the seeded buildings.
+AREA = (55.70, 37.55, 55.80, 37.70)
+# Buildings sharing the coordinates of building 1, organizations of all of
+# them are at equal distance from any point.
+TWIN_BUILDINGS = 3
+
+ACTIVITIES = [
+    (1, "Еда", None),
+    (2, "Мясная продукция", 1),
+    (3, "Молочная продукция", 1),
+    (4, "Автомобили", None),
+    (5, "Грузовые", 4),
+    (6, "Запчасти", 5),
+    (7, "Легковые", 4),
+]
+NAMED_ORGANIZATIONS = ["Рога и Копыта", "Молочный мир", "Ёлки-палки"]
+
+
+def write_config(
+    app_dir: Path, index: str = "memory", cache_size: int = 0,
+) -> None:
+    config_dir = app_dir / "config"
+    config_dir.mkdir(exist_ok=True)
+    (config_dir / "config.yml").write_text(CONFIG.format(
+        db_name=DB_NAME, index=index, cache_size=cache_size, api_key=API_KEY,
+    ))
+
+
+@contextmanager
+def working_dir(path: Path):
+    # The Alembic URL of SQLite is relative to the working directory.
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def migrate(app_dir: Path, revision: str = "head") -> None:
+    alembic_config = AlembicConfig()
+    alembic_config.set_main_option(
+        "script_location",
+        (ROOT / "app" / "infrastructure" / "db" / "migrations").as_posix(),
+    )
+    old_app_dir = os.environ.get("APP_DIR")
+    os.environ["APP_DIR"] = app_dir.as_posix()
+    try:
+        with working_dir(app_dir):
+            command.upgrade(alembic_config, revision)
+    finally:
+        if old_app_dir is None:
+            del os.environ["APP_DIR"]
+        else:
+            os.environ["APP_DIR"] = old_app_dir
+
+
+def seed_rows() -> dict[type[models.Base], list[dict]]:
+    rnd = random.Random(20261018)
+    lat_min, lon_min, lat_max, lon_max = AREA
+    buildings = []
+    for id_ in range(1, 301):
+        street = f"Улица {id_ % 17}"
+        buildings.append({
+            "id": id_,
+            "city": "Москва",
+            "street": street,
+            "city_key": models.address_key("Москва"),
+            "street_key": models.address_key(street),
+            "house": str(id_),
+            "lat": round(rnd.uniform(lat_min, lat_max), 5),
+            "lon": round(rnd.uniform(lon_min, lon_max), 5),
+        })
+    for i in range(TWIN_BUILDINGS):
+        buildings.append({
+            **buildings[0],
+            "id": len(buildings) + 1,
+            "house": f"{buildings[0]['house']}к{i + 1}",
+        })
+
+    organizations = []
+    org_activities = []
+    names = iter(NAMED_ORGANIZATIONS)
+    owners = [
+        building["id"]
+        for building in buildings[:-TWIN_BUILDINGS]
+        for _ in range(rnd.randint(0, 3))
+    ]
+    # Ids of organizations in the twins go against the building ids, so at
+    # equal distance the organizations are not ordered like the buildings.
+    twins = [buildings[0]] + buildings[-TWIN_BUILDINGS:]
+    owners.extend(building["id"] for building in 2 * twins[::-1])
+    for building_id in owners:
+        id_ = len(organizations) + 1
+        organizations.append({
+            "id": id_,
+            "name": next(names, f"Организация {id_}"),
+            "inn": f"{id_:010d}",
+            "building_id": building_id,
+        })
+        for activity_id in rnd.sample(range(1, 8), rnd.randint(0, 3)):
+            org_activities.append(
+                {"organization_id": id_, "activity_id": activity_id},
+            )
+    return {
+        models.Activity: [
+            {"id": id_, "name": name, "parent_id": parent_id}
+            for id_, name, parent_id in ACTIVITIES
+        ],
+        models.Building: buildings,
+        models.Organization: organizations,
+        models.OrgActivity: org_activities,
+    }
+
+
+async def seed(app_dir: Path) -> None:
+    engine = create_engine(load_config(Paths(app_dir)).db)
+    async with engine.begin() as connection:
+        for model, rows in seed_rows().items():
+            await connection.execute(insert(model), rows)
+    await engine.dispose()
+
+
+# geo.index and geo.response_cache_size of the ways queries are served.
+GEO_MODES = {
+    "memory": ("memory", 0),
+    "sql": ("sql", 0),
+    "geo_key": ("geo_key", 0),
+    "cached": ("sql", 4096),
+}
+
+
+@asynccontextmanager
+async def request_scope(container: AsyncContainer):
+    """Gateway and unit of work of one request."""
+    async with container() as request:
+        yield await request.get(OrganizationGateway), await request.get(UoW)
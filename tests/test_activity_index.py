@@ -0,0 +1,98 @@
+import random
+from collections import Counter
+
+from app.core.utils.activity_index import ActivityIndex, bitmap_ids
+
+# Activity tree: 1 -> 2 -> 3, 1 -> 4, 5 -> 6.
+ANCESTORS = {
+    1: frozenset({1}),
+    2: frozenset({1, 2}),
+    3: frozenset({1, 2, 3}),
+    4: frozenset({1, 4}),
+    5: frozenset({5}),
+    6: frozenset({5, 6}),
+}
+
+
+def assert_matches(index: ActivityIndex, organizations: dict[int, set[int]]):
+    assert len(index) == sum(1 for ids in organizations.values() if ids)
+    for activity_id, ancestors in ANCESTORS.items():
+        members = sorted(
+            id_ for id_, ids in organizations.items() if activity_id in ids
+        )
+        assert bitmap_ids(index.bitmap(activity_id)) == members
+        subtree = {
+            other for other, other_ancestors in ANCESTORS.items()
+            if activity_id in other_ancestors
+        }
+        assert index.counts(activity_id) == (
+            len(members),
+            sum(1 for ids in organizations.values() if ids & subtree),
+        )
+
+
+def random_organizations(rnd: random.Random, count: int):
+    return {
+        id_: set(rnd.sample(list(ANCESTORS), rnd.randint(0, 3)))
+        for id_ in rnd.sample(range(count * 3), count)
+    }
+
+
+def test_rebuild_matches_sets():
+    rnd = random.Random(30)
+    organizations = random_organizations(rnd, 300)
+    index = ActivityIndex()
+    index.set_ancestors(ANCESTORS)
+    index.rebuild(
+        (id_, activity_id)
+        for id_, ids in organizations.items() for activity_id in ids
+    )
+    assert_matches(index, organizations)
+
+
+def test_upsert_and_discard_match_rebuild():
+    rnd = random.Random(31)
+    organizations = random_organizations(rnd, 200)
+    index = ActivityIndex()
+    index.set_ancestors(ANCESTORS)
+    index.rebuild(
+        (id_, activity_id)
+        for id_, ids in organizations.items() for activity_id in ids
+    )
+    for _ in range(500):
+        id_ = rnd.randrange(700)
+        if rnd.random() < 0.25:
+            index.discard(id_)
+            organizations.pop(id_, None)
+        else:
+            ids = set(rnd.sample(list(ANCESTORS), rnd.randint(0, 3)))
+            index.upsert(id_, ids)
+            organizations[id_] = ids
+    assert_matches(index, organizations)
+
+
+def test_ancestors_set_after_load_recount_subtrees():
+    index = ActivityIndex()
+    index.rebuild([(1, 3), (2, 4), (2, 3)])
+    assert index.counts(1) == (0, 0)
+    index.set_ancestors(ANCESTORS)
+    assert index.counts(1) == (0, 2)
+    assert index.counts(2) == (0, 2)
+    assert index.counts(3) == (2, 2)
+
+
+def test_set_operations_and_facets():
+    index = ActivityIndex()
+    index.set_ancestors(ANCESTORS)
+    index.rebuild([(1, 2), (2, 2), (2, 5), (3, 5), (4, 6)])
+    assert bitmap_ids(index.any_of([2, 6])) == [1, 2, 4]
+    assert bitmap_ids(index.bitmap(2) & index.bitmap(5)) == [2]
+    assert bitmap_ids(index.bitmap(5) & ~index.bitmap(2)) == [3]
+    assert index.any_of([4]) == 0
+    assert index.facet([1, 2, 3, 99]) == Counter({2: 2, 5: 2})
+
+
+def test_bitmap_ids():
+    assert bitmap_ids(0) == []
+    assert bitmap_ids(1) == [0]
+    assert bitmap_ids((1 << 1000) | (1 << 3) | 1) == [0, 3, 1000]
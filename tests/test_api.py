@@ -0,0 +1,162 @@
+import pytest
+from dishka import make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi.testclient import TestClient
+
+from app.__main__ import create_app
+from app.api.config.setup_config import load_config
+from app.api.dependencies import get_api_providers
+from app.api.routes.organization import NEXT_CURSOR_HEADER
+from app.common.config import Paths
+from app.core.utils.geo import tile_xy
+from app.core.utils.tiles import TILE_HEADER
+from app.infrastructure.di import get_providers
+from tests.db import API_KEY
+
+PREFIX = "/api/org/v0"
+RECT = {"lat_min": 55.72, "lon_min": 37.58, "lat_max": 55.78, "lon_max": 37.66}
+
+
+@pytest.fixture
+def client(app_dir):
+    app = create_app(load_config(Paths(app_dir)))
+    setup_dishka(
+        make_async_container(
+            *get_providers("APP_DIR"), *get_api_providers(),
+        ),
+        app,
+    )
+    with TestClient(app, headers={"X-API-KEY": API_KEY}) as client:
+        yield client
+
+
+def test_api_key_is_required(client):
+    response = client.get(
+        f"{PREFIX}/building/by-rect/",
+        params=RECT,
+        headers={"X-API-KEY": "wrong"},
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("path, include", [
+    ("/{id}/", False),
+    ("/search/by-name/", False),
+    ("/building/by-rect/", True),
+    ("/building/batch/", True),
+])
+def test_include_is_a_list_parameter(client, path, include):
+    operation = next(iter(
+        client.get("/openapi.json").json()["paths"][f"{PREFIX}{path}"].values()
+    ))
+    names = {param["name"] for param in operation["parameters"]}
+    assert "fields" in names
+    assert ("include" in names) is include
+
+
+def test_fields_of_one_organization(client):
+    response = client.get(f"{PREFIX}/1/", params={"fields": "id,building.lat"})
+    assert response.status_code == 200
+    org = response.json()
+    assert org["id"] == 1
+    assert list(org) == ["id", "building"]
+    assert list(org["building"]) == ["lat"]
+
+
+def test_tile_etag(client):
+    x, y = tile_xy(55.75, 37.62, 12)
+    response = client.get(f"{PREFIX}/tiles/12/{x}/{y}/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert len(response.content) > TILE_HEADER.size
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    again = client.get(f"{PREFIX}/tiles/12/{x}/{y}/")
+    assert again.headers["etag"] == etag and again.content == response.content
+
+    cached = client.get(
+        f"{PREFIX}/tiles/12/{x}/{y}/", headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    stale = client.get(
+        f"{PREFIX}/tiles/12/{x}/{y}/", headers={"If-None-Match": '"0"'},
+    )
+    assert stale.status_code == 200
+
+    empty = client.get(f"{PREFIX}/tiles/12/0/0/")
+    assert empty.status_code == 200
+    assert empty.headers["etag"] != etag
+    assert client.get(f"{PREFIX}/tiles/2/4/0/").status_code == 404
+
+
+def test_batch_limits_radius_queries(client):
+    radius = {"center_lat": 55.75, "center_lon": 37.62, "radius": 2}
+    response = client.post(
+        f"{PREFIX}/building/batch/",
+        json=[radius, {**radius, "limit": 1}, {**radius, "limit": 3}, RECT],
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert len(result["0"]) > 3
+    assert [org["id"] for org in result["1"]] == [result["2"][0]["id"]]
+    assert len(result["2"]) == 3
+
+
+@pytest.mark.parametrize("item", [
+    {"radius": 0},
+    {"radius": -1},
+    {"limit": 0},
+    {"limit": -1},
+    {"after": {"id": 1, "distance_km": 0.5}},
+])
+def test_batch_rejects_invalid_radius_queries(client, item):
+    query = {"center_lat": 55.75, "center_lon": 37.62, "radius": 2, **item}
+    response = client.post(f"{PREFIX}/building/batch/", json=[RECT, query])
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("queries[1]: ")
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/building/by-rect/", RECT),
+    (
+        "/building/by-radius/",
+        {
+            "center_lat": 55.75,
+            "center_lon": 37.62,
+            "radius": 2,
+            "order": "distance",
+        },
+    ),
+])
+def test_next_cursor_walks_whole_list(client, path, params):
+    response = client.get(f"{PREFIX}{path}", params=params)
+    assert NEXT_CURSOR_HEADER not in response.headers
+    whole = response.json()
+
+    items = []
+    cursor = None
+    while True:
+        response = client.get(f"{PREFIX}{path}", params={
+            **params, "limit": 6, **({"cursor": cursor} if cursor else {}),
+        })
+        assert response.status_code == 200
+        items.extend(response.json())
+        if (cursor := response.headers.get(NEXT_CURSOR_HEADER)) is None:
+            break
+    ids = [org["id"] for org in items]
+    assert len(ids) == len(set(ids))
+    if "order" in params:
+        assert ids == [org["id"] for org in whole]
+    else:
+        assert ids == sorted(org["id"] for org in whole)
+
+
+def test_malformed_cursor(client):
+    response = client.get(
+        f"{PREFIX}/building/by-rect/", params={**RECT, "cursor": "garbage"},
+    )
+    assert response.status_code == 422
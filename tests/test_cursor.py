@@ -0,0 +1,45 @@
+from base64 import urlsafe_b64encode
+
+import pytest
+
+from app.api.cursor import decode_cursor, encode_cursor
+from app.core.models import dto
+
+
+@pytest.mark.parametrize("cursor", [
+    dto.Cursor(id=1),
+    dto.Cursor(id=10 ** 12),
+    dto.Cursor(id=5, distance_km=0.0),
+    dto.Cursor(id=5, distance_km=1.2345678901234567),
+])
+def test_round_trip(cursor):
+    value = encode_cursor(cursor)
+    assert "=" not in value
+    assert value == value.strip() and "/" not in value and "+" not in value
+    assert decode_cursor(value) == cursor
+
+
+def encoded(data: bytes) -> str:
+    return urlsafe_b64encode(data).decode()
+
+
+@pytest.mark.parametrize("value", [
+    "",
+    "not base64!",
+    encoded(b"[1, 2]"),
+    encoded(b'{"d": 1.5}'),
+    encoded(b'{"id": "1"}'),
+    encoded(b'{"id": true}'),
+    encoded(b'{"id": 1.0}'),
+    encoded(b'{"id": 1, "d": "far"}'),
+    encoded(b"\xff\xfe"),
+])
+def test_malformed_cursor(value):
+    with pytest.raises(ValueError):
+        decode_cursor(value)
+
+
+def test_integer_distance_is_a_float():
+    cursor = decode_cursor(encoded(b'{"id": 1, "d": 2}'))
+    assert cursor == dto.Cursor(id=1, distance_km=2.0)
+    assert isinstance(cursor.distance_km, float)
@@ -0,0 +1,97 @@
+import random
+from math import pi, radians
+
+import pytest
+
+from app.core.utils.geo import (
+    EARTH_RADIUS_KM, bounding_box, geo_key, geo_key_ranges, haversine,
+    tile_bounds, tile_xy,
+)
+
+
+def random_rects(count: int, seed: int = 1):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        lat, lon = rnd.uniform(-80, 80), rnd.uniform(-179, 179)
+        size = rnd.choice((1e-4, 1e-3, 0.05, 1.0, 20.0))
+        yield (
+            lat, lon,
+            min(lat + rnd.uniform(0, size), 89.9),
+            min(lon + rnd.uniform(0, size), 179.9),
+        )
+
+
+def test_haversine():
+    assert haversine(55.75, 37.62, 55.75, 37.62) == 0
+    # A degree of latitude along a meridian.
+    assert haversine(10, 20, 11, 20) == pytest.approx(
+        EARTH_RADIUS_KM * radians(1),
+    )
+    assert haversine(0, 0, 0, 180) == pytest.approx(EARTH_RADIUS_KM * pi)
+
+
+def test_bounding_box_holds_circle():
+    rnd = random.Random(2)
+    for _ in range(200):
+        lat, lon = rnd.uniform(-70, 70), rnd.uniform(-170, 170)
+        radius = rnd.uniform(0.1, 50)
+        lat_min, lon_min, lat_max, lon_max = bounding_box(lat, lon, radius)
+        for _ in range(20):
+            point = (
+                rnd.uniform(lat - 1, lat + 1), rnd.uniform(lon - 1, lon + 1),
+            )
+            if haversine(lat, lon, *point) <= radius:
+                assert lat_min <= point[0] <= lat_max
+                assert lon_min <= point[1] <= lon_max
+
+
+@pytest.mark.parametrize("max_ranges", [4, 16, 64])
+def test_geo_key_ranges_cover_rect(max_ranges):
+    rnd = random.Random(3)
+    for rect in random_rects(300):
+        ranges = geo_key_ranges(*rect, max_ranges=max_ranges)
+        assert len(ranges) <= max_ranges
+        assert ranges == sorted(ranges)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end + 1 < start
+        lat_min, lon_min, lat_max, lon_max = rect
+        corners = [
+            (lat, lon)
+            for lat in (lat_min, lat_max) for lon in (lon_min, lon_max)
+        ]
+        inside = [
+            (rnd.uniform(lat_min, lat_max), rnd.uniform(lon_min, lon_max))
+            for _ in range(50)
+        ]
+        for point in corners + inside:
+            key = geo_key(*point)
+            assert any(start <= key <= end for start, end in ranges), point
+
+
+def test_geo_key_ranges_are_tight_for_small_rects():
+    # More ranges follow the rect more closely.
+    rect = (55.75, 37.61, 55.76, 37.63)
+    spans = [
+        sum(end - start + 1 for start, end in geo_key_ranges(*rect, limit))
+        for limit in (4, 16, 64)
+    ]
+    assert spans[0] >= spans[1] >= spans[2]
+
+
+def test_geo_key_bounds():
+    assert geo_key(-90, -180) == 0
+    assert geo_key(90, 180) == (1 << 48) - 1
+    # Longitude takes the odd bits, latitude the even ones.
+    assert geo_key(-90, 180) == 0xAAAAAAAAAAAA
+    assert geo_key(90, -180) == 0x555555555555
+
+
+def test_tile_bounds_hold_tile_points():
+    rnd = random.Random(4)
+    for _ in range(300):
+        zoom = rnd.randint(0, 18)
+        lat, lon = rnd.uniform(-85, 85), rnd.uniform(-180, 179.999)
+        x, y = tile_xy(lat, lon, zoom)
+        lat_min, lon_min, lat_max, lon_max = tile_bounds(zoom, x, y)
+        assert lat_min - 1e-9 <= lat <= lat_max + 1e-9
+        assert lon_min - 1e-9 <= lon <= lon_max + 1e-9
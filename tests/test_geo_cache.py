@@ -0,0 +1,13 @@
+import random
+
+from app.core.utils.geo_cache import GeoCellCache
+
+
+def test_cell_count_matches_cells():
+    cache = GeoCellCache(cell_size=0.01)
+    rnd = random.Random(1)
+    for _ in range(200):
+        lat, lon = rnd.uniform(-80.0, 80.0), rnd.uniform(-179.0, 179.0)
+        height, width = rnd.uniform(0.0, 0.3), rnd.uniform(0.0, 0.3)
+        rect = (lat, lon, lat + height, lon + width)
+        assert cache.cell_count(*rect) == len(cache.cells(*rect))
@@ -0,0 +1,210 @@
+import sqlite3
+
+import pytest
+from dishka import AsyncContainer, make_async_container
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import dto
+from app.core.models.enums import SuggestType
+from app.core.utils.activity_index import ActivityIndex, bitmap_ids
+from app.core.utils.geo import tile_xy
+from app.core.utils.spatial_index import ClusterGrid, GridIndex
+from app.core.utils.suggest import SuggestIndex
+from app.core.utils.taxonomy import ActivityTaxonomy
+from app.core.utils.tiles import TileCache
+from app.core.utils.trigram_index import TrigramIndex
+from app.infrastructure.db.gateways.activity import ActivityDbGateway
+from app.infrastructure.db.gateways.building import BuildingDbGateway
+from app.infrastructure.db.gateways.search import SearchDbGateway
+from app.infrastructure.di import get_providers
+from tests.db import request_scope
+
+pytestmark = pytest.mark.anyio
+
+WORLD = (-85.0, -180.0, 85.0, 180.0)
+TILE_ZOOM = 14
+# Buildings moved, renamed or removed by apply_changes.
+MOVED, RENAMED, REMOVED = 3, 4, 300
+NEW_PLACE = (55.701, 37.551)
+
+CHANGES = [
+    # A new building with a new organization.
+    "INSERT INTO buildings (id, city, street, house, lat, lon) "
+    f"VALUES (1000, 'Москва', 'Новая', '1', {NEW_PLACE[0]}, {NEW_PLACE[1]})",
+    "INSERT INTO organizations (id, name, inn, building_id) "
+    "VALUES (5000, 'Новая молочная лавка', '9999999999', 1000)",
+    "INSERT INTO org_activity (organization_id, activity_id) "
+    "VALUES (5000, 3), (5000, 6)",
+    f"UPDATE buildings SET lat = 55.79, lon = 37.69 WHERE id = {MOVED}",
+    f"UPDATE buildings SET street = 'Переименованная' WHERE id = {RENAMED}",
+    # A building removed with its organizations.
+    "DELETE FROM org_activity WHERE organization_id IN "
+    f"(SELECT id FROM organizations WHERE building_id = {REMOVED})",
+    f"DELETE FROM organizations WHERE building_id = {REMOVED}",
+    f"DELETE FROM buildings WHERE id = {REMOVED}",
+    # Organizations renamed, moved to another building and re-classified.
+    "UPDATE organizations SET name = 'Рога без копыт' WHERE id = 1",
+    f"UPDATE organizations SET building_id = {MOVED} WHERE id = 10",
+    "DELETE FROM org_activity WHERE organization_id = 20",
+    "INSERT INTO org_activity (organization_id, activity_id) "
+    "VALUES (20, 2), (21, 7)",
+    # The activity tree changes too.
+    "UPDATE activities SET name = 'Легковые автомобили' WHERE id = 7",
+    "INSERT INTO activities (id, name, parent_id) VALUES (8, 'Сыры', 3)",
+    "UPDATE activities SET parent_id = 7 WHERE id = 6",
+]
+
+
+async def sync(container: AsyncContainer) -> None:
+    """Bring every in-memory structure up to date as requests do."""
+    async with container() as request:
+        buildings = await request.get(BuildingDbGateway)
+        await buildings.get_index()
+        await buildings.sync_clusters(await request.get(ClusterGrid))
+        await (await request.get(ActivityDbGateway)).get_counts()
+        search = await request.get(SearchDbGateway)
+        await search.search_fuzzy(dto.TextSearchQuery("синхронизация"))
+        await search.suggest(
+            dto.SuggestQuery(prefix="", types=list(SuggestType)),
+        )
+
+
+async def snapshot(container: AsyncContainer, names: list[str]) -> dict:
+    """Observable state of the in-memory structures."""
+    grid = await container.get(GridIndex)
+    clusters = await container.get(ClusterGrid)
+    taxonomy = await container.get(ActivityTaxonomy)
+    activities = await container.get(ActivityIndex)
+    trigrams = await container.get(TrigramIndex)
+    suggest = await container.get(SuggestIndex)
+    return {
+        "grid": {id_: grid.get(id_) for id_ in grid.in_rect(*WORLD)},
+        "clusters": [
+            sorted(
+                (cell, weight, round(lat, 9), round(lon, 9))
+                for cell, weight, lat, lon in clusters.clusters(zoom, *WORLD)
+            )
+            for zoom in range(clusters.max_zoom + 1)
+        ],
+        "taxonomy": (taxonomy.activities, taxonomy.ancestors),
+        "activities": {
+            activity_id: (
+                bitmap_ids(activities.bitmap(activity_id)),
+                activities.counts(activity_id),
+            )
+            for activity_id in taxonomy.activities
+        },
+        "trigrams": (
+            len(trigrams),
+            {name: trigrams.search(name, limit=1000) for name in names},
+        ),
+        "suggest": [
+            index.search("", limit=10 ** 6)
+            for index in (
+                suggest.organizations, suggest.activities, suggest.streets,
+            )
+        ],
+    }
+
+
+def organization_names(db_path) -> list[str]:
+    with sqlite3.connect(db_path) as connection:
+        return [
+            name for name, in connection.execute(
+                "SELECT name FROM organizations",
+            )
+        ]
+
+
+async def apply_changes(container: AsyncContainer) -> None:
+    async with container() as request:
+        session = await request.get(AsyncSession)
+        for statement in CHANGES:
+            await session.execute(text(statement))
+        await session.commit()
+
+
+async def test_indexes_follow_change_log(container, db_path):
+    await sync(container)
+    await apply_changes(container)
+    await sync(container)
+
+    fresh = make_async_container(*get_providers("APP_DIR"))
+    try:
+        await sync(fresh)
+        names = organization_names(db_path)
+        synced = await snapshot(container, names)
+        assert synced == await snapshot(fresh, names)
+    finally:
+        await fresh.close()
+
+    grid = synced["grid"]
+    assert grid[1000] == NEW_PLACE and grid[MOVED] == (55.79, 37.69)
+    assert REMOVED not in grid
+    assert "Переименованная" in synced["suggest"][2]
+    assert "Сыры" in synced["suggest"][1]
+
+
+async def test_tiles_follow_change_log(container):
+    with_moved = [
+        dto.TileQuery(TILE_ZOOM, *tile_xy(*point, TILE_ZOOM))
+        for point in (NEW_PLACE, (55.79, 37.69))
+    ]
+    async with request_scope(container) as (gateway, _):
+        before = [await gateway.get_tile(query) for query in with_moved]
+    await apply_changes(container)
+    async with request_scope(container) as (gateway, _):
+        after = [await gateway.get_tile(query) for query in with_moved]
+
+    fresh = make_async_container(*get_providers("APP_DIR"))
+    try:
+        async with request_scope(fresh) as (gateway, _):
+            rebuilt = [await gateway.get_tile(query) for query in with_moved]
+    finally:
+        await fresh.close()
+    assert after == rebuilt
+    assert after != before
+
+
+async def test_tile_built_across_a_sync_is_not_cached(container, monkeypatch):
+    query = dto.TileQuery(TILE_ZOOM, *tile_xy(55.79, 37.69, TILE_ZOOM))
+    tiles = await container.get(TileCache)
+    get_points = BuildingDbGateway.get_points_in_bbox
+
+    async def get_points_then_sync(self, *bbox):
+        # Another request writes and syncs the cache meanwhile.
+        monkeypatch.setattr(
+            BuildingDbGateway, "get_points_in_bbox", get_points,
+        )
+        points = await get_points(self, *bbox)
+        await apply_changes(container)
+        async with container() as request:
+            buildings = await request.get(BuildingDbGateway)
+            await buildings.sync_cache(tiles)
+        return points
+
+    monkeypatch.setattr(
+        BuildingDbGateway, "get_points_in_bbox", get_points_then_sync,
+    )
+    async with request_scope(container) as (gateway, _):
+        await gateway.get_tile(query)
+    assert len(tiles) == 0
+
+
+async def test_response_cache_follows_change_log(geo_mode, container):
+    query = dto.GeoRectQuery(55.785, 37.685, 55.795, 37.695)
+    radius = dto.GeoRadiusQuery(*NEW_PLACE, 0.5)
+    async with request_scope(container) as (gateway, _):
+        rect_before = await gateway.get_all_by_rect(query)
+        radius_before = await gateway.get_all_by_radius(radius)
+    await apply_changes(container)
+    async with request_scope(container) as (gateway, _):
+        rect_after = {org.id for org in await gateway.get_all_by_rect(query)}
+        radius_after = {
+            org.id for org in await gateway.get_all_by_radius(radius)
+        }
+
+    # Building MOVED landed in the rect along with organization 10.
+    assert rect_after - {org.id for org in rect_before} >= {10}
+    assert radius_after - {org.id for org in radius_before} == {5000}
@@ -0,0 +1,264 @@
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import dto
+from app.core.models.enums import GeoOrder, SuggestType
+from app.core.utils.geo import geo_key, haversine
+from app.core.utils.geo_cache import GeoCellCache
+from tests.db import (
+    AREA, DB_NAME, TWIN_BUILDINGS, migrate, request_scope, write_config,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def load_points(db_path: Path) -> list[tuple[int, float, float]]:
+    """``(organization_id, lat, lon)`` of every organization."""
+    with sqlite3.connect(db_path) as connection:
+        return connection.execute(
+            "SELECT o.id, b.lat, b.lon "
+            "FROM organizations o JOIN buildings b ON b.id = o.building_id",
+        ).fetchall()
+
+
+def by_distance(points, lat, lon) -> list[tuple[float, int]]:
+    return sorted((haversine(lat, lon, *point), id_) for id_, *point in points)
+
+
+def random_centers(count: int, seed: int):
+    rnd = random.Random(seed)
+    lat_min, lon_min, lat_max, lon_max = AREA
+    return [
+        (rnd.uniform(lat_min, lat_max), rnd.uniform(lon_min, lon_max))
+        for _ in range(count)
+    ]
+
+
+async def test_radius_matches_brute_force(geo_mode, container, db_path):
+    points = load_points(db_path)
+    async with request_scope(container) as (gateway, _):
+        for lat, lon, radius in [
+            (*center, radius)
+            for center in random_centers(10, seed=1)
+            for radius in (0.3, 1.5, 6.0)
+        ]:
+            expected = [
+                (id_, distance)
+                for distance, id_ in by_distance(points, lat, lon)
+                if distance <= radius
+            ]
+            result = await gateway.get_all_by_radius(
+                dto.GeoRadiusQuery(lat, lon, radius),
+            )
+            assert sorted(org.id for org in result) == sorted(
+                id_ for id_, _ in expected
+            )
+            distances = dict(expected)
+            for org in result:
+                assert org.distance_km == pytest.approx(distances[org.id])
+
+            result = await gateway.get_all_by_radius(dto.GeoRadiusQuery(
+                lat, lon, radius, order=GeoOrder.distance, limit=10,
+            ))
+            assert [org.id for org in result] == [
+                id_ for id_, _ in expected[:10]
+            ]
+
+
+async def test_rect_matches_brute_force(geo_mode, container, db_path):
+    points = load_points(db_path)
+    rnd = random.Random(2)
+    async with request_scope(container) as (gateway, _):
+        for lat, lon in random_centers(20, seed=3):
+            size = rnd.choice((0.002, 0.02, 0.08))
+            query = dto.GeoRectQuery(lat, lon, lat + size, lon + size * 2)
+            result = await gateway.get_all_by_rect(query)
+            assert sorted(org.id for org in result) == sorted(
+                id_ for id_, p_lat, p_lon in points
+                if query.lat_min <= p_lat <= query.lat_max
+                and query.lon_min <= p_lon <= query.lon_max
+            )
+
+
+async def test_wide_areas_skip_response_cache(
+    geo_mode, container, db_path, monkeypatch,
+):
+    """World-wide areas span millions of cache cells, none are listed."""
+    def cells(*args):
+        raise AssertionError("cells of a wide area listed")
+
+    monkeypatch.setattr(GeoCellCache, "cells", cells)
+    expected = sorted(id_ for id_, _, _ in load_points(db_path))
+    async with request_scope(container) as (gateway, _):
+        result = await gateway.get_all_by_rect(
+            dto.GeoRectQuery(-85.0, -180.0, 85.0, 180.0),
+        )
+        assert sorted(org.id for org in result) == expected
+        result = await gateway.get_all_by_radius(
+            dto.GeoRadiusQuery(55.75, 37.62, 5000.0),
+        )
+        assert sorted(org.id for org in result) == expected
+    assert len(await container.get(GeoCellCache)) == 0
+
+
+async def test_nearest_matches_brute_force(geo_mode, container, db_path):
+    points = load_points(db_path)
+    async with request_scope(container) as (gateway, _):
+        for lat, lon in random_centers(10, seed=4):
+            result = await gateway.get_nearest(
+                dto.GeoNearestQuery(lat, lon, limit=25),
+            )
+            assert [org.id for org in result] == [
+                id_ for _, id_ in by_distance(points, lat, lon)[:25]
+            ]
+
+
+async def walk_pages(fetch, limit: int) -> list:
+    items = []
+    after = None
+    while True:
+        page = await fetch(limit, after)
+        items.extend(page)
+        if len(page) < limit:
+            return items
+        last = page[-1]
+        after = dto.Cursor(
+            id=last.id, distance_km=getattr(last, "distance_km", None),
+        )
+
+
+@pytest.mark.parametrize("limit", [1, 4, 7])
+async def test_rect_pages_have_no_gaps_or_duplicates(
+    geo_mode, container, limit,
+):
+    query = dto.GeoRectQuery(55.72, 37.58, 55.78, 37.66)
+    async with request_scope(container) as (gateway, _):
+        whole = await gateway.get_all_by_rect(query)
+        pages = await walk_pages(
+            lambda limit, after: gateway.get_all_by_rect(
+                query, dto.Page(limit=limit, after=after),
+            ),
+            limit,
+        )
+    assert [org.id for org in pages] == sorted(org.id for org in whole)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 5])
+async def test_distance_pages_have_no_gaps_or_duplicates(
+    geo_mode, container, db_path, limit,
+):
+    points = load_points(db_path)
+    # Centered on the twin buildings, so pages break between organizations
+    # at equal distance.
+    with sqlite3.connect(db_path) as connection:
+        twin = connection.execute(
+            "SELECT lat, lon FROM buildings WHERE id = 1",
+        ).fetchone()
+    lat, lon = twin[0] + 0.001, twin[1]
+    ordered = by_distance(points, lat, lon)
+    at_twins = [
+        id_ for distance, id_ in ordered
+        if distance == haversine(lat, lon, *twin)
+    ]
+    assert len(at_twins) > TWIN_BUILDINGS
+
+    async with request_scope(container) as (gateway, _):
+        radius = await walk_pages(
+            lambda limit, after: gateway.get_all_by_radius(dto.GeoRadiusQuery(
+                lat, lon, 3.0,
+                order=GeoOrder.distance, limit=limit, after=after,
+            )),
+            limit,
+        )
+        nearest = await walk_pages(
+            lambda limit, after: gateway.get_nearest(
+                dto.GeoNearestQuery(lat, lon, limit=limit, after=after),
+            ),
+            limit,
+        )
+    assert [org.id for org in radius] == [
+        id_ for distance, id_ in ordered if distance <= 3.0
+    ]
+    assert [org.id for org in nearest] == [id_ for _, id_ in ordered]
+
+
+async def test_address_filter_uses_folded_keys(container, db_path):
+    with sqlite3.connect(db_path) as connection:
+        expected = [
+            id_ for id_, in connection.execute(
+                "SELECT o.id FROM organizations o "
+                "JOIN buildings b ON b.id = o.building_id "
+                "WHERE b.street = 'Улица 5' ORDER BY o.id",
+            )
+        ]
+    async with request_scope(container) as (gateway, _):
+        for street in ("Улица 5", "улица 5", "УЛИЦА 5 "):
+            result = await gateway.get_all_by_building_address(
+                dto.AddressFilter(city="москва", street=street),
+            )
+            assert [org.id for org in result] == expected
+
+
+async def test_geo_key_follows_writes(container, db_path):
+    async with container() as request:
+        session = await request.get(AsyncSession)
+        await session.execute(text(
+            "UPDATE buildings SET lat = 55.7, lon = 37.6 WHERE id = 2",
+        ))
+        await session.commit()
+
+    # Plain SQLite connections, as restoring a dump, write buildings too.
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "INSERT INTO buildings (city, street, house, lat, lon) "
+            "VALUES ('Москва', 'Ёлочная', '1', 55.71, 37.61)",
+        )
+        rows = connection.execute(
+            "SELECT lat, lon, geo_key FROM buildings",
+        ).fetchall()
+    assert all(key == geo_key(lat, lon) for lat, lon, key in rows)
+
+
+def test_migration_backfills_address_keys(tmp_path):
+    write_config(tmp_path)
+    migrate(tmp_path, "1f2968701a02")
+    with sqlite3.connect(tmp_path / DB_NAME) as connection:
+        connection.execute(
+            "INSERT INTO buildings (city, street, house, lat, lon) "
+            "VALUES ('МОСКВА', ' Ёлочная  ул.', '1', 55.7, 37.6)",
+        )
+    migrate(tmp_path)
+    with sqlite3.connect(tmp_path / DB_NAME) as connection:
+        assert connection.execute(
+            "SELECT city_key, street_key FROM buildings",
+        ).fetchall() == [("москва", "елочная")]
+
+
+async def test_search_matches_word_prefixes(container):
+    async with request_scope(container) as (gateway, _):
+        result = await gateway.search(dto.TextSearchQuery("рог коп"))
+        assert [org.name for org in result] == ["Рога и Копыта"]
+        # Activities are indexed too, names weigh more.
+        result = await gateway.search(dto.TextSearchQuery("Молочн"))
+        assert result[0].name == "Молочный мир"
+        assert len(result) > 1
+        # FTS5 syntax is matched literally instead of failing the query.
+        for value in ('"', "рога OR мир", "NEAR(рога", "-рога", "*", "мир^"):
+            await gateway.search(dto.TextSearchQuery(value))
+        assert await gateway.search(dto.TextSearchQuery("рога OR мир")) == []
+        assert await gateway.search(dto.TextSearchQuery("!!!")) == []
+
+
+async def test_fuzzy_search_and_suggest(container):
+    async with request_scope(container) as (gateway, _):
+        result = await gateway.search_fuzzy(dto.TextSearchQuery("Рага копыто"))
+        assert result[0].name == "Рога и Копыта"
+        suggestions = await gateway.suggest(dto.SuggestQuery(
+            prefix="ёлк", types=list(SuggestType),
+        ))
+        assert [s.text for s in suggestions] == ["Ёлки-палки"]
@@ -0,0 +1,62 @@
+import random
+from math import cos, pi, sin
+
+import pytest
+
+from app.core.utils.polygon import Polygon
+
+
+def ray_cast(points, lat, lon) -> bool:
+    """Even-odd test against every edge, the reference for the bands."""
+    inside = False
+    for (lat1, lon1), (lat2, lon2) in zip(points, points[1:] + points[:1]):
+        if (lat1 <= lat < lat2) or (lat2 <= lat < lat1):
+            if lon < lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1):
+                inside = not inside
+    return inside
+
+
+def star(count: int, rnd: random.Random):
+    return [
+        (
+            55.75 + rnd.uniform(0.02, 0.1) * sin(2 * pi * i / count),
+            37.62 + rnd.uniform(0.02, 0.1) * cos(2 * pi * i / count),
+        )
+        for i in range(count)
+    ]
+
+
+SHAPES = {
+    "square": [(0.0, 0.0), (0.0, 1.0), (1.0, 1.0), (1.0, 0.0)],
+    "concave": [(0.0, 0.0), (0.0, 3.0), (3.0, 3.0), (1.0, 1.5), (3.0, 0.0)],
+    "bowtie": [(0.0, 0.0), (2.0, 2.0), (2.0, 0.0), (0.0, 2.0)],
+    "star": star(50, random.Random(20)),
+    "big_star": star(5000, random.Random(21)),
+}
+
+
+@pytest.mark.parametrize("name", list(SHAPES))
+def test_contains_matches_ray_cast(name):
+    points = SHAPES[name]
+    polygon = Polygon(points)
+    lat_min, lon_min, lat_max, lon_max = polygon.bbox
+    rnd = random.Random(22)
+    for _ in range(2000):
+        lat = rnd.uniform(lat_min - 0.1, lat_max + 0.1)
+        lon = rnd.uniform(lon_min - 0.1, lon_max + 0.1)
+        assert ((lat, lon) in polygon) == ray_cast(points, lat, lon)
+
+
+def test_closed_outline_equals_open_one():
+    points = SHAPES["concave"]
+    closed = Polygon(points + points[:1])
+    assert closed.bbox == (0.0, 0.0, 3.0, 3.0)
+    assert (2.0, 0.5) in closed
+    assert (2.0, 1.5) not in closed
+
+
+def test_filter_returns_inner_ids():
+    polygon = Polygon(SHAPES["square"])
+    assert polygon.filter([
+        (1, 0.5, 0.5), (2, 1.5, 0.5), (3, 0.1, 0.9), (4, -0.1, 0.5),
+    ]) == [1, 3]
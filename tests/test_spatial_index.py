@@ -0,0 +1,207 @@
+import random
+from collections import defaultdict
+from itertools import islice
+
+import pytest
+
+from app.core.utils.geo import haversine, tile_xy
+from app.core.utils.spatial_index import ClusterGrid, GridIndex, _ring
+
+
+def random_points(rnd: random.Random, count: int):
+    points = {
+        id_: (
+            round(rnd.uniform(55.6, 55.9), 4),
+            round(rnd.uniform(37.4, 37.8), 4),
+        )
+        for id_ in range(count)
+    }
+    # Points at equal distance from anywhere.
+    for id_ in range(count, count + 5):
+        points[id_] = points[0]
+    return points
+
+
+def brute_nearest(points, lat, lon):
+    return sorted(
+        ((haversine(lat, lon, *point), id_) for id_, point in points.items()),
+    )
+
+
+@pytest.fixture
+def points():
+    return random_points(random.Random(10), 500)
+
+
+@pytest.fixture
+def index(points):
+    index = GridIndex(cell_size=0.01)
+    index.rebuild((id_, *point) for id_, point in points.items())
+    return index
+
+
+def test_in_rect_matches_brute_force(points, index):
+    rnd = random.Random(11)
+    for _ in range(100):
+        lat, lon = rnd.uniform(55.5, 55.9), rnd.uniform(37.3, 37.8)
+        rect = lat, lon, lat + rnd.uniform(0, 0.2), lon + rnd.uniform(0, 0.2)
+        assert sorted(index.in_rect(*rect)) == [
+            id_ for id_, (p_lat, p_lon) in points.items()
+            if rect[0] <= p_lat <= rect[2] and rect[1] <= p_lon <= rect[3]
+        ]
+
+
+def test_in_radius_matches_brute_force(points, index):
+    rnd = random.Random(12)
+    for _ in range(100):
+        lat, lon = rnd.uniform(55.6, 55.9), rnd.uniform(37.4, 37.8)
+        radius = rnd.uniform(0.1, 15)
+        assert sorted(index.in_radius(lat, lon, radius)) == sorted(
+            (id_, distance)
+            for distance, id_ in brute_nearest(points, lat, lon)
+            if distance <= radius
+        )
+
+
+def test_nearest_matches_brute_force(points, index):
+    rnd = random.Random(13)
+    for _ in range(50):
+        # Centers outside of the points too, the walk has to go wide.
+        lat, lon = rnd.uniform(55.0, 56.5), rnd.uniform(37.0, 38.2)
+        expected = [
+            (id_, distance)
+            for distance, id_ in brute_nearest(points, lat, lon)
+        ]
+        assert list(index.nearest(lat, lon)) == expected
+        assert list(islice(index.nearest(lat, lon), 7)) == expected[:7]
+        assert list(index.nearest(lat, lon, max_distance=5)) == [
+            item for item in expected if item[1] <= 5
+        ]
+
+
+def test_nearest_orders_equal_distances_by_id(points, index):
+    lat, lon = points[0]
+    assert [id_ for id_, _ in islice(index.nearest(lat, lon), 6)] == [
+        0, 500, 501, 502, 503, 504,
+    ]
+
+
+def test_nearest_of_empty_index():
+    assert list(GridIndex().nearest(55.75, 37.62)) == []
+
+
+@pytest.mark.parametrize("lat", [-75.0, 0.0, 55.75, 80.0])
+def test_ring_bound_is_a_lower_bound(lat):
+    rnd = random.Random(14)
+    index = GridIndex(cell_size=0.05)
+    for _ in range(200):
+        point_lat = lat + rnd.uniform(-0.03, 0.03)
+        point_lon = rnd.uniform(-0.03, 0.03)
+        row0, col0 = index.cell(point_lat, point_lon)
+        for ring in range(4):
+            bound = index._ring_bound(point_lat, point_lon, row0, col0, ring)
+            assert bound > 0
+            # Any point of a cell beyond the ring is at least that far.
+            for _ in range(20):
+                row, col = rnd.choice(_ring(row0, col0, ring + 1))
+                other = (
+                    (row + rnd.random()) * index.cell_size,
+                    (col + rnd.random()) * index.cell_size,
+                )
+                assert haversine(point_lat, point_lon, *other) >= bound
+
+
+def test_ring_lists_cells_at_chebyshev_distance():
+    for ring in range(4):
+        cells = _ring(3, -2, ring)
+        assert len(cells) == len(set(cells)) == max(1, 8 * ring)
+        assert all(max(abs(r - 3), abs(c + 2)) == ring for r, c in cells)
+
+
+def test_upsert_and_discard_keep_index_consistent(points, index):
+    rnd = random.Random(15)
+    points = dict(points)
+    for _ in range(500):
+        id_ = rnd.randrange(600)
+        if rnd.random() < 0.3:
+            index.discard(id_)
+            points.pop(id_, None)
+        else:
+            point = (rnd.uniform(55.6, 55.9), rnd.uniform(37.4, 37.8))
+            index.upsert(id_, *point)
+            points[id_] = point
+    assert len(index) == len(points)
+    assert all(index.get(id_) == point for id_, point in points.items())
+    assert sorted(index.in_rect(-90, -180, 90, 180)) == sorted(points)
+    assert list(index.nearest(55.75, 37.62)) == [
+        (id_, distance)
+        for distance, id_ in brute_nearest(points, 55.75, 37.62)
+    ]
+
+
+def brute_clusters(points, zoom):
+    tiles = defaultdict(lambda: [0, 0.0, 0.0])
+    for lat, lon, weight in points.values():
+        acc = tiles[tile_xy(lat, lon, zoom)]
+        acc[0] += weight
+        acc[1] += lat * weight
+        acc[2] += lon * weight
+    return {
+        cell: (weight, sum_lat / weight, sum_lon / weight)
+        for cell, (weight, sum_lat, sum_lon) in tiles.items()
+    }
+
+
+def assert_clusters(grid, points, zoom, rect=(-85, -180, 85, 180)):
+    expected = brute_clusters(points, zoom)
+    actual = grid.clusters(zoom, *rect)
+    assert sorted(cell for cell, *_ in actual) == sorted(expected)
+    for cell, weight, lat, lon in actual:
+        assert weight == expected[cell][0]
+        assert lat == pytest.approx(expected[cell][1])
+        assert lon == pytest.approx(expected[cell][2])
+
+
+def test_cluster_grid_matches_brute_force():
+    rnd = random.Random(16)
+    points = {
+        id_: (
+            rnd.uniform(55.6, 55.9),
+            rnd.uniform(37.4, 37.8),
+            rnd.randint(1, 4),
+        )
+        for id_ in range(300)
+    }
+    grid = ClusterGrid(max_zoom=14)
+    grid.rebuild((id_, *point) for id_, point in points.items())
+    for zoom in range(15):
+        assert_clusters(grid, points, zoom)
+
+    for _ in range(300):
+        id_ = rnd.randrange(350)
+        weight = rnd.randint(0, 3)
+        if rnd.random() < 0.2:
+            grid.discard(id_)
+            points.pop(id_, None)
+            continue
+        point = (rnd.uniform(55.6, 55.9), rnd.uniform(37.4, 37.8))
+        grid.upsert(id_, *point, weight)
+        if weight:
+            points[id_] = (*point, weight)
+        else:
+            points.pop(id_, None)
+    assert len(grid) == len(points)
+    for zoom in range(15):
+        assert_clusters(grid, points, zoom)
+
+
+def test_cluster_grid_viewport_and_zoom_cap():
+    grid = ClusterGrid(max_zoom=10)
+    grid.rebuild([(1, 55.75, 37.62, 2), (2, 59.93, 30.31, 1)])
+    clusters = grid.clusters(10, 55.5, 37.3, 56.0, 38.0)
+    assert [(weight, lat, lon) for _, weight, lat, lon in clusters] == [
+        (2, 55.75, 37.62),
+    ]
+    # Zooms past max_zoom are served from the deepest level.
+    assert grid.clusters(18, 55.5, 37.3, 56.0, 38.0) == clusters
+    assert grid.clusters(0, -85, -180, 85, 180)[0][1] == 3
@@ -0,0 +1,84 @@
+import random
+
+from app.core.utils.suggest import PrefixIndex
+from app.core.utils.trigram_index import TrigramIndex
+
+NAMES = {
+    1: "Рога и Копыта",
+    2: "Молочный мир",
+    3: "Ёлки-палки",
+    4: "Мясной двор",
+    5: "Молочная ферма",
+    6: "Автозапчасти 24",
+}
+
+
+def trigram_index(names=NAMES) -> TrigramIndex:
+    index = TrigramIndex()
+    index.rebuild(names.items())
+    return index
+
+
+def test_trigrams_are_padded_per_word():
+    assert TrigramIndex().trigrams("Кот") == {"  к", " ко", "кот", "от "}
+    assert TrigramIndex().trigrams("ёж ЁЖ") == {"  е", " еж", "еж "}
+
+
+def test_search_tolerates_typos_and_latin_letters():
+    index = trigram_index()
+    assert index.search("Рага и копыто")[0][0] == 1
+    # Latin "o", "p" and "a" in place of Cyrillic ones.
+    assert index.search("Poгa и кoпытa")[0][0] == 1
+    assert index.search("елки палки")[0] == (3, 1.0)
+    assert index.search("совсем другое") == []
+
+
+def test_search_ranks_by_similarity_then_id():
+    index = trigram_index({1: "молоко", 2: "молоко", 3: "молот"})
+    results = index.search("молоко", threshold=0.1)
+    assert [id_ for id_, _ in results] == [1, 2, 3]
+    assert results[0][1] == results[1][1] == 1.0 > results[2][1]
+    assert len(index.search("молоко", limit=1, threshold=0.1)) == 1
+
+
+def test_upsert_and_discard_match_rebuild():
+    rnd = random.Random(40)
+    words = ["молоко", "мясо", "рога", "копыта", "двор", "мир", "ферма"]
+    names = {}
+    index = TrigramIndex()
+    for _ in range(400):
+        id_ = rnd.randrange(60)
+        if rnd.random() < 0.3:
+            index.discard(id_)
+            names.pop(id_, None)
+        else:
+            names[id_] = " ".join(rnd.sample(words, rnd.randint(1, 3)))
+            index.upsert(id_, names[id_])
+    rebuilt = trigram_index(names)
+    assert len(index) == len(rebuilt) == len(names)
+    for word in words + ["молоко мясо", "двор мир ферма"]:
+        assert index.search(word, limit=100) == rebuilt.search(word, limit=100)
+
+
+def test_prefix_search_is_caseless_and_sorted():
+    index = PrefixIndex()
+    index.rebuild(NAMES.items())
+    assert index.search("мол") == ["Молочная ферма", "Молочный мир"]
+    assert index.search("МОЛОЧНЫ") == ["Молочный мир"]
+    assert index.search("елк") == ["Ёлки-палки"]
+    assert index.search("м", limit=2) == ["Молочная ферма", "Молочный мир"]
+    assert index.search("я") == []
+    assert len(index.search("", limit=100)) == len(NAMES)
+
+
+def test_prefix_index_counts_equal_names():
+    index = PrefixIndex()
+    index.rebuild([(1, "Ленина"), (2, "Ленина"), (3, None), (4, "Лесная")])
+    assert index.search("ле") == ["Ленина", "Лесная"]
+    index.discard(1)
+    assert index.search("ле") == ["Ленина", "Лесная"]
+    index.upsert(2, "Лесная")
+    assert index.search("ле") == ["Лесная"]
+    index.upsert(5, "Ленина")
+    assert index.search("ле") == ["Ленина", "Лесная"]
+    assert len(index) == 2
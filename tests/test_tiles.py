@@ -0,0 +1,66 @@
+from app.core.utils.geo import mercator_xy, tile_xy
+from app.core.utils.tiles import (
+    TILE_HEADER, TILE_MAGIC, TILE_POINT, TileCache, encode_tile,
+)
+
+
+def decode_tile(tile: bytes):
+    magic, zoom, x, y, count = TILE_HEADER.unpack_from(tile)
+    assert magic == TILE_MAGIC
+    assert len(tile) == TILE_HEADER.size + count * TILE_POINT.size
+    points = [
+        TILE_POINT.unpack_from(tile, TILE_HEADER.size + i * TILE_POINT.size)
+        for i in range(count)
+    ]
+    return (zoom, x, y), points
+
+
+def test_encode_tile_layout():
+    zoom = 12
+    x, y = tile_xy(55.75, 37.62, zoom)
+    points = [(7, None, 55.75, 37.62), (3, 5, 55.751, 37.621)]
+    key, encoded = decode_tile(encode_tile(zoom, x, y, points))
+    assert key == (zoom, x, y)
+    # Sorted by organization id, no activity is 0.
+    assert [point[:2] for point in encoded] == [(3, 5), (7, 0)]
+    for (_, _, px, py), (_, _, lat, lon) in zip(encoded, sorted(points)):
+        mx, my = mercator_xy(lat, lon, zoom)
+        assert abs(px / 65536 - (mx - x)) < 1 / 65536
+        assert abs(py / 65536 - (my - y)) < 1 / 65536
+
+
+def test_encode_tile_clamps_edge_points():
+    (_, _, _), [(_, _, px, py)] = decode_tile(encode_tile(1, 1, 1, [
+        (1, 1, -85.06, 180.0),
+    ]))
+    assert (px, py) == (65535, 65535)
+    assert decode_tile(encode_tile(3, 1, 2, []))[1] == []
+
+
+def test_tile_cache_evicts_least_recently_used():
+    cache = TileCache(max_size=2)
+    cache.put((1, 0, 0), b"a", [1])
+    cache.put((1, 1, 0), b"b", [2])
+    assert cache.get((1, 0, 0)) == b"a"
+    cache.put((1, 1, 1), b"c", [3])
+    assert cache.get((1, 1, 0)) is None
+    assert cache.get((1, 0, 0)) == b"a"
+    assert len(cache) == 2
+
+
+def test_tile_cache_invalidates_old_and_new_places():
+    cache = TileCache()
+    old = (55.75, 37.62)
+    new = (59.93, 30.31)
+    for zoom in (5, 12):
+        cache.put((zoom, *tile_xy(*old, zoom)), b"old", [1, 2])
+        cache.put((zoom, *tile_xy(*new, zoom)), b"new", [3])
+    other = (12, *tile_xy(43.1, 131.9, 12))
+    cache.put(other, b"other", [4])
+
+    # Building 1 moved from the "old" tiles into the "new" ones.
+    cache.invalidate([1], {1: new})
+    assert len(cache) == 1
+    assert cache.get(other) == b"other"
+    cache.invalidate([4], {})
+    assert len(cache) == 0